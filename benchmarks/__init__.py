@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for the deadlock_graph tooling.
+
+``python -m benchmarks run`` times loaders, synthesis and export-static stages on
+synthetic rosters (``benchmarks.synthetic``) and stores JSON results for ``compare``.
+"""
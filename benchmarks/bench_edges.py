@@ -0,0 +1,126 @@
+"""
+Edge aggregation micro-benchmark.
+
+Generates dense synthetic matchups (every ordered character pair, many reason strings per
+edge, each carrying several ``[A] counters [B via M].`` entries, a share of them repeated)
+and times the former list-scan ``_merge_props`` (extended to collect the same structured
+evidence with list scans) against ``EdgeAggregator``. Both must produce identical
+properties before timings are reported.
+
+    python benchmarks/bench_edges.py [--characters 12] [--reasons 8 64 256] [--evidence 6]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from deadlock_graph.export import EdgeAggregator
+from deadlock_graph.synthesis import parse_reasons
+
+
+DEFAULT_REASONS = [8, 64, 256]
+
+
+def legacy_merge(dst: dict, src: dict) -> dict:
+    # The list-scan merge export-static used before EdgeAggregator, plus evidence parsing.
+    dst["evidence_count"] = int(dst.get("evidence_count", 0)) + int(src.get("evidence_count", 1))
+    if "reason" in src and src["reason"]:
+        dst.setdefault("reasons", [])
+        if src["reason"] not in dst["reasons"]:
+            dst["reasons"].append(src["reason"])
+            dst.setdefault("evidence", [])
+            for entry in parse_reasons(src["reason"]):
+                if entry not in dst["evidence"]:
+                    dst["evidence"].append(entry)
+    if "ability" in src and src["ability"]:
+        dst.setdefault("ability_sources", [])
+        if src["ability"] not in dst["ability_sources"]:
+            dst["ability_sources"].append(src["ability"])
+    for key, value in src.items():
+        if key in ("evidence_count", "reason", "reasons", "ability", "ability_sources"):
+            continue
+        if key not in dst:
+            dst[key] = value
+    return dst
+
+
+def synthetic_rows(characters: int, reasons: int, evidence: int, seed: int = 7) -> list[tuple]:
+    rng = random.Random(seed)
+    names = [f"Hero{i:03d}" for i in range(characters)]
+    rows = []
+    for source in names:
+        for target in names:
+            if source == target:
+                continue
+            blobs = []
+            for idx in range(reasons):
+                blobs.append(
+                    "".join(
+                        f"[{source} A{rng.randrange(8)}] counters "
+                        f"[{target} A{rng.randrange(8)} via Mechanic{idx}_{j}]. "
+                        for j in range(evidence)
+                    )
+                )
+            # Repeat a quarter of the strings so deduplication has work to do.
+            blobs += rng.sample(blobs, len(blobs) // 4)
+            rng.shuffle(blobs)
+            for blob in blobs:
+                rows.append(
+                    (
+                        f"character:{source}",
+                        f"character:{target}",
+                        {"evidence_count": evidence, "reason": blob, "ability": f"{source} A0"},
+                    )
+                )
+    return rows
+
+
+def run_legacy(rows: list[tuple]) -> dict:
+    edges: dict = {}
+    for source, target, props in rows:
+        key = ("STRONG_AGAINST", source, target)
+        edges[key] = legacy_merge(edges.get(key, {}), props)
+    return edges
+
+
+def run_aggregator(rows: list[tuple]) -> EdgeAggregator:
+    aggregator = EdgeAggregator()
+    for source, target, props in rows:
+        aggregator.add("STRONG_AGAINST", source, target, props)
+    return aggregator
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--characters", type=int, default=12)
+    parser.add_argument("--reasons", type=int, nargs="+", default=DEFAULT_REASONS)
+    parser.add_argument("--evidence", type=int, default=6)
+    args = parser.parse_args()
+
+    print(f"{'reasons/edge':>12} {'rows':>8} {'legacy s':>10} {'aggregator s':>13} {'speedup':>8}")
+    for reasons in args.reasons:
+        rows = synthetic_rows(args.characters, reasons, args.evidence)
+        legacy_time, legacy = timed(lambda: run_legacy(rows))
+        agg_time, aggregated = timed(lambda: run_aggregator(rows))
+        for record in aggregated:
+            expected = legacy[(record.type, record.source, record.target)]
+            props = record.properties()
+            props["evidence"] = list(record.evidence)
+            if props != expected:
+                raise SystemExit(f"Aggregation diverged for {record.source} -> {record.target}")
+        print(
+            f"{reasons:>12} {len(rows):>8} {legacy_time:>10.3f} {agg_time:>13.3f} "
+            f"{legacy_time / agg_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Cold-start YAML loading benchmark.
+
+Generates a deterministic roster of each requested size (``benchmarks.synthetic``), then
+times pure-Python ``SafeLoader`` parsing, libyaml ``CSafeLoader`` parsing and the
+process-pool mode of ``iter_character_profiles``. Every mode must produce identical
+profiles, in identical order, before its timing is reported.
+
+    python -m benchmarks.bench_loaders [--sizes 32 256 1024 4096] [--workers 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from deadlock_graph import loaders
+from deadlock_graph.models import CharacterProfile
+
+from .synthetic import SyntheticSpec, generate_dataset
+
+
+DEFAULT_SIZES = [32, 256, 1024, 4096]
+
+
+def load_serial(directory: Path, loader: type) -> list[CharacterProfile]:
+    return [
+        CharacterProfile(**loaders._parse_yaml(path.read_bytes(), loader))
+        for path in sorted(directory.glob("*.yaml"))
+    ]
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    loaders.disable_cache()
+    print(f"libyaml available: {loaders.yaml_backend() == 'libyaml'}; pool workers: {args.workers}")
+    print(f"{'files':>6} {'python s':>10} {'libyaml s':>10} {'pool s':>10} {'speedup':>8}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = generate_dataset(Path(tmp), SyntheticSpec(characters=size, seed=args.seed))
+            directory = root / "characters"
+            py_time, baseline = timed(lambda: load_serial(directory, yaml.SafeLoader))
+            c_time, accelerated = timed(lambda: load_serial(directory, loaders.SafeLoader))
+            pool_time, pooled = timed(
+                lambda: list(loaders.iter_character_profiles(directory, workers=args.workers))
+            )
+            if accelerated != baseline or pooled != baseline:
+                raise SystemExit(f"Loader outputs diverged at {size} files")
+            print(
+                f"{size:>6} {py_time:>10.3f} {c_time:>10.3f} {pool_time:>10.3f} "
+                f"{py_time / pool_time:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Load test for ``python -m deadlock_graph.cli serve``.
+
+Replays a mixed request set (matchup, counters, matchups, neighbors, mechanic and path
+lookups over every character) from ``--concurrency`` keep-alive clients and reports
+throughput and p50/p90/p99/max latency. Without ``--url`` an in-process server is started
+on a free port from ``--graph`` (or the YAML with ``--from-yaml``), once with the response
+cache and once without.
+
+    python benchmarks/bench_serve.py [--graph website/public/graph.json] [--requests 20000]
+    python benchmarks/bench_serve.py --url http://127.0.0.1:8765 --concurrency 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import random
+import statistics
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import quote, urlsplit
+
+from deadlock_graph.serve import GraphIndex, make_server
+
+
+def request_mix(characters: list[str], mechanics: list[str], count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    targets = []
+    for _ in range(count):
+        a, b = (quote(name) for name in rng.sample(characters, 2))
+        kind = rng.random()
+        if kind < 0.4:
+            targets.append(f"/matchup/{a}/{b}")
+        elif kind < 0.6:
+            targets.append(f"/counters/{a}")
+        elif kind < 0.7:
+            targets.append(f"/matchups/{a}")
+        elif kind < 0.8:
+            targets.append(f"/neighbors/{a}")
+        elif kind < 0.9:
+            targets.append(f"/mechanics/{quote(rng.choice(mechanics))}")
+        else:
+            targets.append(f"/path/{a}/{b}?type=STRONG_AGAINST")
+    return targets
+
+
+def run_load(host: str, port: int, targets: list[str], concurrency: int) -> tuple[list[float], float, int]:
+    """Issue ``targets`` split across ``concurrency`` connections; returns latencies, wall time, errors."""
+    latencies: list[list[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+
+    def client(worker: int) -> None:
+        connection = http.client.HTTPConnection(host, port, timeout=30)
+        for target in targets[worker::concurrency]:
+            started = time.perf_counter()
+            connection.request("GET", target)
+            response = connection.getresponse()
+            response.read()
+            latencies[worker].append(time.perf_counter() - started)
+            if response.status != 200:
+                errors[worker] += 1
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(worker,)) for worker in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [value for chunk in latencies for value in chunk], time.perf_counter() - started, sum(errors)
+
+
+def report(label: str, latencies: list[float], seconds: float, errors: int) -> None:
+    ordered = sorted(latencies)
+    quantiles = statistics.quantiles(ordered, n=100, method="inclusive")
+    print(
+        f"{label:<10} {len(ordered):>7} req {len(ordered) / seconds:>9.0f} req/s  "
+        f"p50 {quantiles[49] * 1000:>6.2f} ms  p90 {quantiles[89] * 1000:>6.2f} ms  "
+        f"p99 {quantiles[98] * 1000:>6.2f} ms  max {ordered[-1] * 1000:>7.2f} ms  errors {errors}"
+    )
+
+
+def _bench_local(index: GraphIndex, targets: list[str], concurrency: int, cache_size: int, label: str) -> None:
+    server = make_server(index, "127.0.0.1", 0, cache_size=cache_size)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        run_load(host, port, targets[: min(len(targets), 500)], concurrency)  # warm-up
+        report(label, *run_load(host, port, targets, concurrency))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--graph", type=Path, default=Path("website/public/graph.json"))
+    parser.add_argument("--from-yaml", type=Path, metavar="DATA_ROOT", help="Build the index from this data root.")
+    parser.add_argument("--url", help="Benchmark an already running server instead.")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--cache-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    index: Optional[GraphIndex] = None
+    if args.url:
+        parsed = urlsplit(args.url)
+        connection = http.client.HTTPConnection(parsed.hostname, parsed.port or 80)
+        connection.request("GET", "/characters")
+        characters = json.loads(connection.getresponse().read())["characters"]
+        mechanics = ["Stun", "Silence", "Movement Slow"]
+    else:
+        index = GraphIndex.from_yaml(args.from_yaml) if args.from_yaml else GraphIndex.from_graph(args.graph)
+        characters = index.characters
+        mechanics = sorted(index.mechanics)
+    targets = request_mix(characters, mechanics, args.requests)
+    print(f"{len(targets)} requests, {args.concurrency} connections, {len(set(targets))} distinct targets")
+
+    if index is None:
+        parsed = urlsplit(args.url)
+        report("remote", *run_load(parsed.hostname, parsed.port or 80, targets, args.concurrency))
+        return
+    _bench_local(index, targets, args.concurrency, args.cache_size, "cached")
+    _bench_local(index, targets, args.concurrency, 0, "uncached")
+
+
+if __name__ == "__main__":
+    main()
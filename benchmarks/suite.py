@@ -0,0 +1,354 @@
+"""
+Benchmark suite over synthetic rosters.
+
+For each roster size a deterministic dataset is generated (see ``benchmarks.synthetic``)
+and every case below is timed ``--repeat`` times: YAML parsing (cold and cached), in-memory
+matchup synthesis (full and single-character incremental), the export-static stages
+(nodes, edge aggregation, finalisation, cold and warm layout, indexes, path tables,
+analytics, JSON/binary serialisation) and a top-10 draft search against the first six characters. Results are written as JSON keyed by git commit so two runs can be
+compared with ``compare``.
+
+    python -m benchmarks run [--sizes 32 128 512] [--repeat 3] [--out results.json]
+    python -m benchmarks compare old.json new.json [--threshold 1.1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from deadlock_graph import loaders
+from deadlock_graph.draft import DraftPool, draft
+from deadlock_graph.analytics import analyze
+from deadlock_graph.export import (
+    aggregate_edges,
+    build_indexes,
+    build_meta,
+    build_nodes,
+    finalize_edges,
+    write_binary_graph,
+    write_graph_json,
+)
+from deadlock_graph.layout import SeedLayout, force_layout
+from deadlock_graph.paths import build_paths
+from deadlock_graph.whatif import Edit, simulate
+from deadlock_graph.synthesis import (
+    MATCHUP_FIELDS,
+    MatchupMatrix,
+    synthesize,
+    synthesize_incremental,
+    write_matchups_csv,
+)
+
+from .synthetic import SyntheticSpec, generate_dataset
+
+
+DEFAULT_SIZES = [32, 128, 512]
+RESULTS_DIR = Path("benchmarks/results")
+
+
+@dataclass
+class State:
+    """Outputs of earlier cases that later cases consume."""
+
+    root: Path
+    scratch: Path
+    layout_iterations: int
+    profiles: dict = field(default_factory=dict)
+    archetypes: dict = field(default_factory=dict)
+    mechanics: dict = field(default_factory=dict)
+    lookup: dict = field(default_factory=dict)
+    matchups: list = field(default_factory=list)
+    matchup_rows: list = field(default_factory=list)
+    nodes: list = field(default_factory=list)
+    edge_map: Any = None
+    edges: list = field(default_factory=list)
+    seed_layout: SeedLayout = field(default_factory=SeedLayout)
+    payload: dict = field(default_factory=dict)
+
+
+def _load_profiles(state: State) -> int:
+    state.profiles = {
+        profile.character.name: profile
+        for profile in loaders.iter_character_profiles(state.root / "characters")
+    }
+    return len(state.profiles)
+
+
+def case_parse_cold(state: State) -> int:
+    loaders.disable_cache()
+    return _load_profiles(state)
+
+
+def setup_parse_cached(state: State) -> None:
+    loaders.enable_cache(state.scratch / "cache")
+    _load_profiles(state)
+    loaders.disable_cache()
+
+
+def case_parse_cached(state: State) -> int:
+    loaders.enable_cache(state.scratch / "cache")
+    try:
+        return _load_profiles(state)
+    finally:
+        loaders.disable_cache()
+
+
+def case_synthesis_full(state: State) -> int:
+    state.matchups = synthesize(state.profiles.values())
+    return len(state.matchups)
+
+
+def case_synthesis_incremental(state: State) -> int:
+    changed = {next(iter(state.profiles))}
+    return len(synthesize_incremental(state.profiles.values(), state.matchups, changed))
+
+
+def case_export_nodes(state: State) -> int:
+    if not state.archetypes:
+        state.archetypes = {a.name: a for a in loaders.load_archetypes(state.root / "archetypes.yaml")}
+        state.mechanics = {m.name: m for m in loaders.load_mechanics(state.root / "mechanics.yaml")}
+        roster = loaders.load_character_list(state.root / "character_list.yaml")
+        state.lookup = {entry.name: entry.archetype for entry in roster.characters}
+        # Round-trip through CSV text so aggregation sees the same string rows as export-static.
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=MATCHUP_FIELDS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(matchup.as_row() for matchup in state.matchups)
+        state.matchup_rows = list(csv.DictReader(io.StringIO(buffer.getvalue())))
+    state.nodes = build_nodes(state.archetypes, state.mechanics, state.lookup, state.profiles)
+    return len(state.nodes)
+
+
+def case_export_aggregate(state: State) -> int:
+    state.edge_map = aggregate_edges(state.profiles, state.lookup, state.mechanics, state.matchup_rows)
+    return len(state.edge_map)
+
+
+def case_export_finalize(state: State) -> int:
+    state.edges = finalize_edges(state.edge_map)
+    return len(state.edges)
+
+
+def _layout(state: State, seed_layout: Optional[SeedLayout]) -> int:
+    result = force_layout(
+        [node["id"] for node in state.nodes],
+        ((edge["source"], edge["target"]) for edge in state.edges),
+        seed_layout=seed_layout,
+        max_iterations=state.layout_iterations,
+    )
+    for node in state.nodes:
+        node["x"], node["y"] = result.positions[node["id"]]
+    return result.iterations
+
+
+def case_export_layout_cold(state: State) -> int:
+    iterations = _layout(state, None)
+    state.seed_layout = SeedLayout(
+        positions={node["id"]: (node["x"], node["y"]) for node in state.nodes},
+        edges={frozenset((edge["source"], edge["target"])) for edge in state.edges},
+    )
+    return iterations
+
+
+def case_export_layout_warm(state: State) -> int:
+    return _layout(state, state.seed_layout)
+
+
+def case_export_indexes(state: State) -> int:
+    state.payload = {
+        "meta": build_meta(state.nodes, state.edges),
+        "nodes": state.nodes,
+        "edges": state.edges,
+        "indexes": build_indexes(state.nodes, state.edges),
+    }
+    return len(state.payload["indexes"]["neighbors"])
+
+
+def case_export_paths(state: State) -> int:
+    return len(build_paths(state.nodes, state.edges)["nodes"])
+
+
+def case_export_analytics(state: State) -> int:
+    matrix = MatchupMatrix.from_matchups(state.lookup, state.matchups)
+    return len(analyze(matrix, state.lookup).characters)
+
+
+def case_export_json(state: State) -> int:
+    path = state.scratch / "graph.json"
+    write_graph_json(path, state.payload)
+    return path.stat().st_size
+
+
+def case_export_binary(state: State) -> int:
+    return write_binary_graph(state.payload, state.scratch / "graph.dlgb")
+
+
+def case_write_matchups(state: State) -> int:
+    return write_matchups_csv(state.matchups, state.scratch / "matchups.csv")
+
+
+def case_draft(state: State) -> int:
+    pool = DraftPool.from_profiles(state.profiles.values())
+    return draft(pool, sorted(state.profiles)[:6], top=10).nodes
+
+
+def case_what_if(state: State) -> int:
+    profile = next(iter(state.profiles.values()))
+    ability = profile.abilities[0]
+    edits = [Edit(profile.character.name, ability.name, "-ability")]
+    result = simulate(state.profiles.values(), edits)
+    return len(result.added) + len(result.removed) + len(result.changed)
+
+
+# Run in this order: each case may rely on state left by the ones before it. The optional
+# setup runs once, untimed, before a case's repeats.
+CASES: list[tuple[str, Callable[[State], int], Optional[Callable[[State], None]]]] = [
+    ("parse_cold", case_parse_cold, None),
+    ("parse_cached", case_parse_cached, setup_parse_cached),
+    ("synthesis_full", case_synthesis_full, None),
+    ("synthesis_incremental", case_synthesis_incremental, None),
+    ("write_matchups", case_write_matchups, None),
+    ("export_nodes", case_export_nodes, None),
+    ("export_aggregate", case_export_aggregate, None),
+    ("export_finalize", case_export_finalize, None),
+    ("export_layout_cold", case_export_layout_cold, None),
+    ("export_layout_warm", case_export_layout_warm, None),
+    ("export_indexes", case_export_indexes, None),
+    ("export_paths", case_export_paths, None),
+    ("export_analytics", case_export_analytics, None),
+    ("export_json", case_export_json, None),
+    ("export_binary", case_export_binary, None),
+    ("draft", case_draft, None),
+    ("what_if", case_what_if, None),
+]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_suite(
+    sizes: list[int],
+    *,
+    repeat: int = 3,
+    layout_iterations: int = 50,
+    cases: Optional[set[str]] = None,
+) -> dict:
+    results = []
+    for size in sizes:
+        spec = SyntheticSpec(characters=size)
+        with tempfile.TemporaryDirectory() as tmp:
+            root = generate_dataset(Path(tmp) / "data", spec)
+            state = State(root=root, scratch=Path(tmp), layout_iterations=layout_iterations)
+            for name, case, setup in CASES:
+                if setup is not None:
+                    setup(state)
+                runs = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    items = case(state)
+                    runs.append(time.perf_counter() - started)
+                if cases and name not in cases:
+                    continue
+                results.append(
+                    {
+                        "case": name,
+                        "size": size,
+                        "dataset": spec.label(),
+                        "items": items,
+                        "min": min(runs),
+                        "median": statistics.median(runs),
+                        "runs": runs,
+                    }
+                )
+                print(f"{size:>6} {name:<24} {min(runs):>9.4f}s  ({items} items)", flush=True)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "generated_at": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "yaml_backend": loaders.yaml_backend(),
+            "repeat": repeat,
+            "layout_iterations": layout_iterations,
+        },
+        "results": results,
+    }
+
+
+def compare(old: dict, new: dict, threshold: float) -> list[str]:
+    """Return the ``case@size`` keys whose min time grew by more than ``threshold``x."""
+    baseline = {(row["case"], row["size"]): row for row in old["results"]}
+    regressions = []
+    print(f"{old['meta']['commit']} -> {new['meta']['commit']}")
+    print(f"{'case':<24} {'size':>6} {'old s':>9} {'new s':>9} {'ratio':>7}")
+    for row in new["results"]:
+        before = baseline.get((row["case"], row["size"]))
+        if before is None:
+            continue
+        ratio = row["min"] / before["min"] if before["min"] else float("inf")
+        flag = ""
+        if ratio > threshold:
+            regressions.append(f"{row['case']}@{row['size']}")
+            flag = "  REGRESSION"
+        print(
+            f"{row['case']:<24} {row['size']:>6} {before['min']:>9.4f} {row['min']:>9.4f} "
+            f"{ratio:>6.2f}x{flag}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Run the suite and store JSON results.")
+    run.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--layout-iterations", type=int, default=50)
+    run.add_argument("--case", action="append", dest="cases", help="Only report these cases.")
+    run.add_argument("--out", type=Path, help="Results file (default benchmarks/results/<commit>.json).")
+    cmp_parser = commands.add_parser("compare", help="Compare two result files.")
+    cmp_parser.add_argument("old", type=Path)
+    cmp_parser.add_argument("new", type=Path)
+    cmp_parser.add_argument("--threshold", type=float, default=1.1)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        report = run_suite(
+            args.sizes,
+            repeat=args.repeat,
+            layout_iterations=args.layout_iterations,
+            cases=set(args.cases) if args.cases else None,
+        )
+        out = args.out or RESULTS_DIR / f"{report['meta']['commit']}.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Wrote {out}")
+    else:
+        old = json.loads(args.old.read_text(encoding="utf-8"))
+        new = json.loads(args.new.read_text(encoding="utf-8"))
+        regressions = compare(old, new, args.threshold)
+        if regressions:
+            raise SystemExit(f"Regressions over {args.threshold}x: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Deterministic synthetic datasets shaped like ``data/``.
+
+Defaults mirror today's curated roster (4 archetypes, 50 mechanics, 4 abilities per hero,
+~2 used and ~0.4 countered mechanics per ability); every knob scales independently and
+the same arguments always produce byte-identical files.
+
+    python -m benchmarks.synthetic out/ --characters 1024 --mechanics 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+import yaml
+
+
+SLOTS = ["Q", "E", "R", "Shift"]
+CATEGORIES = ["crowd_control", "debuff", "mitigation", "mobility", "damage", "sustain", "buff", "utility"]
+ARCHETYPES = ["Assassin", "Brawler", "Marksman", "Mystic"]
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    characters: int = 32
+    abilities: int = 4
+    mechanics: int = 50
+    archetypes: int = 4
+    uses_per_ability: float = 2.0
+    counters_per_ability: float = 0.4
+    seed: int = 0
+
+    def label(self) -> str:
+        return f"{self.characters}c-{self.abilities}a-{self.mechanics}m"
+
+
+def _archetype_names(count: int) -> list[str]:
+    return [ARCHETYPES[i] if i < len(ARCHETYPES) else f"Archetype{i:03d}" for i in range(count)]
+
+
+def _sample_count(rng: random.Random, mean: float, limit: int) -> int:
+    # Poisson-ish: floor of the mean plus one more with the fractional probability.
+    whole = int(mean)
+    return min(limit, whole + (1 if rng.random() < mean - whole else 0))
+
+
+def _dump(payload: dict, path: Path) -> None:
+    path.write_text(yaml.safe_dump(payload, sort_keys=False, allow_unicode=True), encoding="utf-8")
+
+
+def generate_dataset(root: Path, spec: SyntheticSpec = SyntheticSpec()) -> Path:
+    """Write ``archetypes.yaml``, ``mechanics.yaml``, ``character_list.yaml`` and ``characters/`` under ``root``."""
+    rng = random.Random(spec.seed)
+    (root / "characters").mkdir(parents=True, exist_ok=True)
+    archetypes = _archetype_names(spec.archetypes)
+    mechanics = [f"Mechanic{i:04d}" for i in range(spec.mechanics)]
+
+    _dump(
+        {
+            "last_checked": "2025-10-26",
+            "archetypes": [
+                {
+                    "name": name,
+                    "description": f"Synthetic archetype {name}.",
+                    "signature_traits": ["synthetic"],
+                    "sources": ["https://example.com/archetypes"],
+                }
+                for name in archetypes
+            ],
+        },
+        root / "archetypes.yaml",
+    )
+    _dump(
+        {
+            "last_checked": "2025-10-26",
+            "mechanics": [
+                {
+                    "name": name,
+                    "category": CATEGORIES[i % len(CATEGORIES)],
+                    "description": f"Synthetic mechanic {name}.",
+                    "archetype_implications": [],
+                    "sources": ["https://example.com/mechanics"],
+                }
+                for i, name in enumerate(mechanics)
+            ],
+        },
+        root / "mechanics.yaml",
+    )
+
+    roster = []
+    for i in range(spec.characters):
+        name = f"Hero{i:05d}"
+        archetype = archetypes[rng.randrange(len(archetypes))]
+        roster.append({"name": name, "archetype": archetype, "status": "active"})
+        abilities = []
+        for j in range(spec.abilities):
+            uses = rng.sample(mechanics, _sample_count(rng, spec.uses_per_ability, len(mechanics)))
+            counters = rng.sample(
+                mechanics, _sample_count(rng, spec.counters_per_ability, len(mechanics))
+            )
+            abilities.append(
+                {
+                    "name": f"{name} Ability{j}",
+                    "slot": SLOTS[j % len(SLOTS)],
+                    "type": "ultimate" if j % len(SLOTS) == 2 else "active",
+                    "description": f"Synthetic ability {j} of {name}.",
+                    "mechanics": {"uses": uses, "counters": counters},
+                }
+            )
+        _dump(
+            {
+                "character": {
+                    "name": name,
+                    "archetype": archetype,
+                    "description": f"Synthetic hero {name}.",
+                    "source_url": f"https://example.com/{name}",
+                    "last_updated": "2025-10-26",
+                },
+                "abilities": abilities,
+            },
+            root / "characters" / f"hero{i:05d}.yaml",
+        )
+    _dump(
+        {"meta": {"last_checked": "2025-10-26", "source": "synthetic"}, "characters": roster},
+        root / "character_list.yaml",
+    )
+    return root
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("root", type=Path)
+    for name, default in vars(SyntheticSpec()).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(default), default=default)
+    args = parser.parse_args()
+    spec = SyntheticSpec(**{name: getattr(args, name) for name in vars(SyntheticSpec())})
+    generate_dataset(args.root, spec)
+    print(f"Wrote {spec.label()} dataset to {args.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import csv
+import json
 import sys
 from pathlib import Path
 
@@ -15,6 +16,18 @@ def load(path: Path) -> dict[tuple[str, str, str], dict[str, str]]:
     return data
 
 
+def describe(row: dict[str, str]) -> str:
+    # Structured rows keep their evidence in parallel JSON lists; older CSVs carry the text.
+    if not row.get('counter_abilities'):
+        return row['reason']
+    counters, countered, mechanics = (
+        json.loads(row[name]) for name in ('counter_abilities', 'countered_abilities', 'mechanics')
+    )
+    if row['relationship'] == 'WEAK_AGAINST':
+        return ''.join(f"[{b}] is countered by [{a} via {m}]. " for a, b, m in zip(counters, countered, mechanics))
+    return ''.join(f"[{a}] counters [{b} via {m}]. " for a, b, m in zip(counters, countered, mechanics))
+
+
 def main() -> None:
     if len(sys.argv) != 3:
         print('Usage: python scripts/diff_matchups.py <old.csv> <new.csv>')
@@ -26,6 +39,10 @@ def main() -> None:
         sys.exit(1)
     old = load(old_path)
     new = load(new_path)
+    # A CSV written with implicit EVEN has no EVEN rows; compare only STRONG/WEAK then.
+    if not all(any(key[1] == 'EVEN_AGAINST' for key in rows) for rows in (old, new)):
+        old = {key: row for key, row in old.items() if key[1] != 'EVEN_AGAINST'}
+        new = {key: row for key, row in new.items() if key[1] != 'EVEN_AGAINST'}
 
     added = sorted(set(new) - set(old))
     removed = sorted(set(old) - set(new))
@@ -33,12 +50,12 @@ def main() -> None:
     print(f"Added relationships: {len(added)}")
     for key in added:
         row = new[key]
-        print(f" + {row['source']} {row['relationship']} {row['target']} (evidence={row['evidence']}) -> {row['reason']}")
+        print(f" + {row['source']} {row['relationship']} {row['target']} (evidence={row['evidence']}) -> {describe(row)}")
 
     print(f"Removed relationships: {len(removed)}")
     for key in removed:
         row = old[key]
-        print(f" - {row['source']} {row['relationship']} {row['target']} (evidence={row['evidence']}) -> {row['reason']}")
+        print(f" - {row['source']} {row['relationship']} {row['target']} (evidence={row['evidence']}) -> {describe(row)}")
 
 
 if __name__ == '__main__':
@@ -1,52 +1,44 @@
 from __future__ import annotations
 
-import csv
 from pathlib import Path
 
 from deadlock_graph.config import get_settings
-from deadlock_graph.db import Neo4jClient
+from deadlock_graph.db import Neo4jClient, QueryLog
+from deadlock_graph.synthesis import Matchup, write_matchups_csv
 
 
-def fetch_relationships(client: Neo4jClient) -> list[dict[str, str]]:
-    query = """
-    MATCH (c1:Character)-[r:STRONG_AGAINST|WEAK_AGAINST|EVEN_AGAINST]->(c2:Character)
+def fetch_relationships(client: Neo4jClient, implicit_even: bool = False) -> list[dict[str, str]]:
+    # With implicit EVEN only STRONG/WEAK rows are exported; absent pairs read as EVEN.
+    types = "STRONG_AGAINST|WEAK_AGAINST" if implicit_even else "STRONG_AGAINST|WEAK_AGAINST|EVEN_AGAINST"
+    query = f"""
+    MATCH (c1:Character)-[r:{types}]->(c2:Character)
     RETURN c1.name AS source, type(r) AS relationship, c2.name AS target,
-           coalesce(r.reason, '') AS reason, coalesce(r.evidence_count, 0) AS evidence
+           coalesce(r.reason, '') AS reason, coalesce(r.evidence_count, 0) AS evidence,
+           coalesce(r.counter_abilities, []) AS counter_abilities,
+           coalesce(r.countered_abilities, []) AS countered_abilities,
+           coalesce(r.mechanics, []) AS mechanics
     ORDER BY source, relationship, target
     """
-    with client.session() as session:
-        return [record.data() for record in session.run(query)]
+    return client.fetch(query, name="export_matchups")
 
 
 def main() -> None:
     settings = get_settings()
-    client = Neo4jClient(settings.neo4j_uri, auth=(
-        settings.neo4j_user or "",
-        settings.neo4j_password or "",
-    ) if settings.neo4j_user or settings.neo4j_password else None)
+    query_log = QueryLog(slow_ms=settings.slow_query_ms)
+    client = Neo4jClient.from_settings(settings, query_log=query_log)
     try:
-        rows = fetch_relationships(client)
+        rows = fetch_relationships(client, settings.even_mode == "implicit")
     finally:
         client.close()
+    for line in query_log.report():
+        print(line)
 
     output = Path("matchups.csv")
-    with output.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(
-            handle,
-            fieldnames=["source", "relationship", "target", "evidence", "reason"],
-        )
-        writer.writeheader()
-        for row in rows:
-            writer.writerow(
-                {
-                    "source": row["source"],
-                    "relationship": row["relationship"],
-                    "target": row["target"],
-                    "evidence": row["evidence"],
-                    "reason": row["reason"],
-                }
-            )
-    print(f"Exported {len(rows)} relationships to {output}")
+    matchups = [
+        Matchup.from_record(row["source"], row["relationship"], row["target"], row) for row in rows
+    ]
+    count = write_matchups_csv(matchups, output)
+    print(f"Exported {count} relationships to {output}")
 
 
 if __name__ == "__main__":
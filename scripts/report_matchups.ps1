@@ -12,25 +12,17 @@ if (-not (Test-Path $matchups)) {
     exit 1
 }
 
-$historyDir = Join-Path (Get-Location) 'matchups_history'
-if (-not (Test-Path $historyDir)) {
-    New-Item -ItemType Directory -Path $historyDir | Out-Null
+python scripts/archive_matchups.py "before-$Label"
+if ($LASTEXITCODE -ne 0) {
+    Write-Error 'Archiving the baseline failed.'
+    exit $LASTEXITCODE
 }
 
-$timestampBefore = Get-Date -Format 'yyyy-MM-ddTHHmmss'
-$beforePath = Join-Path $historyDir ("{0}_before-{1}.csv" -f $timestampBefore, $Label)
-Copy-Item $matchups $beforePath -Force
-Write-Host "Archived baseline to $beforePath"
-
 ./scripts/run_sanity.ps1
 if ($LASTEXITCODE -ne 0) {
     Write-Error 'Sanity workflow failed.'
     exit $LASTEXITCODE
 }
 
-$timestampAfter = Get-Date -Format 'yyyy-MM-ddTHHmmss'
-$afterPath = Join-Path $historyDir ("{0}_after-{1}.csv" -f $timestampAfter, $Label)
-Copy-Item $matchups $afterPath -Force
-Write-Host "Archived updated matchups to $afterPath"
-
-python scripts/diff_matchups.py $beforePath $matchups
+python scripts/archive_matchups.py "after-$Label"
+python -m deadlock_graph.cli history diff "before-$Label" "after-$Label"
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+import numpy as np
+
+from .profiling import profiled
+from .synthesis import MatchupMatrix
+
+
+DAMPING = 0.85
+TOLERANCE = 1e-10
+MAX_ITERATIONS = 200
+# Exported floats are rounded so repeated exports of the same data stay byte-identical.
+DIGITS = 6
+METRICS = ("net_score", "pagerank", "hub", "authority")
+
+
+def score_matrix(matrix: MatchupMatrix) -> np.ndarray:
+    """Net evidence ``S[i, j] = strong[i, j] - strong[j, i]``; antisymmetric, 0 for EVEN pairs."""
+    strong = matrix.strong.astype(np.float64)
+    return strong - strong.T
+
+
+def pagerank(
+    weights: np.ndarray,
+    *,
+    damping: float = DAMPING,
+    tolerance: float = TOLERANCE,
+    max_iterations: int = MAX_ITERATIONS,
+) -> tuple[np.ndarray, int]:
+    """
+    Power-iteration PageRank over ``weights[i, j]`` (link ``i -> j``), weighted by value.
+    Rows without links spread their rank uniformly. Returns the ranks and iterations used.
+    """
+    size = len(weights)
+    if not size:
+        return np.zeros(0), 0
+    out = weights.sum(axis=1)
+    dangling = out == 0
+    transition = np.divide(weights, out[:, None], out=np.zeros_like(weights), where=~dangling[:, None])
+    rank = np.full(size, 1.0 / size)
+    iteration = 0
+    for iteration in range(1, max_iterations + 1):
+        updated = (1 - damping) / size + damping * (rank @ transition + rank[dangling].sum() / size)
+        delta = np.abs(updated - rank).sum()
+        rank = updated
+        if delta < tolerance:
+            break
+    return rank, iteration
+
+
+def hits(
+    weights: np.ndarray,
+    *,
+    tolerance: float = TOLERANCE,
+    max_iterations: int = MAX_ITERATIONS,
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    Power-iteration HITS over ``weights[i, j]`` (link ``i -> j``). Returns hub and authority
+    scores (each summing to 1, or all zero without links) and the iterations used.
+    """
+    size = len(weights)
+    hubs = np.full(size, 1.0 / size) if size else np.zeros(0)
+    authorities = np.zeros(size)
+    iteration = 0
+    for iteration in range(1, max_iterations + 1):
+        authorities = _normalise(weights.T @ hubs)
+        updated = _normalise(weights @ authorities)
+        delta = np.abs(updated - hubs).sum()
+        hubs = updated
+        if delta < tolerance:
+            break
+    return hubs, authorities, iteration
+
+
+def _normalise(vector: np.ndarray) -> np.ndarray:
+    total = vector.sum()
+    return vector / total if total > 0 else np.zeros_like(vector)
+
+
+def _ranking(names: list[str], values: np.ndarray) -> list[str]:
+    # Names are sorted, so a stable sort breaks ties alphabetically.
+    return [names[i] for i in np.argsort(-values, kind="stable")]
+
+
+def _rounded(values: np.ndarray) -> Any:
+    return np.round(values, DIGITS).tolist()
+
+
+@dataclass
+class Analytics:
+    """
+    Matchup analytics over a :class:`MatchupMatrix`, one entry per character in
+    ``characters`` order (and per archetype in ``archetypes`` order for the matrices).
+    """
+
+    characters: list[str]
+    archetypes: list[str]
+    strong_evidence: np.ndarray
+    weak_evidence: np.ndarray
+    net_score: np.ndarray
+    counters: np.ndarray
+    countered_by: np.ndarray
+    pagerank: np.ndarray
+    hub: np.ndarray
+    authority: np.ndarray
+    archetype_net: np.ndarray
+    archetype_mean: np.ndarray
+    iterations: dict[str, int]
+
+    def ranking(self, metric: str) -> list[str]:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}; expected one of {', '.join(METRICS)}.")
+        return _ranking(self.characters, getattr(self, metric))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "characters": self.characters,
+            "archetypes": self.archetypes,
+            "strong_evidence": self.strong_evidence.astype(int).tolist(),
+            "weak_evidence": self.weak_evidence.astype(int).tolist(),
+            "net_score": self.net_score.astype(int).tolist(),
+            "counters": self.counters.astype(int).tolist(),
+            "countered_by": self.countered_by.astype(int).tolist(),
+            "pagerank": _rounded(self.pagerank),
+            "hub": _rounded(self.hub),
+            "authority": _rounded(self.authority),
+            "archetype_net": self.archetype_net.astype(int).tolist(),
+            "archetype_mean": _rounded(self.archetype_mean),
+            "rankings": {metric: self.ranking(metric) for metric in METRICS},
+        }
+
+
+@profiled()
+def analyze(matrix: MatchupMatrix, archetype_of: Mapping[str, Optional[str]]) -> Analytics:
+    """
+    Character and archetype analytics from the STRONG_AGAINST evidence in ``matrix``.
+
+    ``net_score`` is a character's summed net evidence over every opponent and
+    ``counters``/``countered_by`` count the opponents it beats/loses to. ``pagerank`` walks
+    STRONG_AGAINST from the countered character to its counter, so rank collects at
+    characters that counter other well-countering characters; HITS runs along
+    STRONG_AGAINST, making good ``hub``s the characters countering many vulnerable ones and
+    high ``authority`` the characters countered by strong hubs. ``archetype_net[a, b]`` sums
+    the net evidence of archetype ``a``'s characters against ``b``'s and
+    ``archetype_mean`` divides it by the number of character pairs.
+    """
+    characters = matrix.characters
+    strong = matrix.strong.astype(np.float64)
+    score = score_matrix(matrix)
+    rank, pagerank_iterations = pagerank(strong.T)
+    hub, authority, hits_iterations = hits(strong)
+
+    archetypes = sorted({archetype_of[name] for name in characters if archetype_of.get(name)})
+    position = {name: i for i, name in enumerate(archetypes)}
+    membership = np.zeros((len(archetypes), len(characters)))
+    for column, name in enumerate(characters):
+        if archetype_of.get(name) in position:
+            membership[position[archetype_of[name]], column] = 1.0
+    archetype_net = membership @ score @ membership.T
+    sizes = membership.sum(axis=1)
+    pairs = np.outer(sizes, sizes) - np.diag(sizes)
+    archetype_mean = np.divide(archetype_net, pairs, out=np.zeros_like(archetype_net), where=pairs > 0)
+
+    return Analytics(
+        characters=characters,
+        archetypes=archetypes,
+        strong_evidence=strong.sum(axis=1),
+        weak_evidence=strong.sum(axis=0),
+        net_score=score.sum(axis=1),
+        counters=(score > 0).sum(axis=1),
+        countered_by=(score < 0).sum(axis=1),
+        pagerank=rank,
+        hub=hub,
+        authority=authority,
+        archetype_net=archetype_net,
+        archetype_mean=archetype_mean,
+        iterations={"pagerank": pagerank_iterations, "hits": hits_iterations},
+    )
+
+
+def build_analytics(nodes: list[dict], matchup_matrix: dict) -> dict[str, Any]:
+    """The export's ``analytics`` block from its nodes and ``matchup_matrix`` section."""
+    archetype_of = {
+        node["properties"]["name"]: node["properties"].get("archetype")
+        for node in nodes
+        if node["label"] == "Character"
+    }
+    return analyze(MatchupMatrix.from_dict(matchup_matrix), archetype_of).as_dict()
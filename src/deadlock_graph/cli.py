@@ -1,43 +1,176 @@
 from __future__ import annotations
 
-from contextlib import closing
-from datetime import datetime
+import asyncio
+import csv
 import json
+from contextlib import ExitStack, closing
+from datetime import datetime
+from functools import partial
 from pathlib import Path
 from typing import Optional
 
-import networkx as nx
 import typer
 
+from .analytics import METRICS, analyze, build_analytics
 from .config import get_settings
-from .db import Neo4jClient
+from .db import AsyncNeo4jClient, Neo4jClient, QueryLog
+from .draft import DraftPool, draft, explain
+from .export import (
+    MANIFEST_NAME,
+    aggregate_edges,
+    build_indexes,
+    build_matchup_matrix,
+    build_meta,
+    build_nodes,
+    finalize_edges,
+    write_binary_graph,
+    write_graph_json,
+    write_sharded_graph,
+)
+from .history import DEFAULT_STORE, MatchupHistory
+from .layout import SeedLayout, force_layout, load_seed_layout
 from .loaders import (
+    disable_cache,
+    enable_cache,
     iter_character_profiles,
     load_archetypes,
     load_character_list,
     load_character_profile,
     load_mechanics,
+    get_workers,
+    set_workers,
     write_checkpoint,
 )
 from .operations import (
     apply_constraints,
     clear_synthesized_matchups,
+    clear_synthesized_matchups_for,
+    fetch_matchup,
     ingest_archetypes,
     ingest_character,
+    ingest_character_async,
+    ingest_characters_bulk,
     ingest_mechanics,
-    run_validation_queries,
+    run_validation_queries_async,
     synthesize_matchups,
+    synthesize_matchups_for,
+)
+from .paths import (
+    DEFAULT_HOP_LIMIT,
+    DEFAULT_HOPS,
+    DEFAULT_MAX_CELLS,
+    PATH_INDEX_NAME,
+    build_paths,
+    write_path_shards,
+)
+from .pipeline import PipelineStats, run_ingest_pipeline
+from .profiling import disable_profiling, enable_profiling, stage
+from .serve import GraphIndex, make_server
+from .synthesis import (
+    EVEN_MODES,
+    Matchup,
+    MatchupMatrix,
+    changed_characters,
+    digest_manifest_path,
+    iter_matchups_csv,
+    matchup_between,
+    record_character_digests,
+    synthesize,
+    synthesize_incremental,
+    write_matchups_csv,
 )
+from .whatif import ACTIONS, parse_edit, simulate
 
 
 app = typer.Typer(help="Deadlock graph ingestion toolkit.")
+history_app = typer.Typer(help="Delta-compressed matchup history (matchups_history/history.jsonl).")
+app.add_typer(history_app, name="history")
+
+# Shared by every client a command builds; reported when the command finishes.
+_query_log: Optional[QueryLog] = None
+
+
+@app.callback()
+def main_options(
+    ctx: typer.Context,
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Re-parse every YAML file instead of reusing validated models cached under temp/cache.",
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-j",
+        min=0,
+        help="Parse character YAML in a process pool of this size (defaults to LOADER_WORKERS).",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Record nested stage timings, call counts and peak memory; print a summary and write a trace.",
+    ),
+    profile_out: Optional[Path] = typer.Option(
+        None,
+        "--profile-out",
+        help="Chrome/Perfetto trace path (defaults to temp/profile/<command>-<timestamp>.trace.json).",
+    ),
+    query_report: bool = typer.Option(
+        False,
+        "--query-report",
+        help="Print timings and update counters for every Cypher query, not only slow ones.",
+    ),
+    cypher_profile: bool = typer.Option(
+        False,
+        "--cypher-profile",
+        help="Run Cypher statements under PROFILE and report database hits per query.",
+    ),
+) -> None:
+    """Deadlock graph ingestion toolkit."""
+    global _query_log
+    settings = get_settings()
+    _query_log = QueryLog(profile=cypher_profile, slow_ms=settings.slow_query_ms)
+
+    def report_queries() -> None:
+        for line in _query_log.report(everything=query_report or cypher_profile):
+            typer.echo(line, err=True)
+
+    ctx.call_on_close(report_queries)
+    if profile or profile_out is not None:
+        _start_profiling(ctx, settings, profile_out)
+    set_workers(settings.loader_workers if workers is None else workers)
+    if no_cache or not settings.loader_cache:
+        disable_cache()
+    else:
+        enable_cache(settings.temp_dir / "cache" / "loaders")
+
+
+def _start_profiling(ctx: typer.Context, settings, trace_path: Optional[Path]) -> None:
+    command = ctx.invoked_subcommand or "cli"
+    if trace_path is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        trace_path = settings.temp_dir / "profile" / f"{command}-{stamp}.trace.json"
+    profiler = enable_profiling()
+    root = ExitStack()
+    root.enter_context(profiler.stage(f"cli.{command}"))
+
+    def finish() -> None:
+        root.close()
+        disable_profiling()
+        profiler.write_trace(trace_path)
+        for line in profiler.summary():
+            typer.echo(line, err=True)
+        typer.echo(f"Profile trace written to {trace_path}", err=True)
+
+    ctx.call_on_close(finish)
 
 
 def _build_client(settings) -> Neo4jClient:
-    auth = None
-    if settings.neo4j_user or settings.neo4j_password:
-        auth = (settings.neo4j_user or "", settings.neo4j_password or "")
-    return Neo4jClient(settings.neo4j_uri, auth=auth)
+    return Neo4jClient.from_settings(settings, query_log=_query_log)
+
+
+def _build_async_client(settings) -> AsyncNeo4jClient:
+    return AsyncNeo4jClient.from_settings(settings, query_log=_query_log)
 
 
 def _resolve_character_path(name: str, data_root: Path) -> Path:
@@ -49,7 +182,7 @@ def _resolve_character_path(name: str, data_root: Path) -> Path:
 def bootstrap() -> None:
     """Create schema constraints."""
     settings = get_settings()
-    with closing(_build_client(settings)) as client:
+    with closing(_build_client(settings)) as client, client.unit_of_work():
         apply_constraints(client)
     typer.echo("Schema constraints ensured.")
 
@@ -74,7 +207,7 @@ def ingest_foundations(
     if dry_run or settings.dry_run:
         typer.echo("Dry-run mode active; skipping Neo4j ingestion.")
         return
-    with closing(_build_client(settings)) as client:
+    with closing(_build_client(settings)) as client, client.unit_of_work():
         apply_constraints(client)
         ingest_archetypes(client, archetypes)
         ingest_mechanics(client, mechanics)
@@ -107,7 +240,7 @@ def ingest_character_cmd(
     if skip_ingest or dry_run or settings.dry_run:
         typer.echo("Dry-run/skip flag detected; halting before database ingestion.")
         return
-    with closing(_build_client(settings)) as client:
+    with closing(_build_client(settings)) as client, client.unit_of_work():
         apply_constraints(client)
         ingest_character(client, profile)
     typer.echo(f"Ingested {profile.character.name} into Neo4j.")
@@ -116,10 +249,33 @@ def ingest_character_cmd(
 @app.command("ingest-all")
 def ingest_all_characters(
     dry_run: bool = typer.Option(False, help="Skip database writes."),
+    bulk: bool = typer.Option(
+        True,
+        "--bulk/--per-character",
+        help="Ingest all profiles in one batched transaction, or one statement per character.",
+    ),
+    batch_size: Optional[int] = typer.Option(
+        None,
+        "--batch-size",
+        min=1,
+        help="Rows per UNWIND batch in bulk mode (defaults to INGEST_BATCH_SIZE).",
+    ),
+    pipeline: bool = typer.Option(
+        False,
+        "--pipeline",
+        help="Overlap parsing, checkpointing and per-character writes in an asyncio pipeline.",
+    ),
+    queue_size: int = typer.Option(
+        8, "--queue-size", min=1, help="Profiles buffered between pipeline stages."
+    ),
 ) -> None:
     """Ingest every character YAML under data/characters."""
     settings = get_settings()
-    profiles = list(iter_character_profiles(settings.data_root / "characters"))
+    if pipeline:
+        _ingest_pipelined(settings, dry_run=dry_run or settings.dry_run, queue_size=queue_size)
+        return
+    with stage("loaders.character_profiles"):
+        profiles = list(iter_character_profiles(settings.data_root / "characters"))
     typer.echo(f"Prepared {len(profiles)} character profiles.")
     if dry_run or settings.dry_run:
         for profile in profiles:
@@ -127,37 +283,150 @@ def ingest_all_characters(
             write_checkpoint(profile, checkpoint_path)
         typer.echo("Dry-run complete; checkpoints generated for all profiles.")
         return
-    with closing(_build_client(settings)) as client:
+    with closing(_build_client(settings)) as client, client.unit_of_work():
         apply_constraints(client)
         for profile in profiles:
             write_checkpoint(
                 profile,
                 settings.temp_dir / f"temp_ingest_{profile.character.slug}.json",
             )
-            ingest_character(client, profile)
+            if not bulk:
+                ingest_character(client, profile)
+        if bulk:
+            stats = ingest_characters_bulk(
+                client, profiles, batch_size=batch_size or settings.ingest_batch_size
+            )
+            typer.echo(
+                f"Bulk ingest: {stats.rows} rows in {stats.batches} batches, "
+                f"{stats.seconds:.3f}s ({stats.rows_per_second:.0f} rows/s)."
+            )
     typer.echo("All characters ingested.")
 
 
+def _ingest_pipelined(settings, *, dry_run: bool, queue_size: int) -> None:
+    paths = sorted((settings.data_root / "characters").glob("*.yaml"))
+    typer.echo(f"Pipelining {len(paths)} character profiles (queue size {queue_size}).")
+    if not dry_run:
+        with closing(_build_client(settings)) as client:
+            apply_constraints(client)
+
+    async def run() -> PipelineStats:
+        if dry_run:
+            return await run_ingest_pipeline(
+                paths, settings.temp_dir, queue_size=queue_size, workers=get_workers()
+            )
+        async with _build_async_client(settings) as client:
+            return await run_ingest_pipeline(
+                paths,
+                settings.temp_dir,
+                partial(ingest_character_async, client),
+                queue_size=queue_size,
+                workers=get_workers(),
+            )
+
+    stats = asyncio.run(run())
+    for line in stats.report():
+        typer.echo(line)
+    typer.echo("Dry-run complete; checkpoints generated for all profiles." if dry_run else "All characters ingested.")
+
+
+SYNTHESIS_ENGINES = ("neo4j", "memory")
+EVEN_MODE_HELP = (
+    "'explicit' stores EVEN_AGAINST rows/edges for every uncountered pair; 'implicit' omits "
+    "them and treats any pair without STRONG/WEAK as EVEN (defaults to EVEN_MODE)."
+)
+
+
+def _implicit_even(even_mode: Optional[str], settings) -> bool:
+    mode = (even_mode or settings.even_mode).lower()
+    if mode not in EVEN_MODES:
+        raise typer.BadParameter(f"Unknown EVEN mode '{mode}'; choose from {', '.join(EVEN_MODES)}.")
+    return mode == "implicit"
+
+
 @app.command("synthesize-matchups")
 def synthesize_matchups_cmd(
     refresh: bool = typer.Option(True, "--refresh/--no-refresh", help="Clear synthesized edges first."),
+    engine: str = typer.Option(
+        "neo4j",
+        "--engine",
+        "-e",
+        help="Where to synthesize: 'neo4j' writes graph edges, 'memory' computes them from YAML.",
+    ),
+    out: Path = typer.Option(
+        Path("matchups.csv"),
+        "--out",
+        "-o",
+        help="CSV written by the memory engine.",
+    ),
+    characters: Optional[list[str]] = typer.Option(
+        None,
+        "--character",
+        "-c",
+        help="Only recompute matchups incident to this character (repeatable).",
+    ),
+    changed: bool = typer.Option(
+        False,
+        "--changed",
+        help="Only recompute characters whose YAML changed since the last recorded synthesis.",
+    ),
+    even_mode: Optional[str] = typer.Option(None, "--even-mode", help=EVEN_MODE_HELP),
 ) -> None:
     """Generate STRONG/WEAK/EVEN matchup relationships."""
+    if engine not in SYNTHESIS_ENGINES:
+        raise typer.BadParameter(f"Unknown engine '{engine}'; choose from {', '.join(SYNTHESIS_ENGINES)}.")
     settings = get_settings()
-    with closing(_build_client(settings)) as client:
-        if refresh:
-            clear_synthesized_matchups(client)
-            typer.echo("Cleared existing synthesized matchups.")
-        synthesize_matchups(client)
-    typer.echo("Matchups synthesized.")
+    implicit_even = _implicit_even(even_mode, settings)
+    characters_dir = settings.data_root / "characters"
+    target = str(out.resolve()) if engine == "memory" else settings.neo4j_uri
+    manifest_path = digest_manifest_path(settings.temp_dir, engine, target)
+    targets = set(characters or [])
+    if changed:
+        targets |= changed_characters(characters_dir, manifest_path)
+    incremental = bool(characters) or changed
+    if incremental and not targets:
+        typer.echo("No character changes detected; matchups are up to date.")
+        return
+    if incremental:
+        typer.echo(f"Incremental synthesis for: {', '.join(sorted(targets))}")
+
+    if engine == "memory":
+        profiles = iter_character_profiles(characters_dir)
+        if incremental and out.exists():
+            matchups = synthesize_incremental(
+                profiles, iter_matchups_csv(out), targets, implicit_even=implicit_even
+            )
+        else:
+            matchups = synthesize(profiles, implicit_even=implicit_even)
+        count = write_matchups_csv(matchups, out)
+        typer.echo(f"Synthesized {count} matchups in memory -> {out}")
+    else:
+        with closing(_build_client(settings)) as client, client.unit_of_work():
+            if incremental:
+                clear_synthesized_matchups_for(client, targets)
+                synthesize_matchups_for(client, targets, implicit_even=implicit_even)
+            else:
+                if refresh:
+                    clear_synthesized_matchups(client)
+                    typer.echo("Cleared existing synthesized matchups.")
+                synthesize_matchups(client, implicit_even=implicit_even)
+        typer.echo("Matchups synthesized.")
+    # Explicit --character runs may leave other edits unsynthesized, so only
+    # full and --changed runs advance the digest manifest.
+    if changed or not characters:
+        record_character_digests(characters_dir, manifest_path)
 
 
 @app.command()
 def validate() -> None:
     """Run validation queries and print outstanding gaps."""
     settings = get_settings()
-    with closing(_build_client(settings)) as client:
-        results = run_validation_queries(client)
+
+    async def collect() -> dict[str, list[str]]:
+        async with _build_async_client(settings) as client:
+            return await run_validation_queries_async(client)
+
+    results = asyncio.run(collect())
     empty = True
     for key, values in results.items():
         if values:
@@ -167,6 +436,143 @@ def validate() -> None:
         typer.echo("No validation gaps found.")
 
 
+@app.command("matchup")
+def matchup_cmd(
+    character: str = typer.Argument(..., help="Character to look up."),
+    opponent: str = typer.Argument(..., help="Opponent character."),
+    matchups_path: Path = typer.Option(
+        Path("matchups.csv"), "--csv", help="Matchup CSV to read (explicit or implicit EVEN)."
+    ),
+    neo4j: bool = typer.Option(False, "--neo4j", help="Query the graph database instead of the CSV."),
+) -> None:
+    """Show how CHARACTER fares against OPPONENT, with the ability-level evidence."""
+    settings = get_settings()
+    roster = {entry.name for entry in load_character_list(settings.data_root / "character_list.yaml").characters}
+    unknown = [name for name in (character, opponent) if name not in roster]
+    if unknown:
+        raise typer.BadParameter(f"Unknown character(s): {', '.join(unknown)}")
+    if character == opponent:
+        raise typer.BadParameter(f"{character} cannot be matched against itself; pick a different opponent.")
+    if neo4j:
+        with closing(_build_client(settings)) as client:
+            rows = fetch_matchup(client, character, opponent)
+        matchups = [Matchup.from_record(character, row["relationship"], opponent, row) for row in rows]
+    else:
+        if not matchups_path.exists():
+            raise typer.BadParameter(f"{matchups_path} not found; run synthesize-matchups first.")
+        matchups = matchup_between(iter_matchups_csv(matchups_path), character, opponent)
+    for matchup in matchups:
+        typer.echo(f"{character} {matchup.relationship} {opponent} (evidence={matchup.evidence})")
+        for entry in matchup.entries:
+            typer.echo(f"  - {entry.counter} counters {entry.countered} via {entry.mechanic}")
+        if matchup.note:
+            typer.echo(f"  {matchup.note}")
+
+
+STORE_OPTION = typer.Option(DEFAULT_STORE, "--store", help="History store (JSON lines).")
+
+
+def _snapshot(history: MatchupHistory, ref: str):
+    try:
+        return history.resolve(ref)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+
+@history_app.command("import")
+def history_import(
+    paths: Optional[list[Path]] = typer.Argument(
+        None, help="CSV snapshots to import (default: matchups_history/*.csv)."
+    ),
+    store: Path = STORE_OPTION,
+) -> None:
+    """Import archived matchup CSVs, oldest first; already imported files are skipped."""
+    history = MatchupHistory(store)
+    sources = paths or sorted(store.parent.glob("*.csv"))
+    try:
+        imported = history.import_csvs(sources)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    for snapshot in imported:
+        typer.echo(f"#{snapshot.id} {snapshot.taken_at} {snapshot.label}: {snapshot.changes} changed rows")
+    typer.echo(f"Imported {len(imported)} snapshot(s) into {store}")
+
+
+@history_app.command("snapshot")
+def history_snapshot(
+    label: str = typer.Argument("snapshot", help="Snapshot label."),
+    matchups_path: Path = typer.Option(Path("matchups.csv"), "--csv", help="Matchup CSV to record."),
+    store: Path = STORE_OPTION,
+) -> None:
+    """Append the current matchups.csv to the history as a delta."""
+    if not matchups_path.exists():
+        raise typer.BadParameter(f"{matchups_path} not found; run synthesize-matchups first.")
+    snapshot = MatchupHistory(store).append(iter_matchups_csv(matchups_path), label)
+    typer.echo(f"Recorded #{snapshot.id} {snapshot.label} ({snapshot.changes} changed rows) in {store}")
+
+
+@history_app.command("list")
+def history_list(store: Path = STORE_OPTION) -> None:
+    """List recorded snapshots."""
+    for snapshot in MatchupHistory(store).snapshots:
+        typer.echo(
+            f"#{snapshot.id:<4} {snapshot.taken_at}  {snapshot.label:<24} "
+            f"{snapshot.rows:>6} rows {snapshot.changes:>6} changed"
+        )
+
+
+@history_app.command("as-of")
+def history_as_of(
+    ref: str = typer.Argument(..., help="Snapshot id, label, 'latest' or a time (2025-10-26T08:30)."),
+    out: Path = typer.Option(Path("matchups_asof.csv"), "--out", "-o", help="CSV to write."),
+    store: Path = STORE_OPTION,
+) -> None:
+    """Reconstruct the matchups CSV as of a snapshot."""
+    history = MatchupHistory(store)
+    snapshot = _snapshot(history, ref)
+    count = write_matchups_csv(history.as_of(snapshot), out)
+    typer.echo(f"Wrote {count} matchups as of #{snapshot.id} {snapshot.label} ({snapshot.taken_at}) -> {out}")
+
+
+@history_app.command("diff")
+def history_diff(
+    old: str = typer.Argument(..., help="Older snapshot reference."),
+    new: str = typer.Argument("latest", help="Newer snapshot reference."),
+    store: Path = STORE_OPTION,
+) -> None:
+    """Print rows added, removed and changed between two snapshots."""
+    history = MatchupHistory(store)
+    changes = history.diff(_snapshot(history, old), _snapshot(history, new))
+    for kind, sign in (("added", "+"), ("removed", "-"), ("changed", "~")):
+        selected = [change for change in changes if change.kind == kind]
+        typer.echo(f"{kind.capitalize()} relationships: {len(selected)}")
+        for change in selected:
+            matchup = change.matchup
+            typer.echo(
+                f" {sign} {matchup.source} {matchup.relationship} {matchup.target} "
+                f"(evidence={matchup.evidence}) -> {matchup.reason}"
+            )
+
+
+@history_app.command("flip")
+def history_flip(
+    character: str = typer.Argument(..., help="Character."),
+    opponent: str = typer.Argument(..., help="Opponent."),
+    store: Path = STORE_OPTION,
+) -> None:
+    """Show when CHARACTER vs OPPONENT last changed relationship type."""
+    history = MatchupHistory(store)
+    flip = history.last_flip(character, opponent)
+    if flip is None:
+        current = history.relations_at(character, opponent, len(history) - 1) if len(history) else ()
+        typer.echo(f"{character} vs {opponent} never flipped ({'/'.join(current) or 'no snapshots'}).")
+        return
+    typer.echo(
+        f"{character} vs {opponent}: {'/'.join(flip.before)} -> {'/'.join(flip.after)} "
+        f"at #{flip.snapshot.id} {flip.snapshot.label} ({flip.snapshot.taken_at})"
+    )
+
+
 @app.command("roster")
 def show_roster() -> None:
     """Print known roster from data/character_list.yaml."""
@@ -185,363 +591,311 @@ def export_static(
         "-o",
         help="Path to write the exported graph JSON.",
     ),
+    layout_seed: Optional[Path] = typer.Option(
+        None,
+        "--layout-seed",
+        help="Previous graph JSON to warm-start node positions from (defaults to --out).",
+    ),
+    cold_layout: bool = typer.Option(
+        False, "--cold-layout", help="Ignore previous positions and lay out from scratch."
+    ),
+    layout_iterations: int = typer.Option(
+        100, "--layout-iterations", min=1, help="Upper bound on force-layout iterations."
+    ),
+    layout_budget: Optional[float] = typer.Option(
+        None, "--layout-budget", min=0.0, help="Stop the force layout after this many seconds."
+    ),
+    shards: Optional[Path] = typer.Option(
+        None,
+        "--shards",
+        help="Also write a manifest plus per-character/per-mechanic shard files to this directory.",
+    ),
+    binary: Optional[Path] = typer.Option(
+        None,
+        "--binary",
+        help="Also write the compact columnar binary graph (DLGB) to this path.",
+    ),
+    pretty: bool = typer.Option(
+        False,
+        "--pretty/--compact",
+        help="Indent the graph JSON for readable diffs (default: compact).",
+    ),
+    even_mode: Optional[str] = typer.Option(None, "--even-mode", help=EVEN_MODE_HELP),
+    paths: bool = typer.Option(
+        False, "--paths/--no-paths", help="Embed k-hop neighbourhoods and next-hop path tables in the graph JSON."
+    ),
+    path_shards: Optional[Path] = typer.Option(
+        None, "--path-shards", help="Write the path tables as an index plus shard files to this directory."
+    ),
+    path_hops: int = typer.Option(DEFAULT_HOPS, "--path-hops", min=1, help="Radius of the k-hop neighbourhoods."),
+    path_hop_limit: int = typer.Option(
+        DEFAULT_HOP_LIMIT, "--path-hop-limit", min=1, help="Most nodes listed per neighbourhood."
+    ),
+    path_max_cells: int = typer.Option(
+        DEFAULT_MAX_CELLS, "--path-max-cells", min=1, help="Skip the path tables above this many next-hop cells."
+    ),
 ) -> None:
     """
     Export the curated YAML dataset (nodes + matchups) as a static JSON graph for the website.
     """
     settings = get_settings()
     data_root = settings.data_root
+    implicit_even = _implicit_even(even_mode, settings)
 
-    archetypes = {a.name: a for a in load_archetypes(data_root / "archetypes.yaml")}
-    mechanics = {m.name: m for m in load_mechanics(data_root / "mechanics.yaml")}
-    roster = load_character_list(data_root / "character_list.yaml")
-    archetype_lookup = {entry.name: entry.archetype for entry in roster.characters}
-    character_profiles = {profile.character.name: profile for profile in iter_character_profiles(data_root / "characters")}
-
-    nodes: list[dict] = []
-    # Aggregate edges by (type, source, target)
-    edge_map: dict[tuple[str, str, str], dict] = {}
-
-    # Utility to append node once with metadata
-    def add_node(node_id: str, label: str, props: dict, size: float) -> None:
-        nodes.append(
-            {
-                "id": node_id,
-                "label": label,
-                "properties": props,
-                "size": size,
-            }
-        )
+    with stage("export.load_inputs"):
+        archetypes = {a.name: a for a in load_archetypes(data_root / "archetypes.yaml")}
+        mechanics = {m.name: m for m in load_mechanics(data_root / "mechanics.yaml")}
+        roster = load_character_list(data_root / "character_list.yaml")
+        archetype_lookup = {entry.name: entry.archetype for entry in roster.characters}
+        roster_aliases = {entry.name: entry.aliases for entry in roster.characters}
+        character_profiles = {profile.character.name: profile for profile in iter_character_profiles(data_root / "characters")}
 
-    # Archetype nodes
-    for arch in sorted(archetypes.values(), key=lambda a: a.name):
-        add_node(
-            node_id=f"archetype:{arch.name}",
-            label="Archetype",
-            props={
-                "name": arch.name,
-                "description": arch.description,
-                "signature_traits": arch.signature_traits,
-                "notes": arch.notes,
-                "sources": [str(src) for src in arch.sources],
-            },
-            size=2.5,
-        )
-
-    # Mechanic nodes
-    for mech in sorted(mechanics.values(), key=lambda m: m.name):
-        add_node(
-            node_id=f"mechanic:{mech.name}",
-            label="Mechanic",
-            props={
-                "name": mech.name,
-                "description": mech.description,
-                "category": mech.category,
-                "archetype_implications": mech.archetype_implications,
-                "sources": [str(src) for src in mech.sources],
-            },
-            size=1.5,
-        )
-
-    # Ability nodes
-    ability_nodes_added: set[str] = set()
-    for profile in character_profiles.values():
-        for ability in profile.abilities:
-            ability_id = f"ability:{ability.name}"
-            if ability_id in ability_nodes_added:
-                continue
-            add_node(
-                node_id=ability_id,
-                label="Ability",
-                props={
-                    "name": ability.name,
-                    "slot": ability.slot,
-                    "type": ability.type,
-                    "description": ability.description,
-                    "notes": ability.notes,
-                },
-                size=1.0,
-            )
-            ability_nodes_added.add(ability_id)
-
-    # Character nodes
-    for name, profile in sorted(character_profiles.items()):
-        archetype = archetype_lookup.get(name)
-        add_node(
-            node_id=f"character:{name}",
-        label="Character",
-        props={
-            "name": name,
-            "description": profile.character.description,
-            "archetype": archetype,
-            "source_url": str(profile.character.source_url),
-            "last_updated": profile.character.last_updated.isoformat(),
-            "abilities": [ability.name for ability in profile.abilities],
-            "ability_slots": [
-                {"name": ability.name, "slot": ability.slot, "type": ability.type}
-                for ability in profile.abilities
-            ],
-            "mechanics_used": sorted(
-                {mech for ability in profile.abilities for mech in ability.mechanics.uses}
-            ),
-            "mechanics_countered": sorted(
-                {mech for ability in profile.abilities for mech in ability.mechanics.counters}
-            ),
-        },
-        size=2.0,
-    )
-
-    # Relationship helpers
-    def _edge_id_for(rel_type: str, source: str, target: str) -> str:
-        if rel_type == "IS_ARCHETYPE":
-            return f"edge:{source}::{target}"
-        if rel_type == "HAS_ABILITY":
-            return f"edge:{source}->{target}"
-        if rel_type == "USES_MECHANIC":
-            return f"edge:{source}->{target}:uses"
-        if rel_type == "COUNTERS_MECHANIC":
-            return f"edge:{source}->{target}:counters"
-        if rel_type == "CHARACTER_COUNTERS_MECHANIC":
-            return f"edge:{source}->{target}:character_counter"
-        # Matchups & others
-        return f"edge:{source}->{target}:{rel_type.lower()}"
-
-    def _merge_props(dst: dict, src: dict) -> dict:
-        # evidence_count
-        dst["evidence_count"] = int(dst.get("evidence_count", 0)) + int(src.get("evidence_count", 1))
-        # reasons: promote to list and dedupe
-        if "reason" in src and src["reason"]:
-            dst.setdefault("reasons", [])
-            if src["reason"] not in dst["reasons"]:
-                dst["reasons"].append(src["reason"])
-        for r in src.get("reasons", []) or []:
-            dst.setdefault("reasons", [])
-            if r not in dst["reasons"]:
-                dst["reasons"].append(r)
-        # ability_sources aggregation
-        if "ability" in src and src["ability"]:
-            dst.setdefault("ability_sources", [])
-            if src["ability"] not in dst["ability_sources"]:
-                dst["ability_sources"].append(src["ability"])
-        for a in src.get("ability_sources", []) or []:
-            dst.setdefault("ability_sources", [])
-            if a not in dst["ability_sources"]:
-                dst["ability_sources"].append(a)
-        # pass through other simple fields if absent
-        for k, v in src.items():
-            if k in ("evidence_count", "reason", "reasons", "ability", "ability_sources"):
-                continue
-            if k not in dst:
-                dst[k] = v
-        return dst
-
-    def add_edge(edge_id: str, source: str, target: str, rel_type: str, props: dict | None = None) -> None:
-        key = (rel_type, source, target)
-        if key not in edge_map:
-            edge_map[key] = {
-                "id": _edge_id_for(rel_type, source, target) if edge_id is None else edge_id,
-                "source": source,
-                "target": target,
-                "type": rel_type,
-                "properties": {},
-            }
-        # Merge properties with aggregation semantics
-        edge_map[key]["properties"] = _merge_props(edge_map[key]["properties"], props or {})
-
-    # Character -> Archetype
-    for name, profile in character_profiles.items():
-        archetype = archetype_lookup.get(name)
-        if archetype:
-            add_edge(
-                edge_id=f"edge:character:{name}::archetype:{archetype}",
-                source=f"character:{name}",
-                target=f"archetype:{archetype}",
-                rel_type="IS_ARCHETYPE",
-            )
-
-    # Character -> Ability & ability relationships
-    for name, profile in character_profiles.items():
-        char_id = f"character:{name}"
-        for ability in profile.abilities:
-            ability_id = f"ability:{ability.name}"
-            add_edge(
-                edge_id=f"edge:{char_id}->{ability_id}",
-                source=char_id,
-                target=ability_id,
-                rel_type="HAS_ABILITY",
-                props={"slot": ability.slot, "ability_type": ability.type},
-            )
-            # Ability uses mechanics
-            for mech_name in ability.mechanics.uses:
-                if mech_name in mechanics:
-                    mech_id = f"mechanic:{mech_name}"
-                    add_edge(
-                        edge_id=f"edge:{ability_id}->{mech_id}:uses",
-                        source=ability_id,
-                        target=mech_id,
-                        rel_type="USES_MECHANIC",
-                    )
-            # Ability counters mechanics
-            for mech_name in ability.mechanics.counters:
-                if mech_name in mechanics:
-                    mech_id = f"mechanic:{mech_name}"
-                    add_edge(
-                        edge_id=f"edge:{ability_id}->{mech_id}:counters",
-                        source=ability_id,
-                        target=mech_id,
-                        rel_type="COUNTERS_MECHANIC",
-                    )
-                    add_edge(
-                        edge_id=f"edge:{char_id}->{mech_id}:character_counter",
-                        source=char_id,
-                        target=mech_id,
-                        rel_type="CHARACTER_COUNTERS_MECHANIC",
-                        props={"ability": ability.name},
-                    )
+    nodes = build_nodes(archetypes, mechanics, archetype_lookup, character_profiles, roster_aliases)
 
     # Matchup data from CSV if available
     matchups_path = Path("matchups.csv")
     if matchups_path.exists():
-        import csv
-
         with matchups_path.open("r", encoding="utf-8") as handle:
-            reader = csv.DictReader(handle)
-            for idx, row in enumerate(reader):
-                source = row["source"]
-                target = row["target"]
-                rel_type = row["relationship"]
-                add_edge(
-                    edge_id=None,
-                    source=f"character:{source}",
-                    target=f"character:{target}",
-                    rel_type=rel_type,
-                    props={
-                        "evidence_count": int(row.get("evidence", "0")) or 1,
-                        "reason": row.get("reason", ""),
-                    },
-                )
+            edge_map = aggregate_edges(
+                character_profiles, archetype_lookup, mechanics, csv.DictReader(handle)
+            )
     else:
         typer.echo("matchups.csv not found; skipping matchup edges.", err=True)
-
-    # Build networkx graph for layout and neighborhood indexes
-    # Build final edge list from aggregation, enforcing EVEN removal when STRONG/WEAK exist for the pair
-    # First, build a map of undirected pairs that have strong/weak
-    pair_rel: dict[tuple[str, str], set[str]] = {}
-    for (rel, s, t) in edge_map.keys():
-        a, b = (s, t) if s < t else (t, s)
-        pair_rel.setdefault((a, b), set()).add(rel)
-    # Filter out EVEN edges when pair has STRONG or WEAK
-    edges: list[dict] = []
-    seen_even_pairs: set[tuple[str, str]] = set()
-    for (rel, s, t), rec in edge_map.items():
-        a, b = (s, t) if s < t else (t, s)
-        rels = pair_rel.get((a, b), set())
-        if rel == "EVEN_AGAINST" and ("STRONG_AGAINST" in rels or "WEAK_AGAINST" in rels):
-            continue
-        if rel == "EVEN_AGAINST":
-            # Keep only canonical direction a -> b once
-            if (a, b) in seen_even_pairs:
-                continue
-            seen_even_pairs.add((a, b))
-            s, t = a, b
-            rec["source"], rec["target"] = s, t
-            rec["id"] = _edge_id_for(rel, s, t)
-        # Ensure evidence_count at least 1
-        props = rec.get("properties") or {}
-        if "evidence_count" not in props:
-            props["evidence_count"] = 1
-        rec["properties"] = props
-        # Use deterministic id if None/empty
-        if not rec.get("id"):
-            rec["id"] = _edge_id_for(rel, s, t)
-        edges.append(rec)
-
-    g = nx.Graph()
+        edge_map = aggregate_edges(character_profiles, archetype_lookup, mechanics)
+    edges = finalize_edges(edge_map, implicit_even=implicit_even)
+
+    seed_layout = SeedLayout() if cold_layout else load_seed_layout(layout_seed or out)
+    layout = force_layout(
+        [node["id"] for node in nodes],
+        ((edge["source"], edge["target"]) for edge in edges),
+        seed_layout=seed_layout,
+        max_iterations=layout_iterations,
+        time_budget=layout_budget,
+    )
     for node in nodes:
-        g.add_node(node["id"])
-    for edge in edges:
-        g.add_edge(edge["source"], edge["target"])
+        node["x"], node["y"] = layout.positions[node["id"]]
+    typer.echo(
+        f"Layout: {layout.iterations} iterations in {layout.seconds:.3f}s "
+        f"({layout.seeded} seeded, {layout.mobile} moved"
+        f"{', converged' if layout.converged else ''})."
+    )
 
-    layout = nx.spring_layout(g, seed=42, k=None, iterations=100)
-    for node in nodes:
-        coords = layout.get(node["id"], (0.0, 0.0))
-        node["x"], node["y"] = float(coords[0]), float(coords[1])
-
-    # Degree metrics
-    degrees_in: dict[str, int] = {}
-    degrees_out: dict[str, int] = {}
-    for edge in edges:
-        degrees_out[edge["source"]] = degrees_out.get(edge["source"], 0) + 1
-        degrees_in[edge["target"]] = degrees_in.get(edge["target"], 0) + 1
-
-    # Indexes
-    neighbors = {node: sorted(g.neighbors(node)) for node in g.nodes}
-    strong_map: dict[str, list[str]] = {}
-    weak_map: dict[str, list[str]] = {}
-    even_map: dict[str, list[str]] = {}
-    for edge in edges:
-        rel = edge["type"]
-        if rel == "STRONG_AGAINST":
-            strong_map.setdefault(edge["source"], []).append(edge["target"])
-        elif rel == "WEAK_AGAINST":
-            weak_map.setdefault(edge["source"], []).append(edge["target"])
-        elif rel == "EVEN_AGAINST":
-            even_map.setdefault(edge["source"], []).append(edge["target"])
-
-    mechanic_usage: dict[str, int] = {}
-    mechanic_counter: dict[str, int] = {}
-    for node in nodes:
-        if node["label"] == "Character":
-            for mech in node["properties"].get("mechanics_used", []):
-                mechanic_usage[mech] = mechanic_usage.get(mech, 0) + 1
-            for mech in node["properties"].get("mechanics_countered", []):
-                mechanic_counter[mech] = mechanic_counter.get(mech, 0) + 1
-
-    # Metadata summary
-    label_distribution = {}
-    for node in nodes:
-        label_distribution[node["label"]] = label_distribution.get(node["label"], 0) + 1
+    def path_block() -> Optional[dict]:
+        if not paths and path_shards is None:
+            return None
+        try:
+            path_tables = build_paths(
+                nodes, edges, hops=path_hops, hop_limit=path_hop_limit, max_cells=path_max_cells
+            )
+        except ValueError as exc:
+            typer.echo(f"{exc} Skipping path tables.", err=True)
+            return None
+        if path_shards is not None:
+            index = write_path_shards(path_tables, path_shards)
+            typer.echo(f"Wrote path tables for {len(index['targets'])} characters to {path_shards / PATH_INDEX_NAME}")
+        return path_tables if paths else None
+
+    matrix = build_matchup_matrix(nodes, edges)
+    sections = {
+        "meta": build_meta(nodes, edges, "implicit" if implicit_even else "explicit"),
+        "nodes": (node for node in nodes),
+        "edges": (edge for edge in edges),
+        "indexes": partial(build_indexes, nodes, edges),
+        "matchup_matrix": matrix,
+        "analytics": partial(build_analytics, nodes, matrix),
+        "paths": path_block,
+    }
+    if shards is None and binary is None:
+        # Derived blocks are built as the writer reaches them and dropped once written.
+        write_graph_json(out, sections, pretty=pretty)
+        typer.echo(f"Exported graph to {out}")
+        return
 
-    archetype_counts = {}
-    for node in nodes:
-        if node["label"] == "Character":
-            archetype = node["properties"].get("archetype")
-            if archetype:
-                archetype_counts[archetype] = archetype_counts.get(archetype, 0) + 1
+    # Shards and the binary need every block at once.
+    graph_payload = {key: value() if callable(value) else value for key, value in sections.items()}
+    graph_payload.update(nodes=nodes, edges=edges)
+    if graph_payload["paths"] is None:
+        del graph_payload["paths"]
+    write_graph_json(out, graph_payload, pretty=pretty)
+    typer.echo(f"Exported graph to {out}")
+    if shards is not None:
+        manifest = write_sharded_graph(graph_payload, shards)
+        typer.echo(f"Wrote {len(manifest['shards'])} shards + {shards / MANIFEST_NAME}")
+    if binary is not None:
+        size = write_binary_graph(graph_payload, binary)
+        typer.echo(f"Wrote binary graph to {binary} ({size} bytes)")
+
+
+@app.command("analyze")
+def analyze_cmd(
+    matchups_path: Path = typer.Option(Path("matchups.csv"), "--csv", help="Matchup CSV to analyse."),
+    graph: Optional[Path] = typer.Option(
+        None, "--graph", "-g", help="Analyse an exported graph JSON instead of the CSV."
+    ),
+    from_yaml: bool = typer.Option(
+        False, "--from-yaml", help="Synthesize matchups from data/ YAML in memory instead of reading the CSV."
+    ),
+    top: int = typer.Option(10, "--top", "-k", min=1, help="Characters listed per ranking."),
+    as_json: bool = typer.Option(False, "--json", help="Print the full analytics block as JSON."),
+) -> None:
+    """Rank characters by net counter score, PageRank and HITS, and compare archetypes."""
+    settings = get_settings()
+    if graph is not None:
+        if not graph.exists():
+            raise typer.BadParameter(f"{graph} not found; run export-static first.")
+        payload = json.loads(graph.read_text(encoding="utf-8"))
+        matrix = MatchupMatrix.from_dict(
+            payload.get("matchup_matrix") or build_matchup_matrix(payload["nodes"], payload["edges"])
+        )
+        archetype_of = {
+            node["properties"]["name"]: node["properties"].get("archetype")
+            for node in payload["nodes"]
+            if node["label"] == "Character"
+        }
+    else:
+        roster = load_character_list(settings.data_root / "character_list.yaml")
+        archetype_of = {entry.name: entry.archetype for entry in roster.characters}
+        if from_yaml:
+            matchups = synthesize(iter_character_profiles(settings.data_root / "characters"), implicit_even=True)
+        elif matchups_path.exists():
+            matchups = iter_matchups_csv(matchups_path)
+        else:
+            raise typer.BadParameter(f"{matchups_path} not found; run synthesize-matchups or pass --from-yaml.")
+        matrix = MatchupMatrix.from_matchups(archetype_of, matchups)
+    result = analyze(matrix, archetype_of)
+    if as_json:
+        typer.echo(json.dumps(result.as_dict(), indent=2, ensure_ascii=False))
+        return
 
-    mechanic_counts = {}
-    for node in nodes:
-        if node["label"] == "Mechanic":
-            mechanic_counts[node["properties"]["category"]] = (
-                mechanic_counts.get(node["properties"]["category"], 0) + 1
+    values = {metric: getattr(result, metric) for metric in METRICS}
+    index = {name: i for i, name in enumerate(result.characters)}
+    for metric in METRICS:
+        typer.echo(f"Top {min(top, len(result.characters))} by {metric}:")
+        for rank, name in enumerate(result.ranking(metric)[:top], start=1):
+            i = index[name]
+            typer.echo(
+                f"  {rank:>2}. {name:<16} {values[metric][i]:>10.4g}  "
+                f"(beats {result.counters[i]}, loses to {result.countered_by[i]})"
+            )
+    if result.archetypes:
+        width = max(len(name) for name in result.archetypes) + 2
+        typer.echo("Archetype net evidence (row vs column, mean per character pair):")
+        typer.echo(" " * width + "".join(f"{name:>{width + 8}}" for name in result.archetypes))
+        for row, name in enumerate(result.archetypes):
+            cells = "".join(
+                f"{int(result.archetype_net[row, col]):>{width}} ({result.archetype_mean[row, col]:+.2f})"
+                for col in range(len(result.archetypes))
             )
+            typer.echo(f"{name:<{width}}{cells}")
+
+
+@app.command("draft")
+def draft_cmd(
+    enemies: list[str] = typer.Argument(..., help="The enemy team's characters."),
+    size: int = typer.Option(6, "--size", min=1, help="Team size."),
+    top: int = typer.Option(5, "--top", "-k", min=1, help="Number of lineups to return."),
+    require: Optional[list[str]] = typer.Option(None, "--require", "-r", help="Character that must be picked (repeatable)."),
+    ban: Optional[list[str]] = typer.Option(None, "--ban", "-b", help="Character that may not be picked (repeatable)."),
+    exposure_weight: float = typer.Option(
+        1.0, "--exposure-weight", min=0.0, help="Penalty per enemy counter to a mechanic the team uses."
+    ),
+    graph: Optional[Path] = typer.Option(
+        None, "--graph", "-g", help="Read mechanics from an exported graph JSON instead of data/ YAML."
+    ),
+    brief: bool = typer.Option(False, "--brief", help="Only list the lineups, without per-enemy explanations."),
+) -> None:
+    """Find the lineups that counter the most enemy mechanics while exposing the fewest."""
+    settings = get_settings()
+    if graph is not None:
+        if not graph.exists():
+            raise typer.BadParameter(f"{graph} not found; run export-static first.")
+        pool = DraftPool.from_graph(json.loads(graph.read_text(encoding="utf-8")))
+    else:
+        pool = DraftPool.from_profiles(iter_character_profiles(settings.data_root / "characters"))
+    try:
+        result = draft(
+            pool,
+            enemies,
+            size=size,
+            top=top,
+            required=require or [],
+            banned=ban or [],
+            exposure_weight=exposure_weight,
+        )
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    for rank, lineup in enumerate(result.lineups, start=1):
+        typer.echo(
+            f"#{rank} score={lineup.score:g} (countered={lineup.countered}, exposed={lineup.exposed}): "
+            + ", ".join(lineup.members)
+        )
+        if not brief:
+            for line in explain(pool, enemies, lineup.members):
+                typer.echo(f"  {line}")
+    typer.echo(
+        f"Searched {result.nodes} nodes over {result.classes} candidate classes in {result.seconds * 1000:.1f} ms",
+        err=True,
+    )
 
-    graph_payload = {
-        "meta": {
-            "generated_at": datetime.now().isoformat(),
-            "node_count": len(nodes),
-            "edge_count": len(edges),
-            "label_distribution": label_distribution,
-            "archetype_counts": archetype_counts,
-            "mechanic_category_counts": mechanic_counts,
-        },
-        "nodes": nodes,
-        "edges": edges,
-        "indexes": {
-            "degrees_in": degrees_in,
-            "degrees_out": degrees_out,
-            "neighbors": neighbors,
-            "strong_against": strong_map,
-            "weak_against": weak_map,
-            "even_against": even_map,
-            "mechanic_usage": mechanic_usage,
-            "mechanic_counter": mechanic_counter,
-        },
-    }
 
-    out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(json.dumps(graph_payload, indent=2), encoding="utf-8")
-    typer.echo(f"Exported graph to {out}")
+@app.command("what-if")
+def what_if_cmd(
+    edits: list[str] = typer.Argument(
+        ...,
+        help=f"Hypothetical edits applied in order, e.g. 'Haze:Smoke Bomb +counters Stealth' "
+        f"or 'Haze:Fixation -ability' ({', '.join(ACTIONS)}).",
+    ),
+    even_mode: Optional[str] = typer.Option(None, "--even-mode", help=EVEN_MODE_HELP),
+) -> None:
+    """Show how ability edits would change the synthesized matchups, without touching the YAML or Neo4j."""
+    settings = get_settings()
+    implicit_even = _implicit_even(even_mode, settings)
+    profiles = list(iter_character_profiles(settings.data_root / "characters"))
+    try:
+        result = simulate(profiles, [parse_edit(text) for text in edits], implicit_even=implicit_even)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    for line in result.lines():
+        typer.echo(line)
+    typer.echo(
+        f"Recomputed matchups of {', '.join(result.characters)} in {result.seconds * 1000:.1f} ms",
+        err=True,
+    )
+
+
+@app.command()
+def serve(
+    graph: Path = typer.Option(
+        Path("website/public/graph.json"), "--graph", "-g", help="Exported graph JSON to serve."
+    ),
+    from_yaml: bool = typer.Option(
+        False, "--from-yaml", help="Build the indexes from data/ YAML (matchups synthesized in memory)."
+    ),
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind."),
+    port: int = typer.Option(8765, "--port", "-p", help="Port to listen on (0 picks a free one)."),
+    cache_size: int = typer.Option(4096, "--cache-size", min=0, help="LRU response cache entries (0 disables)."),
+    access_log: bool = typer.Option(False, "--access-log", help="Log every request to stderr."),
+) -> None:
+    """Serve matchups, neighbors, mechanic usage and paths as a local read-only JSON API."""
+    settings = get_settings()
+    if from_yaml:
+        index = GraphIndex.from_yaml(settings.data_root)
+    elif graph.exists():
+        index = GraphIndex.from_graph(graph)
+    else:
+        raise typer.BadParameter(f"{graph} not found; run export-static or pass --from-yaml.")
+    server = make_server(index, host, port, cache_size=cache_size, access_log=access_log)
+    summary = index.summary()
+    typer.echo(
+        f"Serving {summary['characters']} characters / {summary['nodes']} nodes on "
+        f"http://{server.server_address[0]}:{server.server_address[1]} (Ctrl+C to stop)"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        typer.echo("Stopping.")
+    finally:
+        server.server_close()
 
 
 def main() -> None:  # pragma: no cover
@@ -16,11 +16,26 @@ class Settings(BaseSettings):
     data_root: Path = Field(Path("data"))
     temp_dir: Path = Field(Path("temp"))
     dry_run: bool = False
+    neo4j_pool_size: int = 16
+    neo4j_fetch_size: int = 1000
+    neo4j_acquisition_timeout: float = 60.0
+    slow_query_ms: float = 500.0
+    ingest_batch_size: int = 500
+    loader_cache: bool = True
+    loader_workers: int = 0
+    even_mode: str = "explicit"
 
     @field_validator("data_root", "temp_dir", mode="before")
     def _expand_paths(cls, value: str | Path) -> Path:
         return Path(value).expanduser().resolve()
 
+    @field_validator("even_mode")
+    def _check_even_mode(cls, value: str) -> str:
+        value = value.lower()
+        if value not in ("explicit", "implicit"):
+            raise ValueError("EVEN_MODE must be 'explicit' or 'implicit'")
+        return value
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
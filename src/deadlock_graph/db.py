@@ -1,30 +1,237 @@
 from __future__ import annotations
 
-from contextlib import AbstractContextManager, contextmanager
-from typing import Any, Callable, Generator
+import asyncio
+import re
+from contextlib import AbstractContextManager, asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, AsyncIterator, Awaitable, Callable, Generator, Mapping, Optional
 
-from neo4j import GraphDatabase
+from neo4j import READ_ACCESS, AsyncGraphDatabase, GraphDatabase
 from neo4j.exceptions import Neo4jError
 
 
+Query = str | tuple[str, dict[str, Any]]
+
+
+COUNTER_FIELDS = (
+    "nodes_created",
+    "nodes_deleted",
+    "relationships_created",
+    "relationships_deleted",
+    "properties_set",
+    "labels_added",
+    "labels_removed",
+    "indexes_added",
+    "indexes_removed",
+    "constraints_added",
+    "constraints_removed",
+)
+# Schema and admin commands cannot be run under PROFILE.
+_UNPROFILABLE = re.compile(
+    r"^\s*(CREATE|DROP|SHOW)\s+(CONSTRAINT|INDEX|DATABASE|USER|ROLE)", re.IGNORECASE
+)
+
+
+def _default_name(cypher: str) -> str:
+    text = " ".join(cypher.split())
+    return text if len(text) <= 60 else text[:57] + "..."
+
+
+def _plan_db_hits(plan: Optional[Mapping[str, Any]]) -> int:
+    if not plan:
+        return 0
+    return int(plan.get("dbHits", 0)) + sum(_plan_db_hits(child) for child in plan.get("children", []))
+
+
+@dataclass
+class QueryStats:
+    """Aggregated result summaries of every statement run under one query name."""
+
+    name: str
+    cypher: str
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    available_ms: int = 0
+    consumed_ms: int = 0
+    rows: int = 0
+    db_hits: int = 0
+    counters: dict[str, int] = field(default_factory=dict)
+
+
+class QueryLog:
+    """
+    Per-query-name aggregation of Neo4j result summaries.
+
+    ``seconds`` is client wall time (network and fetch included); ``available_ms`` and
+    ``consumed_ms`` are the server's ``result_available_after``/``result_consumed_after``.
+    With ``profile`` every statement that allows it runs as ``PROFILE`` and its plan's
+    database hits are summed.
+    """
+
+    def __init__(self, *, profile: bool = False, slow_ms: float = 500.0) -> None:
+        self.profile = profile
+        self.slow_ms = slow_ms
+        self.stats: dict[str, QueryStats] = {}
+
+    def prepare(self, cypher: str) -> str:
+        if self.profile and not _UNPROFILABLE.match(cypher):
+            return "PROFILE " + cypher
+        return cypher
+
+    def record(self, name: str, cypher: str, summary: Any, seconds: float, rows: int = 0) -> None:
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = QueryStats(name, _default_name(cypher))
+        stats.calls += 1
+        stats.seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+        stats.rows += rows
+        if summary is None:
+            return
+        stats.available_ms += summary.result_available_after or 0
+        stats.consumed_ms += summary.result_consumed_after or 0
+        stats.db_hits += _plan_db_hits(getattr(summary, "profile", None))
+        for counter in COUNTER_FIELDS:
+            value = getattr(summary.counters, counter, 0)
+            if value:
+                stats.counters[counter] = stats.counters.get(counter, 0) + value
+
+    def slow(self) -> list[QueryStats]:
+        return [stats for stats in self.stats.values() if stats.max_seconds * 1000 >= self.slow_ms]
+
+    def report(self, *, everything: bool = False) -> list[str]:
+        """Table of slow queries (every query with ``everything``), slowest total first."""
+        selected = list(self.stats.values()) if everything else self.slow()
+        if not selected:
+            return []
+        title = "Cypher queries" if everything else f"Slow Cypher queries (>= {self.slow_ms:.0f} ms)"
+        lines = [
+            title,
+            f"{'query':<36} {'calls':>5} {'total ms':>9} {'max ms':>8} {'server ms':>9} "
+            f"{'rows':>7} {'db hits':>9}  updates",
+        ]
+        for stats in sorted(selected, key=lambda item: item.seconds, reverse=True):
+            updates = ", ".join(f"{key}={value}" for key, value in stats.counters.items()) or "-"
+            lines.append(
+                f"{stats.name[:36]:<36} {stats.calls:>5} {stats.seconds * 1000:>9.1f} "
+                f"{stats.max_seconds * 1000:>8.1f} {stats.available_ms + stats.consumed_ms:>9} "
+                f"{stats.rows:>7} {stats.db_hits if self.profile else '-':>9}  {updates}"
+            )
+        return lines
+
+
+def _driver_options(
+    max_pool_size: Optional[int], acquisition_timeout: Optional[float]
+) -> dict[str, Any]:
+    options: dict[str, Any] = {}
+    if max_pool_size:
+        options["max_connection_pool_size"] = max_pool_size
+    if acquisition_timeout:
+        options["connection_acquisition_timeout"] = acquisition_timeout
+    return options
+
+
+def _settings_kwargs(settings: Any) -> dict[str, Any]:
+    auth = None
+    if settings.neo4j_user or settings.neo4j_password:
+        auth = (settings.neo4j_user or "", settings.neo4j_password or "")
+    return {
+        "auth": auth,
+        "max_pool_size": settings.neo4j_pool_size,
+        "fetch_size": settings.neo4j_fetch_size,
+        "acquisition_timeout": settings.neo4j_acquisition_timeout,
+    }
+
+
 class Neo4jClient:
-    def __init__(self, uri: str, auth: tuple[str, str] | None = None) -> None:
-        self._driver = GraphDatabase.driver(uri, auth=auth)
+    """
+    Synchronous client over one pooled driver.
+
+    Statements normally borrow a pooled session each; inside :meth:`unit_of_work` they all
+    share one session, so a command issuing many statements pays session setup once.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        auth: tuple[str, str] | None = None,
+        *,
+        max_pool_size: Optional[int] = None,
+        fetch_size: Optional[int] = None,
+        acquisition_timeout: Optional[float] = None,
+        query_log: Optional[QueryLog] = None,
+    ) -> None:
+        self._driver = GraphDatabase.driver(
+            uri, auth=auth, **_driver_options(max_pool_size, acquisition_timeout)
+        )
+        self._session_options = {"fetch_size": fetch_size} if fetch_size else {}
+        self._active: Any = None
+        self.query_log = query_log
+
+    @classmethod
+    def from_settings(cls, settings: Any, query_log: Optional[QueryLog] = None) -> "Neo4jClient":
+        return cls(settings.neo4j_uri, query_log=query_log, **_settings_kwargs(settings))
 
     def close(self) -> None:
         self._driver.close()
 
     @contextmanager
-    def session(self) -> Generator[AbstractContextManager, None, None]:
-        session = self._driver.session()
+    def session(self, **options: Any) -> Generator[AbstractContextManager, None, None]:
+        if self._active is not None and not options:
+            yield self._active
+            return
+        session = self._driver.session(**{**self._session_options, **options})
         try:
             yield session
         finally:
             session.close()
 
-    def execute(self, cypher: str, parameters: dict[str, Any] | None = None) -> None:
+    @contextmanager
+    def unit_of_work(self) -> Generator["Neo4jClient", None, None]:
+        """Run every statement issued inside the block on one shared session."""
+        if self._active is not None:
+            yield self
+            return
         with self.session() as session:
-            session.run(cypher, parameters or {})
+            self._active = session
+            try:
+                yield self
+            finally:
+                self._active = None
+
+    def run(
+        self,
+        runner: Any,
+        cypher: str,
+        parameters: dict[str, Any] | None = None,
+        *,
+        name: Optional[str] = None,
+        fetch: bool = False,
+    ) -> tuple[Any, list[dict[str, Any]]]:
+        """Run on a session or transaction, consume the result and log its summary."""
+        log = self.query_log
+        statement = log.prepare(cypher) if log is not None else cypher
+        started = perf_counter()
+        result = runner.run(statement, parameters or {})
+        rows = result.data() if fetch else []
+        summary = result.consume()
+        if log is not None:
+            log.record(name or _default_name(cypher), cypher, summary, perf_counter() - started, len(rows))
+        return summary, rows
+
+    def execute(
+        self, cypher: str, parameters: dict[str, Any] | None = None, *, name: Optional[str] = None
+    ) -> Any:
+        with self.session() as session:
+            return self.run(session, cypher, parameters, name=name)[0]
+
+    def fetch(
+        self, cypher: str, parameters: dict[str, Any] | None = None, *, name: Optional[str] = None
+    ) -> list[dict[str, Any]]:
+        with self.session() as session:
+            return self.run(session, cypher, parameters, name=name, fetch=True)[1]
 
     def execute_tx(
         self,
@@ -37,3 +244,104 @@ class Neo4jClient:
                 return session.execute_write(work, metadata=metadata or {})
             except Neo4jError as exc:
                 raise RuntimeError(f"Neo4j transaction failed: {exc}") from exc
+
+
+class AsyncNeo4jClient:
+    """
+    Client over the driver's async API.
+
+    Sessions are not safe for concurrent use, so :meth:`fetch_many` gives each query its own
+    pooled read session and awaits them together; ``max_pool_size`` bounds the fan-out.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        auth: tuple[str, str] | None = None,
+        *,
+        max_pool_size: Optional[int] = None,
+        fetch_size: Optional[int] = None,
+        acquisition_timeout: Optional[float] = None,
+        query_log: Optional[QueryLog] = None,
+    ) -> None:
+        self._driver = AsyncGraphDatabase.driver(
+            uri, auth=auth, **_driver_options(max_pool_size, acquisition_timeout)
+        )
+        self._session_options = {"fetch_size": fetch_size} if fetch_size else {}
+        self.query_log = query_log
+
+    @classmethod
+    def from_settings(
+        cls, settings: Any, query_log: Optional[QueryLog] = None
+    ) -> "AsyncNeo4jClient":
+        return cls(settings.neo4j_uri, query_log=query_log, **_settings_kwargs(settings))
+
+    async def close(self) -> None:
+        await self._driver.close()
+
+    async def __aenter__(self) -> "AsyncNeo4jClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def session(self, **options: Any) -> AsyncIterator[Any]:
+        session = self._driver.session(**{**self._session_options, **options})
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    async def run(
+        self,
+        runner: Any,
+        cypher: str,
+        parameters: dict[str, Any] | None = None,
+        *,
+        name: Optional[str] = None,
+        fetch: bool = False,
+    ) -> tuple[Any, list[dict[str, Any]]]:
+        log = self.query_log
+        statement = log.prepare(cypher) if log is not None else cypher
+        started = perf_counter()
+        result = await runner.run(statement, parameters or {})
+        rows = await result.data() if fetch else []
+        summary = await result.consume()
+        if log is not None:
+            log.record(name or _default_name(cypher), cypher, summary, perf_counter() - started, len(rows))
+        return summary, rows
+
+    async def execute(
+        self, cypher: str, parameters: dict[str, Any] | None = None, *, name: Optional[str] = None
+    ) -> Any:
+        async with self.session() as session:
+            return (await self.run(session, cypher, parameters, name=name))[0]
+
+    async def fetch(
+        self, cypher: str, parameters: dict[str, Any] | None = None, *, name: Optional[str] = None
+    ) -> list[dict[str, Any]]:
+        async with self.session(default_access_mode=READ_ACCESS) as session:
+            return (await self.run(session, cypher, parameters, name=name, fetch=True))[1]
+
+    async def fetch_many(self, queries: Mapping[str, Query]) -> dict[str, list[dict[str, Any]]]:
+        """Run independent read queries concurrently; results keep the keys of ``queries``."""
+
+        def _fetch(name: str, query: Query) -> Awaitable[list[dict[str, Any]]]:
+            cypher, parameters = (query, None) if isinstance(query, str) else query
+            return self.fetch(cypher, parameters, name=name)
+
+        results = await asyncio.gather(*(_fetch(name, query) for name, query in queries.items()))
+        return dict(zip(queries, results))
+
+    async def execute_tx(
+        self,
+        work: Callable[[Any], Awaitable[Any]],
+        *,
+        metadata: dict[str, Any] | None = None,
+    ) -> Any:
+        async with self.session() as session:
+            try:
+                return await session.execute_write(work, metadata=metadata or {})
+            except Neo4jError as exc:
+                raise RuntimeError(f"Neo4j transaction failed: {exc}") from exc
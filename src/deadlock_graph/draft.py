@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Iterable, Iterator, Mapping, Sequence
+
+from .models import CharacterProfile
+from .profiling import profiled
+
+
+@dataclass(frozen=True)
+class Lineup:
+    members: tuple[str, ...]
+    score: float
+    countered: int
+    exposed: int
+
+
+@dataclass
+class DraftResult:
+    lineups: list[Lineup] = field(default_factory=list)
+    classes: int = 0
+    nodes: int = 0
+    seconds: float = 0.0
+
+
+class DraftPool:
+    """
+    Characters encoded as mechanic bitmasks: bit ``i`` of ``uses[name]``/``counters[name]``
+    is set when any of the character's abilities uses/counters ``mechanics[i]``.
+    """
+
+    def __init__(self, characters: Mapping[str, tuple[Iterable[str], Iterable[str]]]) -> None:
+        entries = {name: (set(uses), set(counters)) for name, (uses, counters) in characters.items()}
+        self.mechanics = sorted({m for uses, counters in entries.values() for m in uses | counters})
+        bit = {name: 1 << i for i, name in enumerate(self.mechanics)}
+        self.uses = {name: sum(bit[m] for m in uses) for name, (uses, _) in entries.items()}
+        self.counters = {name: sum(bit[m] for m in counters) for name, (_, counters) in entries.items()}
+
+    @classmethod
+    def from_profiles(cls, profiles: Iterable[CharacterProfile]) -> "DraftPool":
+        return cls(
+            {
+                profile.character.name: (
+                    (m for ability in profile.abilities for m in ability.mechanics.uses),
+                    (m for ability in profile.abilities for m in ability.mechanics.counters),
+                )
+                for profile in profiles
+            }
+        )
+
+    @classmethod
+    def from_graph(cls, payload: dict) -> "DraftPool":
+        """Use the ``mechanics_used``/``mechanics_countered`` of exported Character nodes."""
+        return cls(
+            {
+                node["properties"]["name"]: (
+                    node["properties"].get("mechanics_used", []),
+                    node["properties"].get("mechanics_countered", []),
+                )
+                for node in payload["nodes"]
+                if node["label"] == "Character"
+            }
+        )
+
+    def names(self, mask: int) -> list[str]:
+        return [name for i, name in enumerate(self.mechanics) if mask >> i & 1]
+
+
+class _Search:
+    """
+    Branch-and-bound over equivalence classes of candidates.
+
+    Each enemy gets its own block of mechanic bits, so a candidate reduces to two masks
+    over ``(enemy, mechanic)`` pairs: ``cover`` (pairs it counters) and ``expose`` (pairs
+    where that enemy counters a mechanic the candidate uses). A team's score is
+    ``popcount(OR cover) - weight * popcount(OR expose)``, which only depends on the set
+    of distinct masks it contains; candidates with identical masks form one class, and a
+    class chosen once can supply further members ("spares") at no change in score.
+    """
+
+    def __init__(self, cover: list[int], expose: list[int], sizes: list[int], slots: int, weight: float, top: int):
+        order = sorted(range(len(cover)), key=lambda c: (-cover[c].bit_count(), expose[c].bit_count()))
+        self.order = order
+        self.cover = [cover[c] for c in order]
+        self.expose = [expose[c] for c in order]
+        self.sizes = [sizes[c] for c in order]
+        self.slots = slots
+        self.weight = weight
+        self.top = top
+        count = len(order)
+        # prefix[i] = summed cover popcounts of the i best classes; suffix_or[i] = OR of cover[i:].
+        self.prefix = [0] * (count + 1)
+        for i, mask in enumerate(self.cover):
+            self.prefix[i + 1] = self.prefix[i] + mask.bit_count()
+        self.suffix_or = [0] * (count + 1)
+        for i in range(count - 1, -1, -1):
+            self.suffix_or[i] = self.suffix_or[i + 1] | self.cover[i]
+        self.heap: list[tuple[float, int, tuple[int, ...]]] = []
+        self.nodes = 0
+        self._seq = itertools.count()
+
+    def score(self, cover: int, expose: int) -> float:
+        return cover.bit_count() - self.weight * expose.bit_count()
+
+    def bound(self, start: int, cover: int, expose: int, free: int) -> float:
+        # Coverage is submodular: the free slots add at most the best standalone covers still
+        # available, and never more than the pairs those classes can reach. Exposure only grows.
+        stop = min(len(self.cover), start + free)
+        gain = min(self.prefix[stop] - self.prefix[start], (self.suffix_or[start] & ~cover).bit_count())
+        return cover.bit_count() + gain - self.weight * expose.bit_count()
+
+    def _record(self, chosen: tuple[int, ...], cover: int, expose: int) -> None:
+        entry = (self.score(cover, expose), next(self._seq), chosen)
+        if len(self.heap) < self.top:
+            heapq.heappush(self.heap, entry)
+        elif entry[0] > self.heap[0][0]:
+            heapq.heapreplace(self.heap, entry)
+
+    def _threshold(self) -> float:
+        return self.heap[0][0] if len(self.heap) == self.top else float("-inf")
+
+    def run(self, cover: int, expose: int) -> list[tuple[float, tuple[int, ...]]]:
+        self._visit(0, (), cover, expose, 0)
+        return [(score, chosen) for score, _, chosen in sorted(self.heap, key=lambda e: (-e[0], e[1]))]
+
+    def _visit(self, start: int, chosen: tuple[int, ...], cover: int, expose: int, spares: int) -> None:
+        self.nodes += 1
+        free = self.slots - len(chosen)
+        if free <= spares:
+            # Remaining slots can be filled with spare members of the chosen classes.
+            self._record(chosen, cover, expose)
+            if free == 0:
+                return
+        for index in range(start, len(self.cover)):
+            # Bounds only shrink as ``index`` grows (classes are sorted by cover), so stop early.
+            if self.bound(index, cover, expose, free) <= self._threshold():
+                break
+            self._visit(
+                index + 1,
+                chosen + (index,),
+                cover | self.cover[index],
+                expose | self.expose[index],
+                spares + self.sizes[index] - 1,
+            )
+
+
+def _expand(groups: Sequence[Sequence[str]], slots: int) -> Iterator[tuple[str, ...]]:
+    """Teams taking at least one member from every group and ``slots`` members in total."""
+    extra = slots - len(groups)
+    capacities = [len(group) - 1 for group in groups]
+
+    def distributions(position: int, left: int) -> Iterator[tuple[int, ...]]:
+        if position == len(groups):
+            if left == 0:
+                yield ()
+            return
+        for take in range(min(left, capacities[position]), -1, -1):
+            for rest in distributions(position + 1, left - take):
+                yield (take,) + rest
+
+    for counts in distributions(0, extra):
+        choices = [itertools.combinations(group, take + 1) for group, take in zip(groups, counts)]
+        for picks in itertools.product(*choices):
+            yield tuple(name for pick in picks for name in pick)
+
+
+@profiled()
+def draft(
+    pool: DraftPool,
+    enemies: Sequence[str],
+    *,
+    size: int = 6,
+    top: int = 5,
+    required: Sequence[str] = (),
+    banned: Iterable[str] = (),
+    exposure_weight: float = 1.0,
+) -> DraftResult:
+    """
+    Best ``top`` teams of ``size`` against ``enemies``.
+
+    A team scores one point per ``(enemy, mechanic)`` pair where the enemy uses a mechanic
+    some member counters, minus ``exposure_weight`` per pair where the enemy counters a
+    mechanic some member uses. ``required`` characters are always in the team; enemies
+    and ``banned`` characters are never picked.
+    """
+    started = perf_counter()
+    unknown = [name for name in (*enemies, *required) if name not in pool.uses]
+    if unknown:
+        raise ValueError(f"Unknown character(s): {', '.join(unknown)}")
+    if len(required) > size:
+        raise ValueError(f"{len(required)} required characters do not fit a team of {size}.")
+    excluded = set(enemies) | set(banned)
+    clash = excluded & set(required)
+    if clash:
+        raise ValueError(f"Required characters are enemies or banned: {', '.join(sorted(clash))}")
+
+    width = len(pool.mechanics)
+
+    def masks(name: str) -> tuple[int, int]:
+        cover = expose = 0
+        for slot, enemy in enumerate(enemies):
+            cover |= (pool.counters[name] & pool.uses[enemy]) << (slot * width)
+            expose |= (pool.uses[name] & pool.counters[enemy]) << (slot * width)
+        return cover, expose
+
+    base_cover = base_expose = 0
+    for name in required:
+        cover, expose = masks(name)
+        base_cover, base_expose = base_cover | cover, base_expose | expose
+    classes: dict[tuple[int, int], list[str]] = {}
+    for name in sorted(pool.uses):
+        if name not in excluded and name not in required:
+            classes.setdefault(masks(name), []).append(name)
+    slots = size - len(required)
+    if sum(len(members) for members in classes.values()) < slots:
+        raise ValueError(f"Not enough candidates to fill a team of {size}.")
+
+    keys = list(classes)
+    search = _Search(
+        [key[0] for key in keys],
+        [key[1] for key in keys],
+        [len(classes[key]) for key in keys],
+        slots,
+        exposure_weight,
+        top,
+    )
+    result = DraftResult(classes=len(keys))
+    for score, chosen in search.run(base_cover, base_expose):
+        groups = [classes[keys[search.order[index]]] for index in chosen]
+        cover, expose = base_cover, base_expose
+        for index in chosen:
+            cover, expose = cover | search.cover[index], expose | search.expose[index]
+        for team in _expand(groups, slots):
+            result.lineups.append(
+                Lineup(tuple(required) + team, score, cover.bit_count(), expose.bit_count())
+            )
+            if len(result.lineups) == top:
+                break
+        if len(result.lineups) == top:
+            break
+    result.nodes = search.nodes
+    result.seconds = perf_counter() - started
+    return result
+
+
+def explain(pool: DraftPool, enemies: Sequence[str], members: Sequence[str]) -> list[str]:
+    """Per enemy: which members counter which of its mechanics, and where the team is exposed."""
+    lines = []
+    for enemy in enemies:
+        counters = []
+        for mechanic_bit, mechanic in enumerate(pool.mechanics):
+            bit = 1 << mechanic_bit
+            if not pool.uses[enemy] & bit:
+                continue
+            by = [name for name in members if pool.counters[name] & bit]
+            if by:
+                counters.append(f"{mechanic} ({', '.join(by)})")
+        exposed = []
+        for mechanic_bit, mechanic in enumerate(pool.mechanics):
+            bit = 1 << mechanic_bit
+            if not pool.counters[enemy] & bit:
+                continue
+            users = [name for name in members if pool.uses[name] & bit]
+            if users:
+                exposed.append(f"{mechanic} ({', '.join(users)})")
+        lines.append(
+            f"vs {enemy}: counters {'; '.join(counters) or '-'} | exposed {'; '.join(exposed) or '-'}"
+        )
+    return lines
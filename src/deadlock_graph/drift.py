@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterable, Mapping, Optional
+
+from .models import Archetype, CharacterProfile, Mechanic
+from .profiling import profiled
+
+
+KINDS = ("archetype", "mechanic", "character", "ability")
+# Set-valued fields that mirror relationships; compared as sets and reported as +/- names.
+EDGE_FIELDS = frozenset(
+    {"IS_ARCHETYPE", "CHARACTER_COUNTERS_MECHANIC", "USES_MECHANIC", "COUNTERS_MECHANIC"}
+)
+
+# One round trip: every entity with the properties and edges the ingest writes. Top-level
+# "ability" rows are abilities no character has.
+DRIFT_QUERY = """
+MATCH (c:Character)
+RETURN 'character' AS kind, c.name AS name,
+       c {.description, .source_url, .last_updated, .aliases} AS props,
+       [(c)-[:IS_ARCHETYPE]->(arch:Archetype) | arch.name] AS archetypes,
+       [(c)-[:CHARACTER_COUNTERS_MECHANIC]->(m:Mechanic) | m.name] AS counters,
+       [(c)-[has:HAS_ABILITY]->(ab:Ability) | {
+           props: ab {.name, .description, .type, .slot, .notes},
+           has: has {.slot, .type},
+           uses: [(ab)-[:USES_MECHANIC]->(m:Mechanic) | m.name],
+           counters: [(ab)-[:COUNTERS_MECHANIC]->(m:Mechanic) | m.name]
+       }] AS abilities
+UNION ALL
+MATCH (m:Mechanic)
+RETURN 'mechanic' AS kind, m.name AS name,
+       m {.category, .description, .archetype_implications, .sources} AS props,
+       [] AS archetypes, [] AS counters, [] AS abilities
+UNION ALL
+MATCH (a:Archetype)
+RETURN 'archetype' AS kind, a.name AS name,
+       a {.description, .signature_traits, .notes, .sources} AS props,
+       [] AS archetypes, [] AS counters, [] AS abilities
+UNION ALL
+MATCH (ab:Ability) WHERE NOT ()-[:HAS_ABILITY]->(ab)
+RETURN 'ability' AS kind, ab.name AS name, ab {.description, .type, .slot, .notes} AS props,
+       [] AS archetypes, [] AS counters, [] AS abilities
+"""
+
+
+def _canonical_time(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if hasattr(value, "to_native"):
+        value = value.to_native()
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        # Neo4j stores zone-less datetimes as UTC.
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def _digest(payload: Any) -> str:
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Entity:
+    """
+    Canonical properties of one node plus its child entities (a character's abilities).
+
+    ``digest`` covers the entity's own properties and edge sets; ``rollup`` also covers
+    every child's rollup, so two equal rollups prove the whole subtree matches.
+    """
+
+    props: dict[str, Any]
+    children: dict[str, "Entity"] = field(default_factory=dict)
+    digest: str = ""
+    rollup: str = ""
+
+    def seal(self) -> "Entity":
+        for child in self.children.values():
+            child.seal()
+        self.digest = _digest(self.props)
+        self.rollup = _digest([self.digest, sorted((name, c.rollup) for name, c in self.children.items())])
+        return self
+
+
+# kind -> entity name -> entity
+State = dict[str, dict[str, Entity]]
+
+
+def _ability_entity(
+    props: Mapping[str, Any],
+    has: Mapping[str, Any],
+    uses: Iterable[str],
+    counters: Iterable[str],
+) -> Entity:
+    return Entity(
+        {
+            "description": props.get("description"),
+            "type": props.get("type"),
+            "slot": props.get("slot"),
+            "notes": props.get("notes"),
+            "HAS_ABILITY.slot": has.get("slot"),
+            "HAS_ABILITY.type": has.get("type"),
+            "USES_MECHANIC": sorted(set(uses)),
+            "COUNTERS_MECHANIC": sorted(set(counters)),
+        }
+    )
+
+
+@profiled()
+def yaml_state(
+    profiles: Iterable[CharacterProfile],
+    mechanics: Iterable[Mechanic],
+    archetypes: Iterable[Archetype],
+) -> State:
+    """Canonical state the ingest commands would write for the parsed YAML models."""
+    state: State = {kind: {} for kind in KINDS}
+    archetype_names = set()
+    for archetype in archetypes:
+        archetype_names.add(archetype.name)
+        state["archetype"][archetype.name] = Entity(
+            {
+                "description": archetype.description,
+                "signature_traits": list(archetype.signature_traits),
+                "notes": archetype.notes,
+                "sources": [str(src) for src in archetype.sources],
+            }
+        ).seal()
+    for mechanic in mechanics:
+        state["mechanic"][mechanic.name] = Entity(
+            {
+                "category": mechanic.category,
+                "description": mechanic.description,
+                "archetype_implications": list(mechanic.archetype_implications),
+                "sources": [str(src) for src in mechanic.sources],
+            }
+        ).seal()
+    for profile in profiles:
+        character = profile.character
+        abilities = {
+            ability.name: _ability_entity(
+                {
+                    "description": ability.description,
+                    "type": ability.type,
+                    "slot": ability.slot,
+                    "notes": ability.notes,
+                },
+                {"slot": ability.slot, "type": ability.type},
+                ability.mechanics.uses,
+                ability.mechanics.counters,
+            )
+            for ability in profile.abilities
+        }
+        state["character"][character.name] = Entity(
+            {
+                "description": character.description,
+                "source_url": str(character.source_url),
+                "last_updated": _canonical_time(character.last_updated),
+                "aliases": list(character.aliases),
+                # Both ingest paths skip only the edge for an unknown archetype; abilities still land.
+                "IS_ARCHETYPE": [character.archetype] if character.archetype in archetype_names else [],
+                "CHARACTER_COUNTERS_MECHANIC": sorted(
+                    {name for ability in profile.abilities for name in ability.mechanics.counters}
+                ),
+            },
+            abilities,
+        ).seal()
+    return state
+
+
+@profiled()
+def db_state(rows: Iterable[Mapping[str, Any]]) -> State:
+    """Canonical state from the rows of :data:`DRIFT_QUERY`."""
+    state: State = {kind: {} for kind in KINDS}
+    for row in rows:
+        kind, name, props = row["kind"], row["name"], dict(row["props"] or {})
+        if kind == "character":
+            abilities = {
+                ability["props"]["name"]: _ability_entity(
+                    ability["props"], ability["has"] or {}, ability["uses"], ability["counters"]
+                )
+                for ability in row["abilities"]
+            }
+            props["last_updated"] = _canonical_time(props.get("last_updated"))
+            props["aliases"] = list(props.get("aliases") or [])
+            props["IS_ARCHETYPE"] = sorted(set(row["archetypes"]))
+            props["CHARACTER_COUNTERS_MECHANIC"] = sorted(set(row["counters"]))
+            state[kind][name] = Entity(props, abilities).seal()
+        elif kind == "ability":
+            state[kind][name] = _ability_entity(props, {}, (), ()).seal()
+        else:
+            # The ingest coalesces list properties to [], so a missing list reads as empty.
+            for key in ("archetype_implications", "signature_traits", "sources"):
+                if key in props and props[key] is None:
+                    props[key] = []
+            state[kind][name] = Entity(props).seal()
+    return state
+
+
+@dataclass(frozen=True)
+class Drift:
+    """
+    One difference. ``field`` is empty when the whole entity exists on one side only
+    (``yaml``/``db`` then say where it exists); for edge fields they hold the names present
+    only on that side.
+    """
+
+    kind: str
+    name: str
+    field: str
+    yaml: Any
+    db: Any
+
+    def describe(self) -> str:
+        if not self.field:
+            return f"{self.kind} {self.name}: {'missing in YAML' if self.yaml is False else 'missing in DB'}"
+        if self.field in EDGE_FIELDS:
+            parts = []
+            if self.yaml:
+                parts.append(f"missing in DB {self.yaml}")
+            if self.db:
+                parts.append(f"extra in DB {self.db}")
+            return f"{self.kind} {self.name}: {self.field} " + "; ".join(parts)
+        return f"{self.kind} {self.name}: {self.field} YAML={self.yaml!r} DB={self.db!r}"
+
+
+@dataclass
+class DriftReport:
+    drifts: list[Drift] = field(default_factory=list)
+    entities: int = 0
+    descended: int = 0
+
+    @property
+    def clean(self) -> bool:
+        return not self.drifts
+
+
+def _property_drift(kind: str, name: str, yaml: Entity, db: Entity) -> list[Drift]:
+    drifts = []
+    for key in sorted(yaml.props.keys() | db.props.keys()):
+        left, right = yaml.props.get(key), db.props.get(key)
+        if left == right:
+            continue
+        if key in EDGE_FIELDS:
+            left_set, right_set = set(left or ()), set(right or ())
+            drifts.append(Drift(kind, name, key, sorted(left_set - right_set), sorted(right_set - left_set)))
+        else:
+            drifts.append(Drift(kind, name, key, left, right))
+    return drifts
+
+
+def _compare(
+    kind: str,
+    yaml: Mapping[str, Entity],
+    db: Mapping[str, Entity],
+    report: DriftReport,
+    prefix: str = "",
+) -> None:
+    for name in sorted(yaml.keys() | db.keys()):
+        report.entities += 1
+        left, right = yaml.get(name), db.get(name)
+        label = f"{prefix}{name}"
+        if left is None or right is None:
+            report.drifts.append(Drift(kind, label, "", left is not None, right is not None))
+            continue
+        if left.rollup == right.rollup:
+            continue
+        report.descended += 1
+        if left.digest != right.digest:
+            report.drifts.extend(_property_drift(kind, label, left, right))
+        if left.children or right.children:
+            _compare("ability", left.children, right.children, report, f"{label}/")
+
+
+@profiled()
+def compare_states(yaml: State, db: State) -> DriftReport:
+    """
+    Compare two states top-down by digest.
+
+    A kind whose combined digest matches is skipped whole; otherwise only entities with a
+    mismatched rollup are opened, and their properties only when their own digest differs,
+    so the property-level work is proportional to the drift.
+    """
+    report = DriftReport()
+    for kind in KINDS:
+        left, right = yaml.get(kind, {}), db.get(kind, {})
+        if _digest(sorted((n, e.rollup) for n, e in left.items())) == _digest(
+            sorted((n, e.rollup) for n, e in right.items())
+        ):
+            report.entities += len(left)
+            continue
+        _compare(kind, left, right, report)
+    return report
@@ -0,0 +1,1123 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import struct
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, Mapping, Optional
+
+import numpy as np
+
+from .models import Archetype, CharacterProfile, Mechanic
+from .profiling import profiled
+from .synthesis import EVIDENCE_FIELDS, Evidence, MatchupMatrix, decode_evidence, parse_reasons
+
+
+MANIFEST_NAME = "manifest.json"
+SHARD_LAYOUT_VERSION = 1
+ARCHETYPE_SHARD = "archetypes"
+
+# Per-node index maps (node id -> node ids), sliced into shards and stored as CSR in binary.
+NODE_INDEXES = (
+    "neighbors",
+    "strong_against",
+    "weak_against",
+    "even_against",
+    "mechanic_used_by",
+    "mechanic_countered_by",
+    "mechanic_used_by_characters",
+    "mechanic_countered_by_characters",
+    "ability_owners",
+    "archetype_members",
+)
+SLICED_INDEXES = NODE_INDEXES
+# Edge types inverted into "target -> sources" maps by build_indexes().
+INVERTED_EDGES = ("HAS_ABILITY", "IS_ARCHETYPE", "USES_MECHANIC", "COUNTERS_MECHANIC")
+# Search index: word prefixes up to SEARCH_PREFIX_LEN characters plus SEARCH_NGRAM-grams.
+SEARCH_PREFIX_LEN = 3
+SEARCH_NGRAM = 3
+SEARCH_WORD = re.compile(r"\w+")
+
+BINARY_MAGIC = b"DLGB"
+# v2: evidence CSR columns and the matchup_matrix/analytics/paths sections. v1 files still load.
+BINARY_VERSION = 2
+BINARY_READABLE = (1, 2)
+BINARY_ALIGN = 8
+# Index maps stored as CSR (offsets over node ids + flat neighbour ids).
+CSR_INDEXES = NODE_INDEXES
+# Edge properties with dedicated columns; anything else goes to the per-edge extras JSON.
+EDGE_COLUMNS = ("evidence_count", "reasons", "evidence")
+# Per-character analytics vectors and their column dtypes; archetype matrices are stored flat.
+ANALYTICS_COLUMNS = {
+    "strong_evidence": "<i4",
+    "weak_evidence": "<i4",
+    "net_score": "<i4",
+    "counters": "<i4",
+    "countered_by": "<i4",
+    "pagerank": "<f8",
+    "hub": "<f8",
+    "authority": "<f8",
+    "archetype_net": "<i4",
+    "archetype_mean": "<f8",
+}
+
+
+def edge_id_for(rel_type: str, source: str, target: str) -> str:
+    if rel_type == "IS_ARCHETYPE":
+        return f"edge:{source}::{target}"
+    if rel_type == "HAS_ABILITY":
+        return f"edge:{source}->{target}"
+    if rel_type == "USES_MECHANIC":
+        return f"edge:{source}->{target}:uses"
+    if rel_type == "COUNTERS_MECHANIC":
+        return f"edge:{source}->{target}:counters"
+    if rel_type == "CHARACTER_COUNTERS_MECHANIC":
+        return f"edge:{source}->{target}:character_counter"
+    # Matchups & others
+    return f"edge:{source}->{target}:{rel_type.lower()}"
+
+
+class EdgeRecord:
+    """One aggregated edge; ``reasons``, ``ability_sources`` and ``evidence`` are insertion-ordered sets."""
+
+    __slots__ = (
+        "id",
+        "source",
+        "target",
+        "type",
+        "evidence_count",
+        "reasons",
+        "ability_sources",
+        "evidence",
+        "extra",
+    )
+
+    def __init__(self, edge_id: str, source: str, target: str, rel_type: str) -> None:
+        self.id = edge_id
+        self.source = source
+        self.target = target
+        self.type = rel_type
+        self.evidence_count = 0
+        self.reasons: dict[str, None] = {}
+        self.ability_sources: dict[str, None] = {}
+        self.evidence: dict[Evidence, None] = {}
+        self.extra: dict[str, Any] = {}
+
+    def properties(self) -> dict[str, Any]:
+        props: dict[str, Any] = {"evidence_count": self.evidence_count}
+        if self.reasons:
+            props["reasons"] = list(self.reasons)
+        if self.ability_sources:
+            props["ability_sources"] = list(self.ability_sources)
+        if self.evidence:
+            props["evidence"] = [entry.as_dict() for entry in self.evidence]
+        for key, value in self.extra.items():
+            props.setdefault(key, value)
+        return props
+
+    def as_edge(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "source": self.source,
+            "target": self.target,
+            "type": self.type,
+            "properties": self.properties(),
+        }
+
+
+class EdgeAggregator:
+    """
+    Merge edge contributions keyed by ``(type, source, target)``.
+
+    Each contribution adds its ``evidence_count`` (default 1), unions ``reason``/``reasons``,
+    ``ability``/``ability_sources`` and structured ``evidence`` in first-seen order, and keeps
+    the first value of any other property. Legacy matchup reason strings are split into
+    :class:`Evidence` entries once per distinct string, no matter how many edges repeat it.
+    """
+
+    _RESERVED = frozenset(
+        {"evidence_count", "reason", "reasons", "ability", "ability_sources", "evidence"}
+    )
+
+    def __init__(self) -> None:
+        self._records: dict[tuple[str, str, str], EdgeRecord] = {}
+        self._parsed: dict[str, tuple[Evidence, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[EdgeRecord]:
+        return iter(self._records.values())
+
+    def keys(self) -> Iterable[tuple[str, str, str]]:
+        return self._records.keys()
+
+    def _add_reason(self, record: EdgeRecord, reason: str) -> None:
+        if not reason or reason in record.reasons:
+            return
+        record.reasons[reason] = None
+        entries = self._parsed.get(reason)
+        if entries is None:
+            entries = self._parsed[reason] = tuple(parse_reasons(reason))
+        for entry in entries:
+            record.evidence[entry] = None
+
+    def add(
+        self,
+        rel_type: str,
+        source: str,
+        target: str,
+        props: Optional[dict[str, Any]] = None,
+        edge_id: Optional[str] = None,
+    ) -> EdgeRecord:
+        key = (rel_type, source, target)
+        record = self._records.get(key)
+        if record is None:
+            record = self._records[key] = EdgeRecord(
+                edge_id or edge_id_for(rel_type, source, target), source, target, rel_type
+            )
+        props = props or {}
+        record.evidence_count += int(props.get("evidence_count", 1))
+        self._add_reason(record, props.get("reason") or "")
+        for reason in props.get("reasons") or ():
+            self._add_reason(record, reason)
+        for entry in props.get("evidence") or ():
+            record.evidence[entry] = None
+        if props.get("ability"):
+            record.ability_sources[props["ability"]] = None
+        for ability in props.get("ability_sources") or ():
+            record.ability_sources[ability] = None
+        for name, value in props.items():
+            if name not in self._RESERVED and name not in record.extra:
+                record.extra[name] = value
+        return record
+
+
+@profiled()
+def build_nodes(
+    archetypes: Mapping[str, Archetype],
+    mechanics: Mapping[str, Mechanic],
+    archetype_lookup: Mapping[str, str],
+    character_profiles: Mapping[str, CharacterProfile],
+    roster_aliases: Optional[Mapping[str, Iterable[str]]] = None,
+) -> list[dict]:
+    """
+    Archetype, mechanic, ability and character nodes in export order.
+
+    Character ``aliases`` merge the profile's with ``roster_aliases`` (from the roster file).
+    """
+    nodes: list[dict] = []
+
+    # Utility to append node once with metadata
+    def add_node(node_id: str, label: str, props: dict, size: float) -> None:
+        nodes.append(
+            {
+                "id": node_id,
+                "label": label,
+                "properties": props,
+                "size": size,
+            }
+        )
+
+    # Archetype nodes
+    for arch in sorted(archetypes.values(), key=lambda a: a.name):
+        add_node(
+            node_id=f"archetype:{arch.name}",
+            label="Archetype",
+            props={
+                "name": arch.name,
+                "description": arch.description,
+                "signature_traits": arch.signature_traits,
+                "notes": arch.notes,
+                "sources": [str(src) for src in arch.sources],
+            },
+            size=2.5,
+        )
+
+    # Mechanic nodes
+    for mech in sorted(mechanics.values(), key=lambda m: m.name):
+        add_node(
+            node_id=f"mechanic:{mech.name}",
+            label="Mechanic",
+            props={
+                "name": mech.name,
+                "description": mech.description,
+                "category": mech.category,
+                "archetype_implications": mech.archetype_implications,
+                "sources": [str(src) for src in mech.sources],
+            },
+            size=1.5,
+        )
+
+    # Ability nodes
+    ability_nodes_added: set[str] = set()
+    for profile in character_profiles.values():
+        for ability in profile.abilities:
+            ability_id = f"ability:{ability.name}"
+            if ability_id in ability_nodes_added:
+                continue
+            add_node(
+                node_id=ability_id,
+                label="Ability",
+                props={
+                    "name": ability.name,
+                    "slot": ability.slot,
+                    "type": ability.type,
+                    "description": ability.description,
+                    "notes": ability.notes,
+                },
+                size=1.0,
+            )
+            ability_nodes_added.add(ability_id)
+
+    # Character nodes
+    for name, profile in sorted(character_profiles.items()):
+        add_node(
+            node_id=f"character:{name}",
+            label="Character",
+            props={
+                "name": name,
+                "description": profile.character.description,
+                "archetype": archetype_lookup.get(name),
+                "source_url": str(profile.character.source_url),
+                "last_updated": profile.character.last_updated.isoformat(),
+                "aliases": sorted(set(profile.character.aliases) | set((roster_aliases or {}).get(name, ()))),
+                "abilities": [ability.name for ability in profile.abilities],
+                "ability_slots": [
+                    {"name": ability.name, "slot": ability.slot, "type": ability.type}
+                    for ability in profile.abilities
+                ],
+                "mechanics_used": sorted(
+                    {mech for ability in profile.abilities for mech in ability.mechanics.uses}
+                ),
+                "mechanics_countered": sorted(
+                    {mech for ability in profile.abilities for mech in ability.mechanics.counters}
+                ),
+            },
+            size=2.0,
+        )
+    return nodes
+
+
+@profiled()
+def aggregate_edges(
+    character_profiles: Mapping[str, CharacterProfile],
+    archetype_lookup: Mapping[str, str],
+    mechanics: Mapping[str, Mechanic],
+    matchup_rows: Optional[Iterable[Mapping[str, str]]] = None,
+) -> EdgeAggregator:
+    """Structural edges from the profiles plus matchup edges from ``matchups.csv`` rows."""
+    edge_map = EdgeAggregator()
+
+    # Character -> Archetype
+    for name in character_profiles:
+        archetype = archetype_lookup.get(name)
+        if archetype:
+            edge_map.add("IS_ARCHETYPE", f"character:{name}", f"archetype:{archetype}")
+
+    # Character -> Ability & ability relationships
+    for name, profile in character_profiles.items():
+        char_id = f"character:{name}"
+        for ability in profile.abilities:
+            ability_id = f"ability:{ability.name}"
+            edge_map.add(
+                "HAS_ABILITY",
+                char_id,
+                ability_id,
+                {"slot": ability.slot, "ability_type": ability.type},
+            )
+            # Ability uses mechanics
+            for mech_name in ability.mechanics.uses:
+                if mech_name in mechanics:
+                    edge_map.add("USES_MECHANIC", ability_id, f"mechanic:{mech_name}")
+            # Ability counters mechanics
+            for mech_name in ability.mechanics.counters:
+                if mech_name in mechanics:
+                    mech_id = f"mechanic:{mech_name}"
+                    edge_map.add("COUNTERS_MECHANIC", ability_id, mech_id)
+                    edge_map.add(
+                        "CHARACTER_COUNTERS_MECHANIC", char_id, mech_id, {"ability": ability.name}
+                    )
+
+    # Matchup data from CSV if available
+    for row in matchup_rows or ():
+        props: dict[str, Any] = {"evidence_count": int(row.get("evidence", "0")) or 1}
+        if any(field in row for field in EVIDENCE_FIELDS):
+            # Structured rows carry their evidence as-is and no reason strings; the EVEN note
+            # is the same constant on every EVEN row, so it is left implied.
+            props["evidence"] = decode_evidence(row)
+        else:
+            # Legacy rows: reason strings are parsed once per distinct string.
+            props["reason"] = row.get("reason", "")
+        edge_map.add(
+            row["relationship"],
+            f"character:{row['source']}",
+            f"character:{row['target']}",
+            props,
+        )
+    return edge_map
+
+
+@profiled()
+def finalize_edges(edge_map: EdgeAggregator, *, implicit_even: bool = False) -> list[dict]:
+    """
+    Edge list from the aggregation, dropping EVEN where STRONG/WEAK exist for the pair.
+
+    With ``implicit_even`` no EVEN edge is emitted at all; the ``matchup_matrix`` section
+    (see :func:`build_matchup_matrix`) still answers every pair.
+    """
+    # First, build a map of undirected pairs that have strong/weak
+    pair_rel: dict[tuple[str, str], set[str]] = {}
+    for (rel, s, t) in edge_map.keys():
+        a, b = (s, t) if s < t else (t, s)
+        pair_rel.setdefault((a, b), set()).add(rel)
+    # Filter out EVEN edges when pair has STRONG or WEAK
+    edges: list[dict] = []
+    seen_even_pairs: set[tuple[str, str]] = set()
+    for record in edge_map:
+        rel, s, t = record.type, record.source, record.target
+        a, b = (s, t) if s < t else (t, s)
+        rels = pair_rel.get((a, b), set())
+        if rel == "EVEN_AGAINST" and (
+            implicit_even or "STRONG_AGAINST" in rels or "WEAK_AGAINST" in rels
+        ):
+            continue
+        if rel == "EVEN_AGAINST":
+            # Keep only canonical direction a -> b once
+            if (a, b) in seen_even_pairs:
+                continue
+            seen_even_pairs.add((a, b))
+            record.source, record.target = a, b
+            record.id = edge_id_for(rel, a, b)
+        edges.append(record.as_edge())
+    return edges
+
+
+def search_index(entries: Iterable[tuple[str, str]]) -> dict[str, Any]:
+    """
+    Prefix/n-gram index over ``(node id, text)`` pairs.
+
+    ``terms`` holds the distinct ``[casefolded text, node id]`` pairs in sorted order;
+    ``prefixes`` maps every word prefix of up to :data:`SEARCH_PREFIX_LEN` characters and
+    ``ngrams`` every :data:`SEARCH_NGRAM`-gram of the text to the positions of the terms
+    containing it. Longer queries pick one bucket and filter its terms.
+    """
+    terms = sorted({(text.casefold(), node_id) for node_id, text in entries if text})
+    prefixes: dict[str, list[int]] = {}
+    ngrams: dict[str, list[int]] = {}
+
+    def post(table: dict[str, list[int]], key: str, position: int) -> None:
+        bucket = table.setdefault(key, [])
+        if not bucket or bucket[-1] != position:
+            bucket.append(position)
+
+    for position, (text, _) in enumerate(terms):
+        for word in SEARCH_WORD.findall(text):
+            for length in range(1, min(len(word), SEARCH_PREFIX_LEN) + 1):
+                post(prefixes, word[:length], position)
+        for start in range(len(text) - SEARCH_NGRAM + 1):
+            post(ngrams, text[start : start + SEARCH_NGRAM], position)
+    return {
+        "terms": [list(term) for term in terms],
+        "prefixes": dict(sorted(prefixes.items())),
+        "ngrams": dict(sorted(ngrams.items())),
+    }
+
+
+def search_lookup(index: Mapping[str, Any], query: str, limit: int = 20) -> list[str]:
+    """
+    Node ids matching ``query`` in a :func:`search_index`: terms where every query word
+    starts a word of the term first, then (for 3+ characters) terms containing the query.
+    """
+    text = query.casefold().strip()
+    words = SEARCH_WORD.findall(text)
+    terms = index["terms"]
+
+    def candidates(table: Mapping[str, list[int]], keys: Iterable[str]) -> list[int]:
+        postings = [set(table.get(key, ())) for key in keys]
+        return sorted(set.intersection(*postings)) if postings else []
+
+    hits = [
+        terms[position][1]
+        for position in candidates(index["prefixes"], (word[:SEARCH_PREFIX_LEN] for word in words))
+        if all(
+            any(term_word.startswith(word) for term_word in SEARCH_WORD.findall(terms[position][0]))
+            for word in words
+        )
+    ]
+    if len(text) >= SEARCH_NGRAM:
+        grams = {text[start : start + SEARCH_NGRAM] for start in range(len(text) - SEARCH_NGRAM + 1)}
+        hits.extend(
+            terms[position][1]
+            for position in candidates(index["ngrams"], grams)
+            if text in terms[position][0]
+        )
+    return list(dict.fromkeys(hits))[:limit]
+
+
+@profiled()
+def build_indexes(nodes: list[dict], edges: list[dict]) -> dict[str, Any]:
+    """
+    Degree, neighbour, matchup, mechanic, membership and search indexes of the exported
+    graph, from one pass over the edges and one over the nodes.
+    """
+    degrees_in: dict[str, int] = {}
+    degrees_out: dict[str, int] = {}
+    adjacency: dict[str, set[str]] = {node["id"]: set() for node in nodes}
+    strong_map: dict[str, list[str]] = {}
+    weak_map: dict[str, list[str]] = {}
+    even_map: dict[str, list[str]] = {}
+    # Inverted maps keyed by the target node id.
+    inverted: dict[str, dict[str, list[str]]] = {rel: {} for rel in INVERTED_EDGES}
+    for edge in edges:
+        rel, source, target = edge["type"], edge["source"], edge["target"]
+        degrees_out[source] = degrees_out.get(source, 0) + 1
+        degrees_in[target] = degrees_in.get(target, 0) + 1
+        adjacency.setdefault(source, set()).add(target)
+        adjacency.setdefault(target, set()).add(source)
+        if rel == "STRONG_AGAINST":
+            strong_map.setdefault(source, []).append(target)
+        elif rel == "WEAK_AGAINST":
+            weak_map.setdefault(source, []).append(target)
+        elif rel == "EVEN_AGAINST":
+            even_map.setdefault(source, []).append(target)
+        elif rel in inverted:
+            inverted[rel].setdefault(target, []).append(source)
+    neighbors = {node: sorted(adjacent) for node, adjacent in adjacency.items()}
+
+    mechanic_usage: dict[str, int] = {}
+    mechanic_counter: dict[str, int] = {}
+    names: list[tuple[str, str]] = []
+    for node in nodes:
+        props = node["properties"]
+        names.append((node["id"], props.get("name")))
+        names.extend((node["id"], alias) for alias in props.get("aliases") or ())
+        if node["label"] == "Character":
+            for mech in props.get("mechanics_used", []):
+                mechanic_usage[mech] = mechanic_usage.get(mech, 0) + 1
+            for mech in props.get("mechanics_countered", []):
+                mechanic_counter[mech] = mechanic_counter.get(mech, 0) + 1
+
+    owners = {ability: sorted(set(chars)) for ability, chars in inverted["HAS_ABILITY"].items()}
+
+    def by_character(mapping: dict[str, list[str]]) -> dict[str, list[str]]:
+        return {
+            mechanic: sorted({owner for ability in abilities for owner in owners.get(ability, ())})
+            for mechanic, abilities in mapping.items()
+        }
+
+    used_by = {key: sorted(set(values)) for key, values in inverted["USES_MECHANIC"].items()}
+    countered_by = {key: sorted(set(values)) for key, values in inverted["COUNTERS_MECHANIC"].items()}
+    return {
+        "degrees_in": degrees_in,
+        "degrees_out": degrees_out,
+        "neighbors": neighbors,
+        "strong_against": strong_map,
+        "weak_against": weak_map,
+        "even_against": even_map,
+        "mechanic_usage": mechanic_usage,
+        "mechanic_counter": mechanic_counter,
+        "mechanic_used_by": used_by,
+        "mechanic_countered_by": countered_by,
+        "mechanic_used_by_characters": by_character(used_by),
+        "mechanic_countered_by_characters": by_character(countered_by),
+        "ability_owners": owners,
+        "archetype_members": {key: sorted(set(values)) for key, values in inverted["IS_ARCHETYPE"].items()},
+        "search": search_index(names),
+    }
+
+
+@profiled()
+def build_matchup_matrix(nodes: list[dict], edges: list[dict]) -> dict[str, Any]:
+    """Compact :class:`MatchupMatrix` of the exported characters (EVEN is every empty pair)."""
+    matrix = MatchupMatrix(node["properties"]["name"] for node in nodes if node["label"] == "Character")
+    prefix = len("character:")
+    for edge in edges:
+        if edge["type"] in ("STRONG_AGAINST", "WEAK_AGAINST"):
+            matrix.add(
+                edge["source"][prefix:],
+                edge["type"],
+                edge["target"][prefix:],
+                int(edge["properties"].get("evidence_count", 1)),
+            )
+    return matrix.as_dict()
+
+
+@profiled()
+def build_meta(nodes: list[dict], edges: list[dict], even_mode: str = "explicit") -> dict[str, Any]:
+    # Metadata summary
+    label_distribution: dict[str, int] = {}
+    archetype_counts: dict[str, int] = {}
+    mechanic_counts: dict[str, int] = {}
+    for node in nodes:
+        label_distribution[node["label"]] = label_distribution.get(node["label"], 0) + 1
+        if node["label"] == "Character":
+            archetype = node["properties"].get("archetype")
+            if archetype:
+                archetype_counts[archetype] = archetype_counts.get(archetype, 0) + 1
+        elif node["label"] == "Mechanic":
+            category = node["properties"]["category"]
+            mechanic_counts[category] = mechanic_counts.get(category, 0) + 1
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "node_count": len(nodes),
+        "edge_count": len(edges),
+        "label_distribution": label_distribution,
+        "archetype_counts": archetype_counts,
+        "mechanic_category_counts": mechanic_counts,
+        "even_mode": even_mode,
+    }
+
+
+def _dumps(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+@contextmanager
+def atomic_open(path: Path, mode: str = "w") -> Iterator[IO]:
+    """Write to a sibling temp file and rename it over ``path`` only once writing succeeded."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    encoding = None if "b" in mode else "utf-8"
+    try:
+        with tmp_path.open(mode, encoding=encoding) as handle:
+            yield handle
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+@profiled()
+def write_graph_json(
+    path: Path,
+    sections: Mapping[str, Any],
+    *,
+    pretty: bool = False,
+) -> None:
+    """
+    Stream a graph document to ``path`` one section item at a time.
+
+    List or iterator sections (``nodes``, ``edges``) are encoded element by element and
+    mappings via ``JSONEncoder.iterencode``, so the full document never exists as a single
+    string. A callable section is only built when the writer reaches it and is released
+    once written; one that builds ``None`` is left out. ``pretty`` output is
+    byte-identical to ``json.dumps(payload, indent=2)``; the default compact form drops all
+    insignificant whitespace.
+    """
+    if pretty:
+        encoder = json.JSONEncoder(indent=2)
+        item_sep, key_sep = ",\n", ": "
+    else:
+        encoder = json.JSONEncoder(separators=(",", ":"))
+        item_sep, key_sep = ",", ":"
+
+    def _indent(chunks: Iterable[str], prefix: str) -> Iterator[str]:
+        # iterencode emits newlines inside chunks; shift every line after the first.
+        for chunk in chunks:
+            yield chunk.replace("\n", "\n" + prefix) if pretty else chunk
+
+    with atomic_open(path) as handle:
+        handle.write("{\n  " if pretty else "{")
+        position = 0
+        for key, value in sections.items():
+            if callable(value):
+                value = value()
+                if value is None:
+                    continue
+            if position:
+                handle.write(",\n  " if pretty else ",")
+            position += 1
+            handle.write(json.dumps(key) + key_sep)
+            if value is None or isinstance(value, (Mapping, str, int, float, bool)):
+                handle.writelines(_indent(encoder.iterencode(value), "  "))
+                continue
+            first = True
+            for item in value:
+                handle.write(("[\n    " if pretty else "[") if first else item_sep + ("    " if pretty else ""))
+                handle.writelines(_indent(encoder.iterencode(item), "    "))
+                first = False
+            handle.write("[]" if first else ("\n  ]" if pretty else "]"))
+        handle.write("\n}" if pretty else "}")
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-") or "node"
+
+
+def shard_homes(graph_payload: dict) -> dict[str, str]:
+    """
+    Map every node id to the shard that owns it.
+
+    Characters and mechanics get a shard each, abilities live with the character that has
+    them, and the handful of archetypes share one shard.
+    """
+    owners: dict[str, str] = {}
+    for edge in graph_payload["edges"]:
+        if edge["type"] == "HAS_ABILITY":
+            owners.setdefault(edge["target"], edge["source"])
+    homes: dict[str, str] = {}
+    for node in graph_payload["nodes"]:
+        node_id, label = node["id"], node["label"]
+        if label in ("Character", "Mechanic"):
+            homes[node_id] = node_id
+        elif label == "Ability" and node_id in owners:
+            homes[node_id] = owners[node_id]
+        else:
+            homes[node_id] = ARCHETYPE_SHARD
+    return homes
+
+
+def build_shards(graph_payload: dict) -> tuple[dict[str, dict], dict[str, str]]:
+    """Split ``graph_payload`` into self-contained shard documents keyed by shard id."""
+    homes = shard_homes(graph_payload)
+    indexes = graph_payload["indexes"]
+    shards: dict[str, dict] = {}
+
+    def shard(key: str) -> dict:
+        if key not in shards:
+            shards[key] = {
+                "shard": key,
+                "nodes": [],
+                "edges": [],
+                "indexes": {name: {} for name in SLICED_INDEXES},
+            }
+        return shards[key]
+
+    for node in graph_payload["nodes"]:
+        doc = shard(homes[node["id"]])
+        doc["nodes"].append(node)
+        for name in SLICED_INDEXES:
+            if node["id"] in indexes.get(name, {}):
+                doc["indexes"][name][node["id"]] = indexes[name][node["id"]]
+    # Edges are copied into both endpoint shards so either one can render them alone.
+    for edge in graph_payload["edges"]:
+        for key in dict.fromkeys((homes.get(edge["source"]), homes.get(edge["target"]))):
+            if key is not None:
+                shard(key)["edges"].append(edge)
+    return shards, homes
+
+
+@profiled()
+def write_sharded_graph(graph_payload: dict, directory: Path) -> dict:
+    """
+    Write ``graph_payload`` as a manifest plus content-addressed shard files.
+
+    The manifest carries ``meta``, a node index with positions and each node's shard, and
+    the global mechanic counters; every shard file name embeds its SHA-256 prefix so it can
+    be cached indefinitely. Shards no longer referenced are removed. Returns the manifest.
+    """
+    shards, homes = build_shards(graph_payload)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    paths: dict[str, str] = {}
+    used: set[str] = set()
+    for key in shards:
+        kind, _, name = key.partition(":")
+        stem = f"{kind}/{_slug(name or kind)}"
+        candidate, suffix = stem, 2
+        while candidate in used:
+            candidate, suffix = f"{stem}-{suffix}", suffix + 1
+        used.add(candidate)
+        paths[key] = candidate
+
+    entries: dict[str, dict] = {}
+    written: set[Path] = set()
+    for key, doc in shards.items():
+        data = _dumps(doc)
+        digest = hashlib.sha256(data).hexdigest()
+        rel_path = f"{paths[key]}.{digest[:12]}.json"
+        target = directory / rel_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if not target.exists():
+            target.write_bytes(data)
+        written.add(target.resolve())
+        entries[key] = {
+            "path": rel_path,
+            "sha256": digest,
+            "bytes": len(data),
+            "node_count": len(doc["nodes"]),
+            "edge_count": len(doc["edges"]),
+        }
+
+    for stale in directory.glob("*/*.json"):
+        if stale.resolve() not in written:
+            stale.unlink()
+
+    indexes = graph_payload["indexes"]
+    manifest = {
+        "layout": "sharded",
+        "version": SHARD_LAYOUT_VERSION,
+        "meta": graph_payload["meta"],
+        "nodes": [
+            {
+                "id": node["id"],
+                "label": node["label"],
+                "name": node["properties"].get("name"),
+                "size": node["size"],
+                "x": node.get("x", 0.0),
+                "y": node.get("y", 0.0),
+                "shard": homes[node["id"]],
+                "degree_in": indexes["degrees_in"].get(node["id"], 0),
+                "degree_out": indexes["degrees_out"].get(node["id"], 0),
+            }
+            for node in graph_payload["nodes"]
+        ],
+        "shards": entries,
+        "indexes": {
+            "mechanic_usage": indexes["mechanic_usage"],
+            "mechanic_counter": indexes["mechanic_counter"],
+            "search": indexes.get("search", search_index([])),
+        },
+    }
+    with atomic_open(directory / MANIFEST_NAME, "wb") as handle:
+        handle.write(_dumps(manifest))
+    return manifest
+
+
+class _StringTable:
+    """Interned UTF-8 strings; index 0 is always the empty string."""
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {"": 0}
+
+    def add(self, value: str | None) -> int:
+        if not value:
+            return 0
+        return self._ids.setdefault(value, len(self._ids))
+
+    def columns(self) -> tuple[np.ndarray, np.ndarray]:
+        encoded = [value.encode("utf-8") for value in self._ids]
+        offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+        np.cumsum([len(chunk) for chunk in encoded], out=offsets[1:])
+        return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _csr(rows: Iterable[Iterable[int]], count: int) -> tuple[np.ndarray, np.ndarray]:
+    lists = list(rows)
+    offsets = np.zeros(count + 1, dtype="<u4")
+    np.cumsum([len(row) for row in lists], out=offsets[1:])
+    flat = np.fromiter((value for row in lists for value in row), dtype="<u4", count=int(offsets[-1]))
+    return offsets, flat
+
+
+def build_binary_sections(graph_payload: dict) -> tuple[dict, dict[str, np.ndarray]]:
+    """
+    Encode ``graph_payload`` as typed columns over integer node ids.
+
+    Strings (ids, names, reasons, property JSON) are interned once; edges become
+    ``source``/``target``/``type``/``evidence`` arrays, reasons a CSR into a
+    deduplicated reason table, and the per-node index maps CSR offset/value pairs.
+    Edge ids are only stored when they differ from :func:`edge_id_for`.
+    """
+    strings = _StringTable()
+    nodes = graph_payload["nodes"]
+    edges = graph_payload["edges"]
+    indexes = graph_payload["indexes"]
+    node_index = {node["id"]: i for i, node in enumerate(nodes)}
+    labels = sorted({node["label"] for node in nodes})
+    edge_types = sorted({edge["type"] for edge in edges})
+    label_code = {label: i for i, label in enumerate(labels)}
+    type_code = {rel: i for i, rel in enumerate(edge_types)}
+
+    sections: dict[str, np.ndarray] = {
+        "node_id": np.array([strings.add(n["id"]) for n in nodes], dtype="<u4"),
+        "node_label": np.array([label_code[n["label"]] for n in nodes], dtype=np.uint8),
+        "node_name": np.array([strings.add(n["properties"].get("name")) for n in nodes], dtype="<u4"),
+        "node_size": np.array([n["size"] for n in nodes], dtype="<f4"),
+        "node_x": np.array([n.get("x", 0.0) for n in nodes], dtype="<f4"),
+        "node_y": np.array([n.get("y", 0.0) for n in nodes], dtype="<f4"),
+        "node_properties": np.array(
+            [strings.add(json.dumps(n["properties"], separators=(",", ":"), ensure_ascii=False)) for n in nodes],
+            dtype="<u4",
+        ),
+        "edge_source": np.array([node_index[e["source"]] for e in edges], dtype="<u4"),
+        "edge_target": np.array([node_index[e["target"]] for e in edges], dtype="<u4"),
+        "edge_type": np.array([type_code[e["type"]] for e in edges], dtype=np.uint8),
+        "edge_evidence": np.array(
+            [int(e["properties"].get("evidence_count", 0)) for e in edges], dtype="<u4"
+        ),
+    }
+
+    reason_ids: dict[str, int] = {}
+    reason_rows = [
+        [reason_ids.setdefault(reason, len(reason_ids)) for reason in e["properties"].get("reasons", [])]
+        for e in edges
+    ]
+    sections["edge_reasons_offsets"], sections["edge_reasons"] = _csr(reason_rows, len(edges))
+    sections["reason_table"] = np.array([strings.add(reason) for reason in reason_ids], dtype="<u4")
+
+    def _extras(props: dict) -> str:
+        rest = {k: v for k, v in props.items() if k not in EDGE_COLUMNS}
+        return json.dumps(rest, separators=(",", ":"), ensure_ascii=False) if rest else ""
+
+    sections["edge_properties"] = np.array([strings.add(_extras(e["properties"])) for e in edges], dtype="<u4")
+    # Evidence entries: one CSR over edges, three parallel columns of interned names.
+    entries = [e["properties"].get("evidence", []) for e in edges]
+    sections["edge_entries_offsets"] = _csr(([0] * len(row) for row in entries), len(edges))[0]
+    for field in ("counter", "countered", "mechanic"):
+        sections[f"edge_entry_{field}"] = np.array(
+            [strings.add(entry[field]) for row in entries for entry in row], dtype="<u4"
+        )
+    # Only ids that differ from edge_id_for() are stored; 0 means "derive it".
+    sections["edge_id"] = np.array(
+        [
+            0 if e["id"] == edge_id_for(e["type"], e["source"], e["target"]) else strings.add(e["id"])
+            for e in edges
+        ],
+        dtype="<u4",
+    )
+
+    sections["degrees_in"] = np.array(
+        [indexes["degrees_in"].get(n["id"], 0) for n in nodes], dtype="<u4"
+    )
+    sections["degrees_out"] = np.array(
+        [indexes["degrees_out"].get(n["id"], 0) for n in nodes], dtype="<u4"
+    )
+    for name in CSR_INDEXES:
+        mapping = indexes.get(name, {})
+        rows = ([node_index[t] for t in mapping.get(n["id"], []) if t in node_index] for n in nodes)
+        sections[f"{name}_offsets"], sections[name] = _csr(rows, len(nodes))
+
+    extra_header = _payload_sections(graph_payload, node_index, strings, sections)
+    sections["string_offsets"], sections["string_data"] = strings.columns()
+    header = {
+        "version": BINARY_VERSION,
+        "meta": graph_payload["meta"],
+        "node_count": len(nodes),
+        "edge_count": len(edges),
+        "labels": labels,
+        "edge_types": edge_types,
+        "indexes": {
+            "mechanic_usage": indexes.get("mechanic_usage", {}),
+            "mechanic_counter": indexes.get("mechanic_counter", {}),
+            "search": indexes.get("search", search_index([])),
+        },
+        **extra_header,
+    }
+    return header, sections
+
+
+def _payload_sections(
+    graph_payload: dict, node_index: dict[str, int], strings: _StringTable, sections: dict[str, np.ndarray]
+) -> dict[str, Any]:
+    """Columns for the optional ``matchup_matrix``/``analytics``/``paths`` blocks; returns their header entries."""
+    header: dict[str, Any] = {}
+    matrix = graph_payload.get("matchup_matrix")
+    if matrix is not None:
+        cells = np.asarray(matrix["strong"], dtype="<u4").reshape(-1, 3)
+        sections["matrix_characters"] = np.array([strings.add(n) for n in matrix["characters"]], dtype="<u4")
+        sections["matrix_row"], sections["matrix_column"], sections["matrix_count"] = (
+            np.ascontiguousarray(cells[:, i]) for i in range(3)
+        )
+        header["matchup_matrix"] = {}
+    analytics = graph_payload.get("analytics")
+    if analytics is not None:
+        characters = analytics["characters"]
+        position = {name: i for i, name in enumerate(characters)}
+        sections["analytics_characters"] = np.array([strings.add(n) for n in characters], dtype="<u4")
+        sections["analytics_archetypes"] = np.array(
+            [strings.add(n) for n in analytics["archetypes"]], dtype="<u4"
+        )
+        for name, dtype in ANALYTICS_COLUMNS.items():
+            sections[f"analytics_{name}"] = np.asarray(analytics[name], dtype=dtype).reshape(-1)
+        metrics = list(analytics["rankings"])
+        for metric in metrics:
+            sections[f"analytics_rank_{metric}"] = np.array(
+                [position[n] for n in analytics["rankings"][metric]], dtype="<u4"
+            )
+        header["analytics"] = {"metrics": metrics}
+    paths = graph_payload.get("paths")
+    if paths is not None:
+        hops = paths["hops"]
+        sections["paths_nodes"] = np.array([node_index[n] for n in paths["nodes"]], dtype="<u4")
+        sections["paths_targets"] = np.asarray(paths["targets"], dtype="<u4")
+        sections["paths_next_hop"] = np.asarray(paths["next_hop"], dtype="<i4").reshape(-1)
+        # One CSR row per (node, distance).
+        rings = (ring for rings in paths["neighborhoods"] for ring in rings)
+        sections["paths_neighborhoods_offsets"], sections["paths_neighborhoods"] = _csr(
+            rings, len(paths["neighborhoods"]) * hops
+        )
+        sections["paths_truncated"] = np.asarray(paths["truncated"], dtype="<u4")
+        header["paths"] = {key: paths[key] for key in ("edge_types", "hops", "hop_limit")}
+    return header
+
+
+def _pad(length: int) -> int:
+    return -length % BINARY_ALIGN
+
+
+@profiled()
+def write_binary_graph(graph_payload: dict, path: Path) -> int:
+    """
+    Write the columnar binary form of ``graph_payload``; returns the file size.
+
+    Layout: ``DLGB`` magic, little-endian uint32 version and header length, a UTF-8 JSON
+    header, then each section's raw little-endian array aligned to 8 bytes. The header's
+    ``sections`` map gives every array's dtype, byte offset and length, so readers can
+    wrap the buffer in typed arrays (``Uint32Array(buf, offset, length)``) without parsing.
+    """
+    header, sections = build_binary_sections(graph_payload)
+    layout: dict[str, dict[str, Any]] = {}
+    # Offsets depend on the header length, which depends on the offsets; iterate to a fixpoint.
+    header_bytes = b""
+    for _ in range(4):
+        offset = len(BINARY_MAGIC) + 8 + len(header_bytes)
+        offset += _pad(offset)
+        for name, array in sections.items():
+            layout[name] = {"dtype": array.dtype.str, "offset": offset, "length": int(array.size)}
+            offset += array.nbytes + _pad(array.nbytes)
+        encoded = json.dumps({**header, "sections": layout}, separators=(",", ":"), ensure_ascii=False).encode(
+            "utf-8"
+        )
+        # The offsets in ``encoded`` assumed the previous header length; they hold if it matches.
+        converged = len(encoded) == len(header_bytes)
+        header_bytes = encoded
+        if converged:
+            break
+    with atomic_open(path, "wb") as handle:
+        handle.write(BINARY_MAGIC)
+        handle.write(struct.pack("<II", BINARY_VERSION, len(header_bytes)))
+        handle.write(header_bytes)
+        for name, array in sections.items():
+            handle.write(b"\0" * (layout[name]["offset"] - handle.tell()))
+            handle.write(array.tobytes())
+        handle.write(b"\0" * _pad(handle.tell()))
+        size = handle.tell()
+    return size
+
+
+class BinaryGraph:
+    """Zero-copy view over a file written by :func:`write_binary_graph`."""
+
+    def __init__(self, buffer: bytes) -> None:
+        if buffer[:4] != BINARY_MAGIC:
+            raise ValueError("Not a DLGB binary graph")
+        version, header_length = struct.unpack_from("<II", buffer, 4)
+        if version not in BINARY_READABLE:
+            raise ValueError(f"Unsupported binary graph version {version}")
+        self.header = json.loads(buffer[12 : 12 + header_length].decode("utf-8"))
+        self.arrays = {
+            name: np.frombuffer(buffer, dtype=spec["dtype"], count=spec["length"], offset=spec["offset"])
+            for name, spec in self.header["sections"].items()
+        }
+        self._data = self.arrays["string_data"]
+        self._offsets = self.arrays["string_offsets"]
+
+    @classmethod
+    def read(cls, path: Path) -> "BinaryGraph":
+        return cls(path.read_bytes())
+
+    def string(self, index: int) -> str:
+        start, stop = int(self._offsets[index]), int(self._offsets[index + 1])
+        return self._data[start:stop].tobytes().decode("utf-8")
+
+    def csr(self, name: str, row: int) -> np.ndarray:
+        offsets = self.arrays[f"{name}_offsets"]
+        return self.arrays[name][offsets[row] : offsets[row + 1]]
+
+    def to_payload(self) -> dict:
+        """Rebuild the JSON-shaped payload (mainly for round-trip checks)."""
+        a = self.arrays
+        labels, edge_types = self.header["labels"], self.header["edge_types"]
+        node_ids = [self.string(i) for i in a["node_id"]]
+        nodes = [
+            {
+                "id": node_ids[i],
+                "label": labels[a["node_label"][i]],
+                "properties": json.loads(self.string(a["node_properties"][i])),
+                "size": float(a["node_size"][i]),
+                "x": float(a["node_x"][i]),
+                "y": float(a["node_y"][i]),
+            }
+            for i in range(self.header["node_count"])
+        ]
+        reasons = [self.string(i) for i in a["reason_table"]]
+        entry_offsets = a.get("edge_entries_offsets")
+        entry_columns = {field: a.get(f"edge_entry_{field}") for field in ("counter", "countered", "mechanic")}
+        edges = []
+        for i in range(self.header["edge_count"]):
+            extras = self.string(a["edge_properties"][i])
+            props = json.loads(extras) if extras else {}
+            props["evidence_count"] = int(a["edge_evidence"][i])
+            reason_ids = self.csr("edge_reasons", i)
+            if len(reason_ids):
+                props["reasons"] = [reasons[r] for r in reason_ids]
+            if entry_offsets is not None and entry_offsets[i + 1] > entry_offsets[i]:
+                span = range(int(entry_offsets[i]), int(entry_offsets[i + 1]))
+                props["evidence"] = [
+                    {field: self.string(entry_columns[field][j]) for field in entry_columns}
+                    for j in span
+                ]
+            source = node_ids[a["edge_source"][i]]
+            target = node_ids[a["edge_target"][i]]
+            rel_type = edge_types[a["edge_type"][i]]
+            edges.append(
+                {
+                    "id": self.string(a["edge_id"][i]) or edge_id_for(rel_type, source, target),
+                    "source": source,
+                    "target": target,
+                    "type": rel_type,
+                    "properties": props,
+                }
+            )
+        indexes: dict[str, Any] = {
+            "degrees_in": {node_ids[i]: int(v) for i, v in enumerate(a["degrees_in"]) if v},
+            "degrees_out": {node_ids[i]: int(v) for i, v in enumerate(a["degrees_out"]) if v},
+        }
+        for name in CSR_INDEXES:
+            if name not in a:
+                continue  # written before the index existed
+            indexes[name] = {
+                node_ids[i]: [node_ids[j] for j in self.csr(name, i)]
+                for i in range(len(node_ids))
+                if len(self.csr(name, i))
+            }
+        indexes.update(self.header["indexes"])
+        payload = {"meta": self.header["meta"], "nodes": nodes, "edges": edges, "indexes": indexes}
+        payload.update(self._payload_blocks(node_ids))
+        return payload
+
+    def _names(self, section: str) -> list[str]:
+        return [self.string(i) for i in self.arrays[section]]
+
+    def _payload_blocks(self, node_ids: list[str]) -> dict[str, Any]:
+        a, header, blocks = self.arrays, self.header, {}
+        if "matchup_matrix" in header:
+            cells = np.stack([a["matrix_row"], a["matrix_column"], a["matrix_count"]], axis=1)
+            blocks["matchup_matrix"] = {
+                "characters": self._names("matrix_characters"),
+                "strong": cells.astype(int).tolist(),
+            }
+        if "analytics" in header:
+            characters = self._names("analytics_characters")
+            archetypes = self._names("analytics_archetypes")
+            analytics: dict[str, Any] = {"characters": characters, "archetypes": archetypes}
+            for name in ANALYTICS_COLUMNS:
+                values = a[f"analytics_{name}"]
+                if name.startswith("archetype_"):
+                    values = values.reshape(len(archetypes), len(archetypes))
+                analytics[name] = values.tolist()
+            analytics["rankings"] = {
+                metric: [characters[i] for i in a[f"analytics_rank_{metric}"]]
+                for metric in header["analytics"]["metrics"]
+            }
+            blocks["analytics"] = analytics
+        if "paths" in header:
+            paths = dict(header["paths"])
+            nodes, hops = a["paths_nodes"], paths["hops"]
+            offsets, flat = a["paths_neighborhoods_offsets"], a["paths_neighborhoods"]
+            rings = [flat[offsets[r] : offsets[r + 1]].tolist() for r in range(len(offsets) - 1)]
+            paths.update(
+                nodes=[node_ids[i] for i in nodes],
+                targets=a["paths_targets"].tolist(),
+                next_hop=a["paths_next_hop"].reshape(-1, len(nodes)).tolist() if len(nodes) else [],
+                neighborhoods=[rings[i * hops : (i + 1) * hops] for i in range(len(nodes))],
+                truncated=a["paths_truncated"].tolist(),
+            )
+            blocks["paths"] = paths
+        return blocks
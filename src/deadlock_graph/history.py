@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import json
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from .profiling import profiled
+from .synthesis import Evidence, Matchup, iter_matchups_csv, sort_matchups
+
+
+DEFAULT_STORE = Path("matchups_history/history.jsonl")
+# Archived CSVs are named YYYY-MM-DDTHHMMSS_label.csv by scripts/archive_matchups.py.
+ARCHIVE_NAME = re.compile(r"^(?P<stamp>\d{4}-\d{2}-\d{2}T\d{6})_(?P<label>.+)$")
+
+Key = tuple[str, str, str]
+# (evidence count, entries in (counter, countered, mechanic) name order, note)
+Value = tuple[int, tuple[Evidence, ...], str]
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    id: int
+    label: str
+    taken_at: str
+    source: str
+    rows: int
+    even_rows: int
+    changes: int
+
+
+@dataclass(frozen=True)
+class MatchupChange:
+    """One key that differs between two snapshots; ``None`` marks an absent row."""
+
+    key: Key
+    old: Optional[Value]
+    new: Optional[Value]
+
+    @property
+    def kind(self) -> str:
+        if self.old is None:
+            return "added"
+        if self.new is None:
+            return "removed"
+        return "changed"
+
+    @property
+    def matchup(self) -> Matchup:
+        """The row after the change, or before it for removals."""
+        return Matchup(*self.key, *(self.new or self.old))
+
+
+@dataclass(frozen=True)
+class Flip:
+    snapshot: Snapshot
+    before: tuple[str, ...]
+    after: tuple[str, ...]
+
+
+def _value(matchup: Matchup) -> Value:
+    # Same name order as synthesis._strong_weak, so rows differing only in order compare equal.
+    entries = sorted(matchup.entries, key=lambda e: (e.counter, e.countered, e.mechanic))
+    return matchup.evidence, tuple(entries), matchup.note
+
+
+def _rows(matchups: Iterable[Matchup]) -> dict[Key, Value]:
+    return {(m.source, m.relationship, m.target): _value(m) for m in matchups}
+
+
+def _decode(row: list) -> tuple[Key, Value]:
+    """A stored ``set`` row; 5-element rows from before structured evidence hold a reason string."""
+    if len(row) == 5:
+        matchup = Matchup.from_reason(*row)
+        return (matchup.source, matchup.relationship, matchup.target), _value(matchup)
+    source, relationship, target, evidence, entries, note = row
+    return (source, relationship, target), (evidence, tuple(Evidence(*entry) for entry in entries), note)
+
+
+def _encode(key: Key, value: Value) -> list:
+    evidence, entries, note = value
+    return [*key, evidence, [[e.counter, e.countered, e.mechanic] for e in entries], note]
+
+
+def _relations(keys: Iterable[Key]) -> tuple[str, ...]:
+    relations = sorted({key[1] for key in keys if key[1] != "EVEN_AGAINST"})
+    return tuple(relations) or ("EVEN_AGAINST",)
+
+
+class MatchupHistory:
+    """
+    Append-only matchup history: snapshot 0 is a full base, every later one a delta.
+
+    Each JSON line holds one snapshot's metadata plus the rows it ``set`` (added or
+    changed, as ``[source, relationship, target, evidence, [[counter, countered, mechanic],
+    ...], note]`` with entries in name order) and the keys it deleted, so the file grows with the amount of change rather than the number of
+    snapshots. Loading replays the lines into a per-key timeline (snapshot ids and values)
+    and a per-pair change list, which answer as-of, diff and flip queries by bisection.
+    """
+
+    def __init__(self, path: Path = DEFAULT_STORE) -> None:
+        self.path = path
+        self.snapshots: List[Snapshot] = []
+        self._timeline: dict[Key, tuple[list[int], list[Optional[Value]]]] = {}
+        self._touched: List[List[Key]] = []
+        self._pairs: dict[tuple[str, str], list[int]] = {}
+        self._current: dict[Key, Value] = {}
+        if path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.snapshots)
+
+    @profiled()
+    def _load(self) -> None:
+        with self.path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    self._apply(json.loads(line))
+
+    def _apply(self, record: dict) -> Snapshot:
+        snapshot_id = len(self.snapshots)
+        touched: List[Key] = []
+        for row in record.get("set", []):
+            key, value = _decode(row)
+            if self._current.get(key) == value:
+                # Legacy rows whose only change was evidence order.
+                continue
+            self._current[key] = value
+            self._record(snapshot_id, key, value)
+            touched.append(key)
+        for source, relationship, target in record.get("delete", []):
+            key = (source, relationship, target)
+            self._current.pop(key, None)
+            self._record(snapshot_id, key, None)
+            touched.append(key)
+        snapshot = Snapshot(
+            id=snapshot_id,
+            label=record["label"],
+            taken_at=record["taken_at"],
+            source=record.get("source", ""),
+            rows=len(self._current),
+            even_rows=sum(1 for key in self._current if key[1] == "EVEN_AGAINST"),
+            changes=len(touched),
+        )
+        self.snapshots.append(snapshot)
+        self._touched.append(touched)
+        return snapshot
+
+    def _record(self, snapshot_id: int, key: Key, value: Optional[Value]) -> None:
+        ids, values = self._timeline.setdefault(key, ([], []))
+        ids.append(snapshot_id)
+        values.append(value)
+        pair = self._pairs.setdefault((key[0], key[2]), [])
+        if not pair or pair[-1] != snapshot_id:
+            pair.append(snapshot_id)
+
+    @profiled()
+    def append(
+        self,
+        matchups: Iterable[Matchup],
+        label: str,
+        *,
+        taken_at: Optional[str] = None,
+        source: str = "",
+    ) -> Snapshot:
+        """Record ``matchups`` as the newest snapshot, storing only the delta to the previous one."""
+        if taken_at is None:
+            taken_at = datetime.now().isoformat(timespec="seconds")
+        if self.snapshots and taken_at < self.snapshots[-1].taken_at:
+            raise ValueError(
+                f"Snapshot {label!r} ({taken_at}) predates the latest one ({self.snapshots[-1].taken_at})."
+            )
+        rows = _rows(matchups)
+        record = {
+            "label": label,
+            "taken_at": taken_at,
+            "source": source,
+            "set": [_encode(key, value) for key, value in sorted(rows.items()) if self._current.get(key) != value],
+            "delete": [list(key) for key in sorted(self._current.keys() - rows.keys())],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        return self._apply(record)
+
+    def import_csvs(self, paths: Iterable[Path]) -> List[Snapshot]:
+        """
+        Append archived CSVs oldest first, skipping files already recorded as a source.
+
+        ``YYYY-MM-DDTHHMMSS_label.csv`` names supply the timestamp and label; other files
+        use their modification time and stem.
+        """
+        imported = {snapshot.source for snapshot in self.snapshots}
+        entries = []
+        for path in paths:
+            if path.name in imported:
+                continue
+            match = ARCHIVE_NAME.match(path.stem)
+            if match:
+                taken_at = datetime.strptime(match["stamp"], "%Y-%m-%dT%H%M%S").isoformat()
+                label = match["label"]
+            else:
+                taken_at = datetime.fromtimestamp(path.stat().st_mtime).isoformat(timespec="seconds")
+                label = path.stem
+            entries.append((taken_at, label, path))
+        return [
+            self.append(iter_matchups_csv(path), label, taken_at=taken_at, source=path.name)
+            for taken_at, label, path in sorted(entries)
+        ]
+
+    def resolve(self, ref: str) -> Snapshot:
+        """
+        Find a snapshot by id, label (latest wins) or time.
+
+        A time (``2025-10-26`` or ``2025-10-26T08:26``) selects the last snapshot taken at
+        or before it, comparing at the given precision.
+        """
+        if not self.snapshots:
+            raise ValueError(f"No snapshots recorded in {self.path}.")
+        if ref == "latest":
+            return self.snapshots[-1]
+        if ref.lstrip("-").isdigit():
+            try:
+                return self.snapshots[int(ref)]
+            except IndexError:
+                raise ValueError(f"No snapshot {ref}; {len(self.snapshots)} recorded.") from None
+        for snapshot in reversed(self.snapshots):
+            if snapshot.label == ref:
+                return snapshot
+        stamps = [snapshot.taken_at[: len(ref)] for snapshot in self.snapshots]
+        position = bisect_right(stamps, ref)
+        if position and ref[:1].isdigit():
+            return self.snapshots[position - 1]
+        raise ValueError(f"No snapshot matches {ref!r}.")
+
+    def value_at(self, key: Key, snapshot_id: int) -> Optional[Value]:
+        timeline = self._timeline.get(key)
+        if timeline is None:
+            return None
+        ids, values = timeline
+        position = bisect_right(ids, snapshot_id)
+        return values[position - 1] if position else None
+
+    def as_of(self, snapshot: Snapshot) -> List[Matchup]:
+        """Every row live at ``snapshot``."""
+        matchups = []
+        for key in self._timeline:
+            value = self.value_at(key, snapshot.id)
+            if value is not None:
+                matchups.append(Matchup(*key, *value))
+        return sort_matchups(matchups)
+
+    def diff(self, old: Snapshot, new: Snapshot) -> List[MatchupChange]:
+        """
+        Rows that differ between two snapshots, visiting only keys touched in between.
+
+        EVEN rows are skipped when either side was recorded with implicit EVEN.
+        """
+        low, high = sorted((old.id, new.id))
+        keys = {key for touched in self._touched[low + 1 : high + 1] for key in touched}
+        skip_even = not (old.even_rows and new.even_rows)
+        changes = []
+        for key in sorted(keys):
+            if skip_even and key[1] == "EVEN_AGAINST":
+                continue
+            before, after = self.value_at(key, old.id), self.value_at(key, new.id)
+            if before != after:
+                changes.append(MatchupChange(key, before, after))
+        return changes
+
+    def relations_at(self, a: str, b: str, snapshot_id: int) -> tuple[str, ...]:
+        """Relationship types from ``a`` to ``b`` at a snapshot; a pair without STRONG/WEAK is EVEN."""
+        keys = [
+            (a, relationship, b)
+            for relationship in ("STRONG_AGAINST", "WEAK_AGAINST")
+            if self.value_at((a, relationship, b), snapshot_id) is not None
+        ]
+        return _relations(keys)
+
+    def last_flip(self, a: str, b: str) -> Optional[Flip]:
+        """Latest snapshot where the relationship from ``a`` to ``b`` changed type."""
+        for snapshot_id in reversed(self._pairs.get((a, b), [])):
+            if snapshot_id == 0:
+                break
+            before = self.relations_at(a, b, snapshot_id - 1)
+            after = self.relations_at(a, b, snapshot_id)
+            if before != after:
+                return Flip(self.snapshots[snapshot_id], before, after)
+        return None
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from .profiling import profiled
+
+
+Position = tuple[float, float]
+
+
+@dataclass
+class SeedLayout:
+    """Positions and undirected adjacency of a previous export."""
+
+    positions: dict[str, Position] = field(default_factory=dict)
+    edges: set[frozenset[str]] = field(default_factory=set)
+
+
+@dataclass
+class LayoutResult:
+    positions: dict[str, Position]
+    iterations: int
+    converged: bool
+    seconds: float
+    seeded: int
+    mobile: int
+    approximate: bool
+
+
+@profiled()
+def load_seed_layout(path: Path) -> SeedLayout:
+    """Read node x/y coordinates and edges from a previously exported graph JSON."""
+    seed = SeedLayout()
+    if not path.exists():
+        return seed
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return seed
+    if not isinstance(payload, dict):
+        return seed
+    for node in payload.get("nodes", []):
+        if "x" in node and "y" in node:
+            seed.positions[node["id"]] = (float(node["x"]), float(node["y"]))
+    for edge in payload.get("edges", []):
+        seed.edges.add(frozenset((edge["source"], edge["target"])))
+    return seed
+
+
+def _rescale(pos: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    # Same normalisation as networkx.rescale_layout: centre, then fit into [-scale, scale].
+    pos = pos - pos.mean(axis=0)
+    lim = np.abs(pos).max()
+    if lim > 0:
+        pos = pos * (scale / lim)
+    return pos
+
+
+def _accumulate(index: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    # bincount is an order of magnitude faster than np.add.at for scatter-adds.
+    return np.stack(
+        [np.bincount(index, weights=values[:, axis], minlength=size) for axis in (0, 1)],
+        axis=1,
+    )
+
+
+def _exact_repulsion(pos: np.ndarray, rows: np.ndarray, k: float) -> np.ndarray:
+    delta = pos[rows, None, :] - pos[None, :, :]
+    distance = np.maximum(np.linalg.norm(delta, axis=-1), 0.01)
+    return np.einsum("ijk,ij->ik", delta, (k * k) / distance**2)
+
+
+def _grid_repulsion(pos: np.ndarray, rows: np.ndarray, k: float) -> np.ndarray:
+    """
+    Barnes-Hut-style repulsion on a uniform grid.
+
+    Nodes in the same or an adjacent cell repel exactly; every farther cell acts as a
+    single pseudo-node of its total mass at its centroid. With ~sqrt(n)/3 nodes per cell
+    both halves cost O(n^1.5) instead of the exact O(n^2).
+    """
+    n = len(pos)
+    per_cell = max(8.0, np.sqrt(n) / 3)
+    side = max(2, int(np.ceil(np.sqrt(n / per_cell))))
+    # Quantile cell boundaries keep occupancy balanced even when a few nodes drift far out.
+    quantiles = np.linspace(0.0, 1.0, side + 1)[1:-1]
+    cell_xy = np.stack(
+        [np.searchsorted(np.quantile(pos[:, axis], quantiles), pos[:, axis]) for axis in (0, 1)],
+        axis=1,
+    )
+    cell = cell_xy[:, 0] * side + cell_xy[:, 1]
+
+    mass = np.bincount(cell, minlength=side * side).astype(float)
+    centroid = _accumulate(cell, pos, side * side)
+    cells = np.flatnonzero(mass)
+    centroid = centroid[cells] / mass[cells, None]
+    cells_xy = np.stack([cells // side, cells % side], axis=1)
+
+    # Far field: every occupied cell outside the row's 3x3 neighbourhood.
+    row_xy = cell_xy[rows]
+    far = (np.abs(row_xy[:, None, 0] - cells_xy[None, :, 0]) > 1) | (
+        np.abs(row_xy[:, None, 1] - cells_xy[None, :, 1]) > 1
+    )
+    dx = pos[rows, 0, None] - centroid[None, :, 0]
+    dy = pos[rows, 1, None] - centroid[None, :, 1]
+    weight = (mass[cells] * (k * k))[None, :] / np.maximum(dx * dx + dy * dy, 1e-4)
+    weight *= far
+    force = np.stack([(dx * weight).sum(axis=1), (dy * weight).sum(axis=1)], axis=1)
+
+    # Near field: exact pairs between each row and the nodes of its 3x3 neighbourhood.
+    order = np.argsort(cell, kind="stable")
+    sorted_cell = cell[order]
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            nx_ = row_xy[:, 0] + dx
+            ny_ = row_xy[:, 1] + dy
+            valid = (nx_ >= 0) & (nx_ < side) & (ny_ >= 0) & (ny_ < side)
+            local = np.flatnonzero(valid)
+            neighbour = nx_[valid] * side + ny_[valid]
+            start = np.searchsorted(sorted_cell, neighbour, side="left")
+            stop = np.searchsorted(sorted_cell, neighbour, side="right")
+            lengths = stop - start
+            total = int(lengths.sum())
+            if not total:
+                continue
+            left = np.repeat(local, lengths)
+            offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            right = order[np.repeat(start, lengths) + offsets]
+            keep = rows[left] != right
+            left, right = left[keep], right[keep]
+            pair_delta = pos[rows[left]] - pos[right]
+            pair_distance = np.maximum(np.linalg.norm(pair_delta, axis=-1), 0.01)
+            force += _accumulate(
+                left, pair_delta * ((k * k) / pair_distance**2)[:, None], len(rows)
+            )
+    return force
+
+
+@profiled()
+def force_layout(
+    node_ids: Sequence[str],
+    edges: Iterable[tuple[str, str]],
+    *,
+    seed_layout: Optional[SeedLayout] = None,
+    seed: int = 42,
+    max_iterations: int = 100,
+    tolerance: float = 1e-4,
+    time_budget: Optional[float] = None,
+    approximate_above: int = 2000,
+    warm_temperature: float = 0.1,
+) -> LayoutResult:
+    """
+    Fruchterman-Reingold layout with warm starts and early stopping.
+
+    Cold runs follow ``networkx.spring_layout`` (random start, linear cooling, output
+    rescaled to [-1, 1]). With ``seed_layout`` every known node starts where it was and
+    only nodes whose adjacency changed, plus their neighbours, are allowed to move; the
+    rest stay pinned (and still push and pull), so an unchanged graph costs no iterations.
+    New nodes start at the centroid of their placed neighbours with the full step budget,
+    moved neighbours get ``warm_temperature`` of it. Iteration stops when the mean step of
+    the moving nodes falls below ``tolerance`` times the layout extent, when ``time_budget``
+    seconds elapse, or after ``max_iterations``. Graphs with more than
+    ``approximate_above`` nodes use grid-based Barnes-Hut repulsion.
+    """
+    started = perf_counter()
+    ids = list(node_ids)
+    n = len(ids)
+    approximate = n > approximate_above
+    if n == 0:
+        return LayoutResult({}, 0, True, 0.0, 0, 0, approximate)
+    index = {node_id: i for i, node_id in enumerate(ids)}
+    pairs = {
+        frozenset((a, b)) for a, b in edges if a in index and b in index and a != b
+    }
+    edge_array = np.array(
+        sorted(sorted(index[node] for node in pair) for pair in pairs), dtype=np.int64
+    ).reshape(-1, 2)
+    src, dst = edge_array[:, 0], edge_array[:, 1]
+
+    rng = np.random.RandomState(seed)
+    pos = rng.rand(n, 2)
+    seeded = np.zeros(n, dtype=bool)
+    seed_layout = seed_layout or SeedLayout()
+    for node_id, coords in seed_layout.positions.items():
+        i = index.get(node_id)
+        if i is not None:
+            pos[i] = coords
+            seeded[i] = True
+    n_seeded = int(seeded.sum())
+
+    if n_seeded:
+        extent = max(float(np.ptp(pos[seeded], axis=0).max()), 1e-9)
+        dirty = ~seeded
+        for pair in pairs ^ seed_layout.edges:
+            for node in pair:
+                if node in index:
+                    dirty[index[node]] = True
+        mobile = dirty.copy()
+        mobile[src[dirty[dst]]] = True
+        mobile[dst[dirty[src]]] = True
+
+        unseeded = np.flatnonzero(~seeded)
+        if len(unseeded):
+            # Place new nodes at the centroid of their already-placed neighbours.
+            total = np.zeros((n, 2))
+            count = np.zeros(n)
+            for a, b in ((src, dst), (dst, src)):
+                mask = seeded[b] & ~seeded[a]
+                np.add.at(total, a[mask], pos[b[mask]])
+                np.add.at(count, a[mask], 1)
+            jitter = (rng.rand(len(unseeded), 2) - 0.5) * 0.05 * extent
+            anchor = np.where(
+                (count[unseeded] > 0)[:, None],
+                total[unseeded] / np.maximum(count[unseeded], 1)[:, None],
+                pos[seeded].mean(axis=0),
+            )
+            pos[unseeded] = anchor + jitter
+        # Keep the seeded scale: pick the k for which it is in equilibrium, i.e. the
+        # virial sum(pos . F) = pairs * k^2 - sum(d^3) / k vanishes.
+        if len(src):
+            edge_length = np.linalg.norm(pos[src] - pos[dst], axis=1)
+            k = max(float(np.cbrt(np.sum(edge_length**3) / (n * (n - 1) / 2))), 1e-6)
+        else:
+            k = extent * np.sqrt(1.0 / n)
+    else:
+        extent = 1.0
+        k = np.sqrt(1.0 / n)
+        mobile = np.ones(n, dtype=bool)
+
+    rows = np.flatnonzero(mobile)
+    temperature = np.where(seeded[rows], 0.1 * extent * warm_temperature, 0.1 * extent)
+    cooling = temperature / (max_iterations + 1)
+    row_of = np.full(n, -1, dtype=np.int64)
+    row_of[rows] = np.arange(len(rows))
+
+    iterations = 0
+    converged = not len(rows)
+    while not converged and iterations < max_iterations:
+        iterations += 1
+        if approximate:
+            displacement = _grid_repulsion(pos, rows, k)
+        else:
+            displacement = _exact_repulsion(pos, rows, k)
+        if len(src):
+            delta = pos[src] - pos[dst]
+            distance = np.maximum(np.linalg.norm(delta, axis=1), 0.01)
+            pull = delta * (distance / k)[:, None]
+            for end, sign in ((src, -1.0), (dst, 1.0)):
+                mask = row_of[end] >= 0
+                displacement += _accumulate(row_of[end[mask]], sign * pull[mask], len(rows))
+        length = np.maximum(np.linalg.norm(displacement, axis=1), 1e-12)
+        # Move along the net force, capped by the per-node temperature.
+        step = displacement * (np.minimum(length, temperature) / length)[:, None]
+        pos[rows] += step
+        temperature = np.maximum(temperature - cooling, 0.0)
+        if np.linalg.norm(step, axis=1).mean() < tolerance * extent:
+            converged = True
+        elif time_budget is not None and perf_counter() - started >= time_budget:
+            break
+
+    if not n_seeded:
+        pos = _rescale(pos)
+    positions = {node_id: (float(pos[i, 0]), float(pos[i, 1])) for i, node_id in enumerate(ids)}
+    return LayoutResult(
+        positions=positions,
+        iterations=iterations,
+        converged=converged,
+        seconds=perf_counter() - started,
+        seeded=n_seeded,
+        mobile=len(rows),
+        approximate=approximate,
+    )
@@ -1,53 +1,247 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from importlib import metadata
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
 
+import pydantic
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader
+
 from .models import (
     Archetype,
     CharacterList,
     CharacterProfile,
     Mechanic,
 )
+from .profiling import profiled
+
+
+T = TypeVar("T")
+
+# Bump when the entry layout changes; model and package changes are covered by cache_key().
+CACHE_VERSION = 1
+CACHED_MODELS = (Archetype, CharacterList, CharacterProfile, Mechanic)
+
+
+@lru_cache(maxsize=None)
+def cache_key() -> str:
+    """
+    Fingerprint of everything a pickled model depends on: the entry layout, the package and
+    pydantic versions and the JSON schemas of the cached models. Unpickling skips
+    validation, so entries written under any other fingerprint are never reused.
+    """
+    try:
+        package = metadata.version("deadlock-graph-tools")
+    except metadata.PackageNotFoundError:
+        package = "unknown"
+    schemas = json.dumps([model.model_json_schema() for model in CACHED_MODELS], sort_keys=True)
+    payload = f"{CACHE_VERSION}\0{package}\0{pydantic.VERSION}\0{schemas}"
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class LoaderCache:
+    """
+    On-disk cache of validated models, one pickle per source file.
+
+    Entries are keyed on :func:`cache_key` and the resolved source path and store the
+    file's mtime, size and SHA-256. A matching stat is trusted as-is; a changed stat falls
+    back to comparing the content digest (so ``touch`` or a checkout does not force a
+    re-parse), and only a changed digest pays for YAML parsing and pydantic validation again.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, path: Path) -> Path:
+        key = hashlib.sha1(f"{cache_key()}\0{path.resolve()}".encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.pickle"
+
+    def _read_entry(self, entry_path: Path) -> Optional[dict[str, Any]]:
+        try:
+            with entry_path.open("rb") as handle:
+                entry = pickle.load(handle)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt or written by an incompatible model version; rebuild it.
+            return None
+        if not isinstance(entry, dict) or entry.get("version") != cache_key():
+            return None
+        return entry
+
+    def _write_entry(self, entry_path: Path, entry: dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open("wb") as handle:
+            pickle.dump(entry, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, entry_path)
+
+    def load(self, path: Path, kind: str, build: Callable[[bytes], T]) -> T:
+        stat = path.stat()
+        entry_path = self._entry_path(path)
+        entry = self._read_entry(entry_path)
+        if entry is not None and entry["kind"] != kind:
+            entry = None
+        if (
+            entry is not None
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and entry["size"] == stat.st_size
+        ):
+            self.hits += 1
+            return entry["value"]
+
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry is not None and entry["digest"] == digest:
+            self.hits += 1
+            value = entry["value"]
+        else:
+            self.misses += 1
+            value = build(raw)
+        self._write_entry(
+            entry_path,
+            {
+                "version": cache_key(),
+                "kind": kind,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "digest": digest,
+                "value": value,
+            },
+        )
+        return value
+
+
+_cache: Optional[LoaderCache] = None
+_workers = 0
+
+
+def enable_cache(directory: Path) -> LoaderCache:
+    global _cache
+    _cache = LoaderCache(directory)
+    return _cache
+
+
+def disable_cache() -> None:
+    global _cache
+    _cache = None
+
+
+def get_cache() -> Optional[LoaderCache]:
+    return _cache
+
+
+def set_workers(workers: int) -> None:
+    """Parse character profiles in a process pool of ``workers`` (0 or 1 = in-process)."""
+    global _workers
+    _workers = max(0, workers)
+
+
+def get_workers() -> int:
+    return _workers
+
+
+def yaml_backend() -> str:
+    return "libyaml" if SafeLoader is not yaml.SafeLoader else "python"
+
+
+def _parse_yaml(raw: bytes, loader: type = SafeLoader) -> Dict:
+    return yaml.load(raw.decode("utf-8"), Loader=loader)
 
 
 def _read_yaml(path: Path) -> Dict:
     if not path.exists():
         raise FileNotFoundError(f"Expected file not found: {path}")
     with path.open("r", encoding="utf-8") as handle:
-        return yaml.safe_load(handle)
+        return yaml.load(handle, Loader=SafeLoader)
 
 
-def load_archetypes(path: Path) -> List[Archetype]:
-    payload = _read_yaml(path)
-    entries = payload.get("archetypes", [])
-    return [Archetype(**entry) for entry in entries]
+def _load(path: Path, kind: str, build: Callable[[Dict], T]) -> T:
+    if _cache is None:
+        return build(_read_yaml(path))
+    if not path.exists():
+        raise FileNotFoundError(f"Expected file not found: {path}")
+    return _cache.load(path, kind, lambda raw: build(_parse_yaml(raw)))
 
 
-def load_mechanics(path: Path) -> List[Mechanic]:
-    payload = _read_yaml(path)
-    entries = payload.get("mechanics", [])
-    return [Mechanic(**entry) for entry in entries]
+@profiled()
+def load_archetypes(path: Path) -> List[Archetype]:
+    def build(payload: Dict) -> List[Archetype]:
+        entries = payload.get("archetypes", [])
+        return [Archetype(**entry) for entry in entries]
 
+    return _load(path, "archetypes", build)
 
-def load_character_profile(path: Path) -> CharacterProfile:
-    payload = _read_yaml(path)
-    return CharacterProfile(**payload)
 
+@profiled()
+def load_mechanics(path: Path) -> List[Mechanic]:
+    def build(payload: Dict) -> List[Mechanic]:
+        entries = payload.get("mechanics", [])
+        return [Mechanic(**entry) for entry in entries]
 
-def iter_character_profiles(directory: Path) -> Iterator[CharacterProfile]:
-    for path in sorted(directory.glob("*.yaml")):
-        yield load_character_profile(path)
+    return _load(path, "mechanics", build)
 
 
+@profiled()
+def load_character_profile(path: Path) -> CharacterProfile:
+    return _load(path, "character_profile", lambda payload: CharacterProfile(**payload))
+
+
+def load_profile_in_worker(path: Path, cache_dir: Optional[Path]) -> CharacterProfile:
+    """
+    :func:`load_character_profile` for a process-pool worker: workers do not share the
+    parent's module state under spawn, so the parent's cache directory is passed along.
+    """
+    if cache_dir is not None and (_cache is None or _cache.directory != cache_dir):
+        enable_cache(cache_dir)
+    return load_character_profile(path)
+
+
+def iter_character_profiles(
+    directory: Path, workers: Optional[int] = None
+) -> Iterator[CharacterProfile]:
+    """
+    Yield profiles for ``directory/*.yaml`` in sorted path order.
+
+    With ``workers`` > 1 (or :func:`set_workers`) files are parsed and validated in a
+    process pool; results are still yielded in path order.
+    """
+    paths = sorted(directory.glob("*.yaml"))
+    workers = _workers if workers is None else workers
+    if workers <= 1 or len(paths) < 2:
+        for path in paths:
+            yield load_character_profile(path)
+        return
+    cache_dir = _cache.directory if _cache is not None else None
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(
+            load_profile_in_worker,
+            paths,
+            [cache_dir] * len(paths),
+            chunksize=chunksize,
+        )
+
+
+@profiled()
 def load_character_list(path: Path) -> CharacterList:
-    payload = _read_yaml(path)
-    return CharacterList(**payload)
+    return _load(path, "character_list", lambda payload: CharacterList(**payload))
 
 
+@profiled()
 def write_checkpoint(profile: CharacterProfile, path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as handle:
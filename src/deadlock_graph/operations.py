@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
+from time import perf_counter
 from typing import Any, Iterable, List
 
-from .db import Neo4jClient
+from .db import AsyncNeo4jClient, Neo4jClient
 from .models import Archetype, CharacterProfile, Mechanic
+from .profiling import profiled
+from .synthesis import EVEN_REASON
 
 
 CONSTRAINT_QUERIES = [
@@ -15,11 +19,14 @@ CONSTRAINT_QUERIES = [
 ]
 
 
+@profiled()
 def apply_constraints(client: Neo4jClient) -> None:
-    for query in CONSTRAINT_QUERIES:
-        client.execute(query)
+    with client.unit_of_work():
+        for query in CONSTRAINT_QUERIES:
+            client.execute(query, name="apply_constraints")
 
 
+@profiled()
 def ingest_archetypes(client: Neo4jClient, archetypes: Iterable[Archetype]) -> None:
     rows = []
     for arch in archetypes:
@@ -36,9 +43,10 @@ def ingest_archetypes(client: Neo4jClient, archetypes: Iterable[Archetype]) -> N
         a.notes = row.notes,
         a.sources = coalesce(row.sources, [])
     """
-    client.execute(query, {"rows": rows})
+    client.execute(query, {"rows": rows}, name="ingest_archetypes")
 
 
+@profiled()
 def ingest_mechanics(client: Neo4jClient, mechanics: Iterable[Mechanic]) -> None:
     rows = []
     for mech in mechanics:
@@ -55,7 +63,7 @@ def ingest_mechanics(client: Neo4jClient, mechanics: Iterable[Mechanic]) -> None
         m.archetype_implications = coalesce(row.archetype_implications, []),
         m.sources = coalesce(row.sources, [])
     """
-    client.execute(query, {"rows": rows})
+    client.execute(query, {"rows": rows}, name="ingest_mechanics")
 
 
 def _character_parameters(profile: CharacterProfile) -> dict[str, Any]:
@@ -70,65 +78,310 @@ def _character_parameters(profile: CharacterProfile) -> dict[str, Any]:
     return {"character": character, "abilities": abilities}
 
 
+CHARACTER_QUERY = """
+MERGE (c:Character {name: $character.name})
+SET c.description = $character.description,
+    c.source_url = $character.source_url,
+    c.last_updated = datetime($character.last_updated),
+    c.aliases = coalesce($character.aliases, [])
+WITH c
+// OPTIONAL so an unknown archetype only skips the edge (as in the bulk path), not the abilities.
+OPTIONAL MATCH (arch:Archetype {name: $character.archetype})
+FOREACH (target IN CASE WHEN arch IS NULL THEN [] ELSE [arch] END |
+    MERGE (c)-[:IS_ARCHETYPE]->(target)
+)
+WITH c
+UNWIND $abilities AS ability
+MERGE (ab:Ability {name: ability.name})
+SET ab.description = ability.description,
+    ab.type = ability.type,
+    ab.slot = ability.slot,
+    ab.notes = ability.notes
+MERGE (c)-[has:HAS_ABILITY]->(ab)
+SET has.slot = ability.slot,
+    has.type = ability.type
+WITH c, ab, ability
+FOREACH (mech_name IN coalesce(ability.mechanics.uses, []) |
+    MERGE (m:Mechanic {name: mech_name})
+    MERGE (ab)-[:USES_MECHANIC]->(m)
+)
+FOREACH (counter_name IN coalesce(ability.mechanics.counters, []) |
+    MERGE (m:Mechanic {name: counter_name})
+    MERGE (ab)-[:COUNTERS_MECHANIC]->(m)
+    MERGE (c)-[:CHARACTER_COUNTERS_MECHANIC]->(m)
+)
+"""
+
+
+@profiled()
 def ingest_character(client: Neo4jClient, profile: CharacterProfile) -> None:
-    params = _character_parameters(profile)
-    query = """
-    MERGE (c:Character {name: $character.name})
-    SET c.description = $character.description,
-        c.source_url = $character.source_url,
-        c.last_updated = datetime($character.last_updated),
-        c.aliases = coalesce($character.aliases, [])
-    WITH c
-    MATCH (arch:Archetype {name: $character.archetype})
-    MERGE (c)-[:IS_ARCHETYPE]->(arch)
-    WITH c
-    UNWIND $abilities AS ability
-    MERGE (ab:Ability {name: ability.name})
-    SET ab.description = ability.description,
-        ab.type = ability.type,
-        ab.slot = ability.slot,
-        ab.notes = ability.notes
-    MERGE (c)-[has:HAS_ABILITY]->(ab)
-    SET has.slot = ability.slot,
-        has.type = ability.type
-    WITH c, ab, ability
-    FOREACH (mech_name IN coalesce(ability.mechanics.uses, []) |
-        MERGE (m:Mechanic {name: mech_name})
-        MERGE (ab)-[:USES_MECHANIC]->(m)
-    )
-    FOREACH (counter_name IN coalesce(ability.mechanics.counters, []) |
-        MERGE (m:Mechanic {name: counter_name})
-        MERGE (ab)-[:COUNTERS_MECHANIC]->(m)
-        MERGE (c)-[:CHARACTER_COUNTERS_MECHANIC]->(m)
-    )
+    client.execute(CHARACTER_QUERY, _character_parameters(profile), name="ingest_character")
+
+
+@profiled()
+async def ingest_character_async(client: AsyncNeo4jClient, profile: CharacterProfile) -> None:
+    await client.execute(CHARACTER_QUERY, _character_parameters(profile), name="ingest_character")
+
+
+BULK_CHARACTER_QUERY = """
+UNWIND $rows AS row
+MERGE (c:Character {name: row.name})
+SET c.description = row.description,
+    c.source_url = row.source_url,
+    c.last_updated = datetime(row.last_updated),
+    c.aliases = coalesce(row.aliases, [])
+WITH c, row
+MATCH (arch:Archetype {name: row.archetype})
+MERGE (c)-[:IS_ARCHETYPE]->(arch)
+"""
+
+BULK_ABILITY_QUERY = """
+UNWIND $rows AS row
+MATCH (c:Character {name: row.character})
+MERGE (ab:Ability {name: row.name})
+SET ab.description = row.description,
+    ab.type = row.type,
+    ab.slot = row.slot,
+    ab.notes = row.notes
+MERGE (c)-[has:HAS_ABILITY]->(ab)
+SET has.slot = row.slot,
+    has.type = row.type
+"""
+
+BULK_USES_QUERY = """
+UNWIND $rows AS row
+MATCH (ab:Ability {name: row.ability})
+MERGE (m:Mechanic {name: row.mechanic})
+MERGE (ab)-[:USES_MECHANIC]->(m)
+"""
+
+BULK_COUNTERS_QUERY = """
+UNWIND $rows AS row
+MATCH (c:Character {name: row.character})
+MATCH (ab:Ability {name: row.ability})
+MERGE (m:Mechanic {name: row.mechanic})
+MERGE (ab)-[:COUNTERS_MECHANIC]->(m)
+MERGE (c)-[:CHARACTER_COUNTERS_MECHANIC]->(m)
+"""
+
+
+@dataclass
+class BulkIngestStats:
+    characters: int = 0
+    abilities: int = 0
+    uses: int = 0
+    counters: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows(self) -> int:
+        return self.characters + self.abilities + self.uses + self.counters
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _bulk_rows(profiles: Iterable[CharacterProfile]) -> dict[str, List[dict[str, Any]]]:
+    rows: dict[str, List[dict[str, Any]]] = {
+        "characters": [],
+        "abilities": [],
+        "uses": [],
+        "counters": [],
+    }
+    for profile in profiles:
+        params = _character_parameters(profile)
+        name = params["character"]["name"]
+        rows["characters"].append(params["character"])
+        for ability in params["abilities"]:
+            mechanics = ability.pop("mechanics")
+            rows["abilities"].append({**ability, "character": name})
+            for mech_name in mechanics.get("uses") or []:
+                rows["uses"].append({"ability": ability["name"], "mechanic": mech_name})
+            for mech_name in mechanics.get("counters") or []:
+                rows["counters"].append(
+                    {"character": name, "ability": ability["name"], "mechanic": mech_name}
+                )
+    return rows
+
+
+@profiled()
+def ingest_characters_bulk(
+    client: Neo4jClient,
+    profiles: Iterable[CharacterProfile],
+    *,
+    batch_size: int = 500,
+) -> BulkIngestStats:
+    """
+    Ingest many profiles with UNWIND batches inside a single write transaction.
+
+    Produces the same graph as calling :func:`ingest_character` per profile, but the
+    round trips are bounded by ``rows / batch_size`` per stage instead of by roster size.
     """
-    client.execute(query, params)
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    rows = _bulk_rows(profiles)
+    stages = [
+        ("characters", BULK_CHARACTER_QUERY),
+        ("abilities", BULK_ABILITY_QUERY),
+        ("uses", BULK_USES_QUERY),
+        ("counters", BULK_COUNTERS_QUERY),
+    ]
+    stats = BulkIngestStats()
+
+    def work(tx: Any) -> int:
+        # The driver may retry the whole unit of work, so count batches per attempt.
+        batches = 0
+        for key, query in stages:
+            stage_rows = rows[key]
+            for start in range(0, len(stage_rows), batch_size):
+                client.run(
+                    tx,
+                    query,
+                    {"rows": stage_rows[start : start + batch_size]},
+                    name=f"ingest_bulk.{key}",
+                )
+                batches += 1
+        return batches
+
+    started = perf_counter()
+    stats.batches = client.execute_tx(work, metadata={"operation": "ingest_characters_bulk"})
+    stats.seconds = perf_counter() - started
+    stats.characters = len(rows["characters"])
+    stats.abilities = len(rows["abilities"])
+    stats.uses = len(rows["uses"])
+    stats.counters = len(rows["counters"])
+    return stats
 
 
+# Finishes a query matching counter paths (c1)-(ab1)-[:COUNTERS_MECHANIC]->(m)<-(ab2)-(c2):
+# every pair's paths are collected once into parallel evidence lists stored on both the
+# STRONG and the WEAK edge, instead of growing a reason string per path.
+STRONG_WEAK_SET = """
+    WITH c1, c2, ab1, ab2, m
+    ORDER BY ab1.name, ab2.name, m.name
+    WITH c1, c2, collect([ab1.name, ab2.name, m.name]) AS paths
+    MERGE (c1)-[r:STRONG_AGAINST]->(c2)
+    SET r.evidence_count = size(paths),
+        r.counter_abilities = [p IN paths | p[0]],
+        r.countered_abilities = [p IN paths | p[1]],
+        r.mechanics = [p IN paths | p[2]]
+    REMOVE r.reason
+    MERGE (c2)-[r2:WEAK_AGAINST]->(c1)
+    SET r2.evidence_count = size(paths),
+        r2.counter_abilities = [p IN paths | p[0]],
+        r2.countered_abilities = [p IN paths | p[1]],
+        r2.mechanics = [p IN paths | p[2]]
+    REMOVE r2.reason
+"""
+
+
+@profiled()
 def clear_synthesized_matchups(client: Neo4jClient) -> None:
     client.execute(
         """
         MATCH (c:Character)-[r:STRONG_AGAINST|WEAK_AGAINST|EVEN_AGAINST]->()
         DELETE r
+        """,
+        name="clear_matchups",
+    )
+
+
+@profiled()
+def clear_synthesized_matchups_for(client: Neo4jClient, names: Iterable[str]) -> None:
+    client.execute(
         """
+        MATCH (c:Character)-[r:STRONG_AGAINST|WEAK_AGAINST|EVEN_AGAINST]-(:Character)
+        WHERE c.name IN $names
+        DELETE r
+        """,
+        {"names": sorted(set(names))},
+        name="clear_matchups_for",
     )
 
 
-def synthesize_matchups(client: Neo4jClient) -> None:
-    strong_query = """
+@profiled()
+def clear_even_matchups(client: Neo4jClient) -> None:
+    client.execute("MATCH (:Character)-[r:EVEN_AGAINST]->() DELETE r", name="clear_even_matchups")
+
+
+@profiled()
+def synthesize_matchups_for(
+    client: Neo4jClient, names: Iterable[str], *, implicit_even: bool = False
+) -> None:
+    """
+    Recompute only the matchup edges incident to ``names``.
+
+    Pair with :func:`clear_synthesized_matchups_for`. Evidence between two characters
+    depends only on their own abilities, so edges between untouched characters stay
+    valid and the work is bounded by the changed characters' rows. ``implicit_even``
+    skips the EVEN edges.
+    """
+    params = {"names": sorted(set(names))}
+    if not params["names"]:
+        return
+    # Anchor each query on the indexed name so the planner starts from the changed rows.
+    client.execute(
+        """
+        MATCH (c1:Character) WHERE c1.name IN $names
+        MATCH (c1)-[:HAS_ABILITY]->(ab1:Ability)-[:COUNTERS_MECHANIC]->(m:Mechanic),
+              (c2:Character)-[:HAS_ABILITY]->(ab2:Ability)-[:USES_MECHANIC]->(m)
+        WHERE c1 <> c2
+        """
+        + STRONG_WEAK_SET,
+        params,
+        name="synthesize_for.strong_weak_out",
+    )
+    client.execute(
+        """
+        MATCH (c2:Character) WHERE c2.name IN $names
+        MATCH (c2)-[:HAS_ABILITY]->(ab2:Ability)-[:USES_MECHANIC]->(m:Mechanic),
+              (c1:Character)-[:HAS_ABILITY]->(ab1:Ability)-[:COUNTERS_MECHANIC]->(m)
+        WHERE c1 <> c2 AND NOT c1.name IN $names
+        """
+        + STRONG_WEAK_SET,
+        params,
+        name="synthesize_for.strong_weak_in",
+    )
+    if implicit_even:
+        return
+    client.execute(
+        """
+        MATCH (a:Character) WHERE a.name IN $names
+        MATCH (b:Character)
+        WHERE a <> b
+          AND NOT (a)-[:STRONG_AGAINST|WEAK_AGAINST]-(b)
+        MERGE (a)-[r:EVEN_AGAINST]->(b)
+        SET r.reason = "No direct ability or mechanic counters found."
+        MERGE (b)-[r2:EVEN_AGAINST]->(a)
+        SET r2.reason = "No direct ability or mechanic counters found."
+        """,
+        params,
+        name="synthesize_for.even",
+    )
+
+
+@profiled()
+def synthesize_matchups(client: Neo4jClient, *, implicit_even: bool = False) -> None:
+    """
+    Create STRONG/WEAK edges from counter paths, then EVEN edges for every other pair.
+
+    With ``implicit_even`` EVEN stays implied: no EVEN edges are created and any left
+    from an earlier explicit run are deleted, keeping the edge count linear in evidence.
+    """
+    strong_query = (
+        """
     MATCH (c1:Character)-[:HAS_ABILITY]->(ab1:Ability)-[:COUNTERS_MECHANIC]->(m:Mechanic),
           (c2:Character)-[:HAS_ABILITY]->(ab2:Ability)-[:USES_MECHANIC]->(m)
     WHERE c1 <> c2
-    MERGE (c1)-[r:STRONG_AGAINST]->(c2)
-    SET r.reason = coalesce(r.reason, "") +
-          "[" + ab1.name + "] counters [" + ab2.name + " via " + m.name + "]. ",
-        r.evidence_count = coalesce(r.evidence_count, 0) + 1
-    MERGE (c2)-[r2:WEAK_AGAINST]->(c1)
-    SET r2.reason = coalesce(r2.reason, "") +
-          "[" + ab2.name + "] is countered by [" + ab1.name + " via " + m.name + "]. ",
-        r2.evidence_count = coalesce(r2.evidence_count, 0) + 1
     """
-    client.execute(strong_query)
+        + STRONG_WEAK_SET
+    )
+    client.execute(strong_query, name="synthesize.strong_weak")
+    if implicit_even:
+        clear_even_matchups(client)
+        return
 
     even_query = """
     MATCH (a:Character), (b:Character)
@@ -139,31 +392,69 @@ def synthesize_matchups(client: Neo4jClient) -> None:
     MERGE (b)-[r2:EVEN_AGAINST]->(a)
     SET r2.reason = "No direct ability or mechanic counters found."
     """
-    client.execute(even_query)
+    client.execute(even_query, name="synthesize.even")
+
+
+MATCHUP_QUERY = """
+MATCH (a:Character {name: $a})-[r:STRONG_AGAINST|WEAK_AGAINST|EVEN_AGAINST]->(b:Character {name: $b})
+RETURN type(r) AS relationship, coalesce(r.evidence_count, 0) AS evidence,
+       coalesce(r.reason, '') AS reason,
+       coalesce(r.counter_abilities, []) AS counter_abilities,
+       coalesce(r.countered_abilities, []) AS countered_abilities,
+       coalesce(r.mechanics, []) AS mechanics
+ORDER BY relationship
+"""
+
 
+@profiled()
+def fetch_matchup(client: Neo4jClient, a: str, b: str) -> list[dict[str, Any]]:
+    """Matchup rows from ``a`` to ``b``; an implied EVEN row when no edge is stored."""
+    rows = client.fetch(MATCHUP_QUERY, {"a": a, "b": b}, name="fetch_matchup")
+    if not rows and a != b:
+        rows = [
+            {
+                "relationship": "EVEN_AGAINST",
+                "evidence": 0,
+                "reason": EVEN_REASON,
+                "counter_abilities": [],
+                "countered_abilities": [],
+                "mechanics": [],
+            }
+        ]
+    return rows
 
+
+VALIDATION_QUERIES = {
+    "character_missing_archetype": """
+        MATCH (c:Character)
+        WHERE NOT (c)-[:IS_ARCHETYPE]->()
+        RETURN c.name AS name
+    """,
+    "character_missing_abilities": """
+        MATCH (c:Character)
+        WHERE NOT (c)-[:HAS_ABILITY]->()
+        RETURN c.name AS name
+    """,
+    "ability_missing_analysis": """
+        MATCH (ab:Ability)
+        WHERE NOT (ab)-[:USES_MECHANIC]->()
+          AND NOT (ab)-[:COUNTERS_MECHANIC]->()
+        RETURN ab.name AS name
+    """,
+}
+
+
+@profiled()
 def run_validation_queries(client: Neo4jClient) -> dict[str, list[str]]:
     results: dict[str, list[str]] = {}
-    queries = {
-        "character_missing_archetype": """
-            MATCH (c:Character)
-            WHERE NOT (c)-[:IS_ARCHETYPE]->()
-            RETURN c.name AS name
-        """,
-        "character_missing_abilities": """
-            MATCH (c:Character)
-            WHERE NOT (c)-[:HAS_ABILITY]->()
-            RETURN c.name AS name
-        """,
-        "ability_missing_analysis": """
-            MATCH (ab:Ability)
-            WHERE NOT (ab)-[:USES_MECHANIC]->()
-              AND NOT (ab)-[:COUNTERS_MECHANIC]->()
-            RETURN ab.name AS name
-        """,
-    }
-    with client.session() as session:
-        for key, cypher in queries.items():
-            records = session.run(cypher)
-            results[key] = [record["name"] for record in records]
+    with client.unit_of_work():
+        for key, cypher in VALIDATION_QUERIES.items():
+            results[key] = [record["name"] for record in client.fetch(cypher, name=key)]
     return results
+
+
+@profiled()
+async def run_validation_queries_async(client: AsyncNeo4jClient) -> dict[str, list[str]]:
+    """Same checks as :func:`run_validation_queries`, issued concurrently."""
+    rows = await client.fetch_many(VALIDATION_QUERIES)
+    return {key: [record["name"] for record in records] for key, records in rows.items()}
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from .export import atomic_open
+from .profiling import profiled
+
+
+# Matchup and mechanic subgraph, walked undirected. EVEN_AGAINST links nearly every pair and
+# is absent in implicit mode; archetype membership is not a gameplay relation.
+PATH_EDGE_TYPES = (
+    "STRONG_AGAINST",
+    "WEAK_AGAINST",
+    "CHARACTER_COUNTERS_MECHANIC",
+    "HAS_ABILITY",
+    "USES_MECHANIC",
+    "COUNTERS_MECHANIC",
+)
+DEFAULT_HOPS = 2
+DEFAULT_HOP_LIMIT = 256
+# Upper bound on next-hop cells (targets x nodes) before the stage refuses to run.
+DEFAULT_MAX_CELLS = 4_000_000
+# Bounds the arcs one BFS level may expand (sources per chunk x arcs).
+BFS_CHUNK_CELLS = 8_000_000
+PATH_INDEX_NAME = "index.json"
+
+
+def _bfs(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    sources: np.ndarray,
+    depth: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Level-synchronous BFS from every source at once over a CSR adjacency.
+
+    Each level gathers the neighbours of all frontier ``(source, node)`` pairs in one
+    vectorised step, so the work is proportional to the arcs actually expanded. Returns
+    ``(dist, parent)`` shaped ``(len(sources), node count)``: hop distance (-1 when
+    unreached) and the predecessor on a shortest path from the source (the lowest index when
+    several tie, so the tables are deterministic). With ``limit``, a source stops expanding
+    after the level at which it has reached more than ``limit`` nodes.
+    """
+    width, count = len(sources), len(indptr) - 1
+    seen = np.zeros(width, dtype=np.int64)
+    dist = np.full((width, count), -1, dtype=np.int16)
+    parent = np.full((width, count), -1, dtype=np.int32)
+    cols, nodes = np.arange(width), sources.astype(np.int64)
+    dist[cols, nodes] = 0
+    parent[cols, nodes] = nodes
+    level = 0
+    while len(nodes) and (depth is None or level < depth):
+        level += 1
+        starts = indptr[nodes]
+        degrees = indptr[nodes + 1] - starts
+        total = int(degrees.sum())
+        if not total:
+            break
+        # Frontier pairs are sorted by (column, node), so within one column the first
+        # occurrence of a reached node comes from its lowest-index predecessor.
+        offsets = np.arange(total) - np.repeat(np.cumsum(degrees) - degrees, degrees)
+        reached = indices[np.repeat(starts, degrees) + offsets]
+        cols, came_from = np.repeat(cols, degrees), np.repeat(nodes, degrees)
+        fresh = dist[cols, reached] < 0
+        cols, reached, came_from = cols[fresh], reached[fresh], came_from[fresh]
+        _, first = np.unique(cols * count + reached, return_index=True)
+        cols, nodes = cols[first], reached[first]
+        dist[cols, nodes] = level
+        parent[cols, nodes] = came_from[first]
+        if limit is not None:
+            seen += np.bincount(cols, minlength=width)
+            open_ = seen[cols] <= limit
+            cols, nodes = cols[open_], nodes[open_]
+    return dist, parent
+
+
+def _chunks(sources: np.ndarray, arcs: int) -> Iterable[np.ndarray]:
+    # A level expands at most every arc once per source in the chunk.
+    size = max(1, BFS_CHUNK_CELLS // max(arcs, 1))
+    for start in range(0, len(sources), size):
+        yield sources[start : start + size]
+
+
+@profiled()
+def build_paths(
+    nodes: list[dict],
+    edges: list[dict],
+    *,
+    hops: int = DEFAULT_HOPS,
+    hop_limit: int = DEFAULT_HOP_LIMIT,
+    max_cells: int = DEFAULT_MAX_CELLS,
+    edge_types: Iterable[str] = PATH_EDGE_TYPES,
+) -> dict[str, Any]:
+    """
+    Shortest-path and k-hop tables over the undirected ``edge_types`` subgraph.
+
+    ``next_hop[t][v]`` is the index (into ``nodes``) of the next node on a shortest path
+    from node ``v`` to character ``targets[t]`` (-1 when unreachable), so a path is a walk
+    of one lookup per hop. ``neighborhoods[v]`` lists the nodes 1..``hops`` hops from ``v``,
+    one list per distance, at most ``hop_limit`` in total; ``truncated`` names the nodes
+    that hit the limit. Raises ``ValueError`` when the table would exceed ``max_cells``.
+    """
+    types = tuple(edge_types)
+    wanted = set(types)
+    members = [
+        edge for edge in edges if edge["type"] in wanted and edge["source"] != edge["target"]
+    ]
+    linked = {edge["source"] for edge in members} | {edge["target"] for edge in members}
+    ids = [node["id"] for node in nodes if node["id"] in linked or node["label"] == "Character"]
+    position = {node_id: i for i, node_id in enumerate(ids)}
+    targets = np.array(
+        [position[node["id"]] for node in nodes if node["label"] == "Character"], dtype=np.int64
+    )
+    if len(targets) * len(ids) > max_cells:
+        raise ValueError(
+            f"Path table of {len(targets)} x {len(ids)} cells exceeds the cap of {max_cells}."
+        )
+
+    pairs = {(position[e["source"]], position[e["target"]]) for e in members}
+    pairs |= {(b, a) for a, b in pairs}
+    arcs = np.array(sorted(pairs), dtype=np.int64).reshape(-1, 2)
+    indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(arcs[:, 0], minlength=len(ids)), out=indptr[1:])
+    indices = arcs[:, 1]
+
+    # Undirected, so the BFS tree rooted at a target points every node towards it.
+    next_hop = np.full((len(targets), len(ids)), -1, dtype=np.int32)
+    row = 0
+    for chunk in _chunks(targets, len(arcs)):
+        _, parent = _bfs(indptr, indices, chunk)
+        next_hop[row : row + len(chunk)] = parent
+        row += len(chunk)
+
+    neighborhoods: list[list[list[int]]] = []
+    truncated: list[int] = []
+    everyone = np.arange(len(ids))
+    for chunk in _chunks(everyone, len(arcs)):
+        dist, _ = _bfs(indptr, indices, chunk, depth=hops, limit=hop_limit)
+        for source, distances in zip(chunk, dist):
+            rings, kept = [], 0
+            for level in range(1, hops + 1):
+                ring = np.flatnonzero(distances == level)[: hop_limit - kept].tolist()
+                kept += len(ring)
+                rings.append(ring)
+            if kept == hop_limit and np.count_nonzero(distances > 0) > hop_limit:
+                truncated.append(int(source))
+            neighborhoods.append(rings)
+
+    return {
+        "edge_types": list(types),
+        "nodes": ids,
+        "targets": targets.tolist(),
+        "hops": hops,
+        "hop_limit": hop_limit,
+        "next_hop": next_hop.tolist(),
+        "neighborhoods": neighborhoods,
+        "truncated": truncated,
+    }
+
+
+def walk(tables: dict[str, Any], source: str, target: str) -> Optional[list[str]]:
+    """Shortest path from ``source`` to the character ``target`` by following ``next_hop``."""
+    ids = tables["nodes"]
+    position = {node_id: i for i, node_id in enumerate(ids)}
+    if source not in position or target not in position:
+        return None
+    try:
+        column = tables["next_hop"][tables["targets"].index(position[target])]
+    except ValueError:
+        raise ValueError(f"{target} is not a path target (only characters are).") from None
+    current, goal = position[source], position[target]
+    path = [current]
+    while current != goal:
+        current = column[current]
+        if current < 0 or len(path) > len(ids):
+            return None
+        path.append(current)
+    return [ids[i] for i in path]
+
+
+def _write(directory: Path, stem: str, doc: dict, written: set[Path]) -> str:
+    data = json.dumps(doc, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    rel_path = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}.json"
+    target = directory / rel_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if not target.exists():
+        with atomic_open(target, "wb") as handle:
+            handle.write(data)
+    written.add(target.resolve())
+    return rel_path
+
+
+@profiled()
+def write_path_shards(tables: dict[str, Any], directory: Path, *, per_shard: int = 16) -> dict[str, Any]:
+    """
+    Write ``tables`` as an index plus content-addressed shards of ``per_shard`` next-hop
+    columns (by target) and ``per_shard * 16`` neighbourhoods (by node). A lookup fetches
+    the index and the one shard holding its target column. Returns the index document.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    written: set[Path] = set()
+    targets, neighborhoods = tables["targets"], tables["neighborhoods"]
+    next_shards = []
+    for start in range(0, len(targets), per_shard):
+        stop = min(start + per_shard, len(targets))
+        rel_path = _write(
+            directory,
+            f"next/{start:05d}",
+            {"start": start, "next_hop": tables["next_hop"][start:stop]},
+            written,
+        )
+        next_shards.append({"start": start, "stop": stop, "path": rel_path})
+    hop_shards = []
+    block = per_shard * 16
+    for start in range(0, len(neighborhoods), block):
+        stop = min(start + block, len(neighborhoods))
+        rel_path = _write(
+            directory,
+            f"hops/{start:05d}",
+            {"start": start, "neighborhoods": neighborhoods[start:stop]},
+            written,
+        )
+        hop_shards.append({"start": start, "stop": stop, "path": rel_path})
+    for stale in directory.glob("*/*.json"):
+        if stale.resolve() not in written:
+            stale.unlink()
+    index = {key: value for key, value in tables.items() if key not in ("next_hop", "neighborhoods")}
+    index["shards"] = {"next_hop": next_shards, "neighborhoods": hop_shards}
+    with atomic_open(directory / PATH_INDEX_NAME, "wb") as handle:
+        handle.write(json.dumps(index, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+    return index
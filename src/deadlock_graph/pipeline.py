@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Optional, Sequence
+
+from .loaders import get_cache, load_character_profile, load_profile_in_worker, write_checkpoint
+from .models import CharacterProfile
+from .profiling import profiled
+
+
+# Marks the end of a queue; each stage forwards it once its input is exhausted.
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """
+    Latency counters for one pipeline stage.
+
+    ``busy`` is time spent doing the stage's own work, ``starved`` time waiting on an empty
+    input queue and ``blocked`` time waiting on a full output queue (backpressure). The
+    stage with the largest ``busy`` share is the bottleneck; the others mostly starve.
+    """
+
+    name: str
+    items: int = 0
+    busy: float = 0.0
+    starved: float = 0.0
+    blocked: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.busy / self.items if self.items else 0.0
+
+    def record(self, seconds: float) -> None:
+        self.items += 1
+        self.busy += seconds
+        self.max_latency = max(self.max_latency, seconds)
+
+
+@dataclass
+class PipelineStats:
+    stages: list[StageStats] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def bottleneck(self) -> Optional[StageStats]:
+        return max(self.stages, key=lambda stage: stage.busy, default=None)
+
+    def report(self) -> list[str]:
+        lines = [
+            f"{'stage':<12} {'items':>6} {'busy s':>8} {'mean ms':>8} {'max ms':>8} "
+            f"{'starved s':>10} {'blocked s':>10}"
+        ]
+        for stage in self.stages:
+            lines.append(
+                f"{stage.name:<12} {stage.items:>6} {stage.busy:>8.3f} "
+                f"{stage.mean_latency * 1000:>8.2f} {stage.max_latency * 1000:>8.2f} "
+                f"{stage.starved:>10.3f} {stage.blocked:>10.3f}"
+            )
+        bottleneck = self.bottleneck
+        if bottleneck is not None:
+            share = bottleneck.busy / self.seconds if self.seconds else 0.0
+            lines.append(
+                f"Pipeline: {self.seconds:.3f}s wall; bottleneck '{bottleneck.name}' "
+                f"busy {share:.0%} of the run."
+            )
+        return lines
+
+
+async def _put(queue: asyncio.Queue, item: Any, stats: StageStats) -> None:
+    started = perf_counter()
+    await queue.put(item)
+    stats.blocked += perf_counter() - started
+
+
+async def _get(queue: asyncio.Queue, stats: StageStats) -> Any:
+    started = perf_counter()
+    item = await queue.get()
+    stats.starved += perf_counter() - started
+    return item
+
+
+async def _parse_stage(
+    paths: Sequence[Path],
+    out: asyncio.Queue,
+    stats: StageStats,
+    executor: Optional[Executor],
+    in_flight: int = 1,
+) -> None:
+    """
+    Keep up to ``in_flight`` files parsing at once and emit them in path order.
+
+    A stage item's latency is the time spent waiting for the oldest outstanding file, so
+    ``busy`` stays comparable to wall time however many files parse in parallel.
+    """
+    loop = asyncio.get_running_loop()
+    cache = get_cache()
+    cache_dir = cache.directory if cache is not None else None
+
+    def submit(path: Path) -> asyncio.Future:
+        if executor is None:
+            return asyncio.ensure_future(asyncio.to_thread(load_character_profile, path))
+        return loop.run_in_executor(executor, load_profile_in_worker, path, cache_dir)
+
+    remaining = iter(paths)
+    pending: deque[asyncio.Future] = deque(
+        submit(path) for path in islice(remaining, max(in_flight, 1))
+    )
+    while pending:
+        started = perf_counter()
+        profile = await pending.popleft()
+        stats.record(perf_counter() - started)
+        # Refill before handing the profile on, so workers stay busy under backpressure.
+        following = next(remaining, None)
+        if following is not None:
+            pending.append(submit(following))
+        await _put(out, profile, stats)
+    await out.put(_DONE)
+
+
+async def _checkpoint_stage(
+    inbox: asyncio.Queue,
+    out: asyncio.Queue,
+    stats: StageStats,
+    checkpoint_dir: Path,
+) -> None:
+    while (profile := await _get(inbox, stats)) is not _DONE:
+        started = perf_counter()
+        path = checkpoint_dir / f"temp_ingest_{profile.character.slug}.json"
+        await asyncio.to_thread(write_checkpoint, profile, path)
+        stats.record(perf_counter() - started)
+        await _put(out, profile, stats)
+    await out.put(_DONE)
+
+
+async def _write_stage(
+    inbox: asyncio.Queue,
+    stats: StageStats,
+    write: Optional[Callable[[CharacterProfile], Awaitable[None]]],
+) -> None:
+    while (profile := await _get(inbox, stats)) is not _DONE:
+        started = perf_counter()
+        if write is not None:
+            await write(profile)
+        stats.record(perf_counter() - started)
+
+
+@profiled()
+async def run_ingest_pipeline(
+    paths: Sequence[Path],
+    checkpoint_dir: Path,
+    write: Optional[Callable[[CharacterProfile], Awaitable[None]]] = None,
+    *,
+    queue_size: int = 8,
+    workers: int = 0,
+) -> PipelineStats:
+    """
+    Parse, checkpoint and write character profiles as three overlapping stages.
+
+    Stages are connected by queues of at most ``queue_size`` profiles, so a slow stage
+    makes its producers wait instead of buffering the roster. Parsing runs in a thread (or
+    a process pool with ``workers`` files in flight when ``workers`` > 1), checkpoints in a
+    thread, and ``write`` (e.g. :func:`operations.ingest_character_async`) on the event loop;
+    ``write=None`` is a dry run. Profiles keep their path order through every stage. The
+    first failing stage cancels the others and its exception propagates.
+    """
+    if queue_size < 1:
+        raise ValueError("queue_size must be positive")
+    stats = PipelineStats(stages=[StageStats("parse"), StageStats("checkpoint"), StageStats("write")])
+    parse_stats, checkpoint_stats, write_stats = stats.stages
+    parsed: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    checkpointed: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    started = perf_counter()
+    try:
+        async with asyncio.TaskGroup() as group:
+            group.create_task(_parse_stage(paths, parsed, parse_stats, executor, workers))
+            group.create_task(_checkpoint_stage(parsed, checkpointed, checkpoint_stats, checkpoint_dir))
+            group.create_task(_write_stage(checkpointed, write_stats, write))
+    except ExceptionGroup as failure:
+        raise failure.exceptions[0]
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    stats.seconds = perf_counter() - started
+    return stats
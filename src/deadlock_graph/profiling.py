@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Callable, ContextManager, Iterator, Optional, TypeVar
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_profiler: Optional["Profiler"] = None
+_NULL = nullcontext()
+_stack: ContextVar[tuple["_Frame", ...]] = ContextVar("profile_stack", default=())
+
+
+@dataclass
+class _Frame:
+    name: str
+    start_ns: int
+    child_ns: int = 0
+    peak: int = 0
+
+
+@dataclass
+class StageTotals:
+    name: str
+    calls: int = 0
+    total_ns: int = 0
+    self_ns: int = 0
+    peak: int = 0
+
+
+@dataclass
+class Profiler:
+    """
+    Nested stage timer with call counts and tracemalloc peaks.
+
+    Stages nest per task/thread through a context variable, so asyncio pipelines and
+    ``to_thread`` workers get their own stacks. Peaks are the highest traced Python
+    allocation seen while a stage (or any stage nested in it) was open; concurrent stages
+    share one tracemalloc peak, so treat their figures as upper bounds.
+    """
+
+    track_memory: bool = True
+    events: list[dict[str, Any]] = field(default_factory=list)
+    totals: dict[str, StageTotals] = field(default_factory=dict)
+    origin_ns: int = field(default_factory=perf_counter_ns)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def start(self) -> None:
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self) -> None:
+        if self.track_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name: str, **args: Any) -> Iterator[None]:
+        stack = _stack.get()
+        if self.track_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+        frame = _Frame(name, perf_counter_ns())
+        token = _stack.set(stack + (frame,))
+        try:
+            yield
+        finally:
+            end_ns = perf_counter_ns()
+            _stack.reset(token)
+            if self.track_memory:
+                frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            duration = end_ns - frame.start_ns
+            if stack:
+                stack[-1].child_ns += duration
+                stack[-1].peak = max(stack[-1].peak, frame.peak)
+            with self._lock:
+                totals = self.totals.setdefault(name, StageTotals(name))
+                totals.calls += 1
+                totals.total_ns += duration
+                # Concurrent children (asyncio/threads) can overlap and outlast the parent.
+                totals.self_ns += max(0, duration - frame.child_ns)
+                totals.peak = max(totals.peak, frame.peak)
+                event_args = {"peak_bytes": frame.peak} if self.track_memory else {}
+                event_args.update(args)
+                self.events.append(
+                    {
+                        "name": name,
+                        "cat": "stage",
+                        "ph": "X",
+                        "ts": (frame.start_ns - self.origin_ns) / 1000,
+                        "dur": duration / 1000,
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                        "args": event_args,
+                    }
+                )
+
+    def write_trace(self, path: Path) -> None:
+        """Write Chrome trace-event JSON (chrome://tracing, ui.perfetto.dev)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+        path.write_text(
+            json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8"
+        )
+
+    def summary(self) -> list[str]:
+        lines = [
+            f"{'stage':<40} {'calls':>6} {'total ms':>10} {'self ms':>10} {'mean ms':>9} {'peak MiB':>9}"
+        ]
+        for totals in sorted(self.totals.values(), key=lambda t: t.total_ns, reverse=True):
+            peak = f"{totals.peak / 2**20:>9.1f}" if self.track_memory else f"{'-':>9}"
+            lines.append(
+                f"{totals.name:<40} {totals.calls:>6} {totals.total_ns / 1e6:>10.2f} "
+                f"{totals.self_ns / 1e6:>10.2f} {totals.total_ns / totals.calls / 1e6:>9.2f} {peak}"
+            )
+        return lines
+
+
+def enable_profiling(track_memory: bool = True) -> Profiler:
+    global _profiler
+    _profiler = Profiler(track_memory=track_memory)
+    _profiler.start()
+    return _profiler
+
+
+def disable_profiling() -> Optional[Profiler]:
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def get_profiler() -> Optional[Profiler]:
+    return _profiler
+
+
+def stage(name: str, **args: Any) -> ContextManager[None]:
+    """Time a block as a named stage; a shared no-op context when profiling is off."""
+    if _profiler is None:
+        return _NULL
+    return _profiler.stage(name, **args)
+
+
+def profiled(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator form of :func:`stage`, named ``module.qualname`` unless ``name`` is given."""
+
+    def decorate(fn: F) -> F:
+        label = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _profiler is None:
+                    return await fn(*args, **kwargs)
+                with _profiler.stage(label):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _profiler is None:
+                return fn(*args, **kwargs)
+            with _profiler.stage(label):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
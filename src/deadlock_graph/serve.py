@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import json
+from collections import deque
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .export import aggregate_edges, build_indexes, build_nodes, finalize_edges, search_index, search_lookup
+from .loaders import iter_character_profiles, load_archetypes, load_character_list, load_mechanics
+from .profiling import profiled
+from .synthesis import MatchupMatrix, synthesize
+
+
+# Later labels win when two nodes share a display name, so characters take precedence.
+NAME_PRIORITY = ("Archetype", "Mechanic", "Ability", "Character")
+
+
+class QueryError(Exception):
+    """A request the index cannot answer; carries the HTTP status to return."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class GraphIndex:
+    """
+    Read-only lookup structures over an exported graph.
+
+    Everything a query needs is precomputed once: name resolution, per-character matchup
+    lists sorted by evidence, a :class:`MatchupMatrix` (so EVEN pairs need no stored edge),
+    undirected and per-type directed adjacency, per-mechanic usage and the name search index.
+    """
+
+    def __init__(self, payload: dict) -> None:
+        self.nodes: dict[str, dict] = {node["id"]: node for node in payload["nodes"]}
+        self.names: dict[str, str] = {}
+        for label in NAME_PRIORITY:
+            for node in payload["nodes"]:
+                name = node["properties"].get("name")
+                if node["label"] == label and name:
+                    self.names[name.casefold()] = node["id"]
+        self.characters = sorted(
+            node["properties"]["name"] for node in payload["nodes"] if node["label"] == "Character"
+        )
+        self.matrix = MatchupMatrix(self.characters)
+        self.matchup_edges: dict[tuple[str, str, str], dict] = {}
+        self.adjacency: dict[str, list[str]] = payload.get("indexes", {}).get("neighbors") or {}
+        self.typed: dict[str, dict[str, list[str]]] = {}
+        self.mechanics: dict[str, dict[str, list[str]]] = {}
+        owners: dict[str, str] = {}
+        for edge in payload["edges"]:
+            rel, source, target = edge["type"], edge["source"], edge["target"]
+            self.typed.setdefault(rel, {}).setdefault(source, []).append(target)
+            if rel in ("STRONG_AGAINST", "WEAK_AGAINST"):
+                a, b = _name(source), _name(target)
+                self.matrix.add(a, rel, b, int(edge["properties"].get("evidence_count", 1)))
+                self.matchup_edges[(a, rel, b)] = edge["properties"]
+            elif rel == "HAS_ABILITY":
+                owners[target] = _name(source)
+        if not self.adjacency:
+            self.adjacency = build_indexes(payload["nodes"], payload["edges"])["neighbors"]
+        self.search_terms = payload.get("indexes", {}).get("search") or search_index(
+            (node["id"], text)
+            for node in payload["nodes"]
+            for text in (node["properties"].get("name"), *(node["properties"].get("aliases") or ()))
+        )
+        for rel, key in (("USES_MECHANIC", "used_by"), ("COUNTERS_MECHANIC", "countered_by")):
+            for ability, mechanics in self.typed.get(rel, {}).items():
+                for mechanic in mechanics:
+                    usage = self.mechanics.setdefault(_name(mechanic), {"used_by": [], "countered_by": []})
+                    usage[key].append(_name(ability))
+                    owner = owners.get(ability)
+                    if owner is not None:
+                        usage.setdefault(f"{key}_characters", [])
+                        if owner not in usage[f"{key}_characters"]:
+                            usage[f"{key}_characters"].append(owner)
+        self.strong: dict[str, list[dict]] = {name: [] for name in self.characters}
+        self.weak: dict[str, list[dict]] = {name: [] for name in self.characters}
+        for (a, rel, b), props in self.matchup_edges.items():
+            target = self.strong if rel == "STRONG_AGAINST" else self.weak
+            target[a].append({"character": b, "evidence_count": props.get("evidence_count", 0)})
+        for lists in (self.strong, self.weak):
+            for rows in lists.values():
+                rows.sort(key=lambda row: (-row["evidence_count"], row["character"]))
+
+    @classmethod
+    @profiled()
+    def from_graph(cls, path: Path) -> "GraphIndex":
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    @classmethod
+    @profiled()
+    def from_yaml(cls, data_root: Path) -> "GraphIndex":
+        """Build from the YAML models, synthesizing matchups in memory (no CSV or Neo4j)."""
+        archetypes = {a.name: a for a in load_archetypes(data_root / "archetypes.yaml")}
+        mechanics = {m.name: m for m in load_mechanics(data_root / "mechanics.yaml")}
+        roster = load_character_list(data_root / "character_list.yaml")
+        lookup = {entry.name: entry.archetype for entry in roster.characters}
+        profiles = {p.character.name: p for p in iter_character_profiles(data_root / "characters")}
+        rows = [
+            {k: str(v) for k, v in matchup.as_row().items()}
+            for matchup in synthesize(profiles.values(), implicit_even=True)
+        ]
+        aliases = {entry.name: entry.aliases for entry in roster.characters}
+        nodes = build_nodes(archetypes, mechanics, lookup, profiles, aliases)
+        edges = finalize_edges(aggregate_edges(profiles, lookup, mechanics, rows))
+        return cls({"nodes": nodes, "edges": edges, "indexes": build_indexes(nodes, edges)})
+
+    def resolve(self, ref: str) -> str:
+        """Node id for a node id or (case-insensitive) display name."""
+        if ref in self.nodes:
+            return ref
+        node_id = self.names.get(ref.casefold())
+        if node_id is None:
+            raise QueryError(404, f"Unknown node: {ref}")
+        return node_id
+
+    def character(self, ref: str) -> str:
+        node_id = self.resolve(ref)
+        if self.nodes[node_id]["label"] != "Character":
+            raise QueryError(400, f"{ref} is not a character")
+        return _name(node_id)
+
+    def matchup(self, a: str, b: str) -> dict:
+        a, b = self.character(a), self.character(b)
+        if a == b:
+            raise QueryError(400, f"{a} cannot be matched against itself")
+        relationships = []
+        for rel, count in self.matrix.relationships(a, b).items():
+            props = self.matchup_edges.get((a, rel, b), {})
+            relationships.append(
+                {"type": rel, "evidence_count": count, "evidence": props.get("evidence", [])}
+            )
+        return {"character": a, "opponent": b, "relationships": relationships}
+
+    def matchups(self, name: str) -> dict:
+        name = self.character(name)
+        linked = {row["character"] for row in self.strong[name] + self.weak[name]}
+        return {
+            "character": name,
+            "strong_against": self.strong[name],
+            "weak_against": self.weak[name],
+            "even_against": [other for other in self.characters if other != name and other not in linked],
+        }
+
+    def counters(self, name: str) -> dict:
+        """Characters STRONG_AGAINST ``name``, most evidence first."""
+        name = self.character(name)
+        return {"character": name, "countered_by": self.weak[name]}
+
+    def neighbors(self, ref: str) -> dict:
+        node_id = self.resolve(ref)
+        return {
+            "id": node_id,
+            "neighbors": [
+                {"id": other, "label": self.nodes[other]["label"]}
+                for other in self.adjacency.get(node_id, [])
+                if other in self.nodes
+            ],
+        }
+
+    def mechanic(self, ref: str) -> dict:
+        node_id = self.resolve(ref)
+        if self.nodes[node_id]["label"] != "Mechanic":
+            raise QueryError(400, f"{ref} is not a mechanic")
+        name = _name(node_id)
+        usage = self.mechanics.get(name, {})
+        return {
+            "mechanic": name,
+            "category": self.nodes[node_id]["properties"].get("category"),
+            "used_by": usage.get("used_by", []),
+            "countered_by": usage.get("countered_by", []),
+            "used_by_characters": usage.get("used_by_characters", []),
+            "countered_by_characters": usage.get("countered_by_characters", []),
+        }
+
+    def path(self, start: str, goal: str, rel: Optional[str] = None) -> dict:
+        """Shortest path by BFS, undirected over all edges or directed over one edge type."""
+        source, target = self.resolve(start), self.resolve(goal)
+        if rel is not None and rel not in self.typed:
+            raise QueryError(400, f"Unknown edge type: {rel}")
+        graph = self.typed[rel] if rel is not None else self.adjacency
+        parents: dict[str, Optional[str]] = {source: None}
+        queue = deque([source])
+        while queue and target not in parents:
+            current = queue.popleft()
+            for nxt in graph.get(current, ()):
+                if nxt not in parents:
+                    parents[nxt] = current
+                    queue.append(nxt)
+        if target not in parents:
+            return {"from": source, "to": target, "type": rel, "path": None}
+        path = [target]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        return {"from": source, "to": target, "type": rel, "path": path[::-1]}
+
+    def search(self, query: str, limit: str = "20") -> dict:
+        """Nodes whose name or alias has words starting with, or contains, ``query``."""
+        if not limit.isdigit():
+            raise QueryError(400, f"Invalid limit: {limit}")
+        return {
+            "query": query,
+            "results": [
+                {"id": node_id, "label": self.nodes[node_id]["label"]}
+                for node_id in search_lookup(self.search_terms, query, int(limit))
+                if node_id in self.nodes
+            ],
+        }
+
+    def summary(self) -> dict:
+        return {
+            "nodes": len(self.nodes),
+            "characters": len(self.characters),
+            "matchup_edges": len(self.matchup_edges),
+            "even_pairs": self.matrix.even_pairs(),
+        }
+
+    def respond(self, target: str) -> tuple[int, bytes]:
+        """Route a GET request target (path plus query string) to a JSON response."""
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        routes: dict[tuple[str, int], Callable[..., Any]] = {
+            ("health", 0): self.summary,
+            ("characters", 0): lambda: {"characters": self.characters},
+            ("matchup", 2): self.matchup,
+            ("matchups", 1): self.matchups,
+            ("counters", 1): self.counters,
+            ("neighbors", 1): self.neighbors,
+            ("mechanics", 1): self.mechanic,
+            ("path", 2): lambda a, b: self.path(a, b, query.get("type")),
+            ("search", 1): lambda text: self.search(text, query.get("limit", "20")),
+        }
+        handler = routes.get((parts[0], len(parts) - 1)) if parts else None
+        try:
+            if handler is None:
+                raise QueryError(404, f"No route for /{'/'.join(parts)}")
+            status, body = 200, handler(*parts[1:])
+        except QueryError as exc:
+            status, body = exc.status, {"error": str(exc)}
+        return status, json.dumps(body, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _name(node_id: str) -> str:
+    return node_id.partition(":")[2]
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs when many clients connect at once (1 s retries).
+    request_queue_size = 128
+
+
+def make_server(
+    index: GraphIndex,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    *,
+    cache_size: int = 4096,
+    access_log: bool = False,
+) -> ThreadingHTTPServer:
+    """
+    Threaded HTTP/1.1 server answering GET requests from ``index``.
+
+    Encoded responses are memoised per request target in an LRU cache of ``cache_size``
+    entries (0 disables it); the index is immutable, so entries never go stale.
+    """
+    respond = lru_cache(maxsize=cache_size)(index.respond) if cache_size else index.respond
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out as separate writes; with Nagle on, keep-alive clients
+        # wait ~40 ms on delayed ACKs for every response.
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            status, body = respond(self.path)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            if access_log:
+                super().log_message(format, *args)
+
+    server = _Server((host, port), Handler)
+    server.respond = respond  # type: ignore[attr-defined]
+    return server
@@ -0,0 +1,542 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Mapping, Sequence
+
+import numpy as np
+
+from .loaders import load_character_profile
+from .models import CharacterProfile
+from .profiling import profiled
+
+
+# Parallel lists, one entry per ability-level counter behind a STRONG/WEAK row: the same
+# columns are stored on the Neo4j relationships and written as JSON arrays to the CSV.
+EVIDENCE_FIELDS = ("counter_abilities", "countered_abilities", "mechanics")
+MATCHUP_FIELDS = ["source", "relationship", "target", "evidence", "reason", *EVIDENCE_FIELDS]
+EVEN_REASON = "No direct ability or mechanic counters found."
+# "explicit" stores both directions of every EVEN pair; "implicit" stores only STRONG/WEAK
+# rows and treats every other pair as EVEN.
+EVEN_MODES = ("explicit", "implicit")
+# "[A] counters [B via M]. " on STRONG rows, "[B] is countered by [A via M]. " on WEAK rows.
+REASON_PATTERN = re.compile(
+    r"\[(?P<first>[^\]]+)\] (?P<verb>counters|is countered by) \[(?P<second>[^\]]+) via (?P<mechanic>[^\]]+)\]\."
+)
+
+
+@dataclass(frozen=True)
+class Evidence:
+    """One ability-level counter behind a matchup: ``counter`` beats ``countered`` via ``mechanic``."""
+
+    counter: str
+    countered: str
+    mechanic: str
+
+    def as_dict(self) -> dict[str, str]:
+        return {"counter": self.counter, "countered": self.countered, "mechanic": self.mechanic}
+
+
+def strong_reason(counter: str, countered: str, mechanic: str) -> str:
+    return f"[{counter}] counters [{countered} via {mechanic}]. "
+
+
+def weak_reason(counter: str, countered: str, mechanic: str) -> str:
+    return f"[{countered}] is countered by [{counter} via {mechanic}]. "
+
+
+@dataclass(frozen=True)
+class Matchup:
+    """
+    One matchup row. STRONG/WEAK rows carry their ability-level ``entries`` (shared by both
+    directions); ``note`` is the free-text reason of rows without any, such as EVEN.
+    """
+
+    source: str
+    relationship: str
+    target: str
+    evidence: int = 0
+    entries: tuple[Evidence, ...] = ()
+    note: str = ""
+
+    @classmethod
+    def from_reason(
+        cls, source: str, relationship: str, target: str, evidence: int, reason: str
+    ) -> "Matchup":
+        """Build from a legacy concatenated reason string."""
+        entries = tuple(parse_reasons(reason))
+        return cls(source, relationship, target, evidence, entries, "" if entries else reason)
+
+    @classmethod
+    def from_record(
+        cls, source: str, relationship: str, target: str, record: Mapping[str, Any]
+    ) -> "Matchup":
+        """
+        Build from a Neo4j record with ``evidence``, ``reason`` and the ``EVIDENCE_FIELDS``
+        lists; edges synthesized before the lists existed fall back to the reason string.
+        """
+        counters, countered, mechanics = (record.get(name) or [] for name in EVIDENCE_FIELDS)
+        if not counters:
+            return cls.from_reason(source, relationship, target, record["evidence"], record["reason"])
+        entries = tuple(map(Evidence, counters, countered, mechanics))
+        return cls(source, relationship, target, record["evidence"], entries, record["reason"])
+
+    @property
+    def reasons(self) -> tuple[str, ...]:
+        """Human-readable reason per entry, formatted as the original Cypher synthesis wrote them."""
+        if not self.entries:
+            return (self.note,) if self.note else ()
+        render = weak_reason if self.relationship == "WEAK_AGAINST" else strong_reason
+        return tuple(render(e.counter, e.countered, e.mechanic) for e in self.entries)
+
+    @property
+    def reason(self) -> str:
+        return "".join(self.reasons)
+
+    def as_row(self) -> dict[str, str | int]:
+        return {
+            "source": self.source,
+            "relationship": self.relationship,
+            "target": self.target,
+            "evidence": self.evidence,
+            "reason": self.note,
+            **encode_evidence(self.entries),
+        }
+
+
+def encode_evidence(entries: Sequence[Evidence]) -> dict[str, str]:
+    """``EVIDENCE_FIELDS`` CSV cells for ``entries`` (JSON arrays, empty without entries)."""
+    if not entries:
+        return dict.fromkeys(EVIDENCE_FIELDS, "")
+    columns = ([e.counter for e in entries], [e.countered for e in entries], [e.mechanic for e in entries])
+    return {
+        name: json.dumps(values, separators=(",", ":"), ensure_ascii=False)
+        for name, values in zip(EVIDENCE_FIELDS, columns)
+    }
+
+
+def decode_evidence(row: Mapping[str, str]) -> tuple[Evidence, ...]:
+    """Evidence entries from a CSV row; rows written before ``EVIDENCE_FIELDS`` parse ``reason``."""
+    if any(field in row for field in EVIDENCE_FIELDS):
+        cells = [row.get(field) or "[]" for field in EVIDENCE_FIELDS]
+        return tuple(Evidence(*values) for values in zip(*(json.loads(cell) for cell in cells)))
+    return tuple(parse_reasons(row.get("reason") or ""))
+
+
+def parse_reasons(text: str) -> List[Evidence]:
+    """Split a concatenated STRONG/WEAK reason string into evidence entries (EVEN yields none)."""
+    entries = []
+    for match in REASON_PATTERN.finditer(text):
+        if match["verb"] == "counters":
+            entries.append(Evidence(match["first"], match["second"], match["mechanic"]))
+        else:
+            entries.append(Evidence(match["second"], match["first"], match["mechanic"]))
+    return entries
+
+
+@dataclass
+class IncidenceMatrices:
+    """
+    Sparse ability-level incidence of the roster in COO form.
+
+    Each ``uses``/``counters`` entry is one ``(ability, mechanic)`` link; ``owner`` maps an
+    ability row back to its character so the character x mechanic matrices are the
+    ability matrices aggregated by owner.
+    """
+
+    characters: List[str]
+    mechanics: List[str]
+    abilities: List[str]
+    owner: np.ndarray
+    uses_ability: np.ndarray
+    uses_mechanic: np.ndarray
+    counters_ability: np.ndarray
+    counters_mechanic: np.ndarray
+    character_index: dict[str, int] = field(default_factory=dict)
+
+    def character_matrix(self, kind: str) -> np.ndarray:
+        """Dense character x mechanic count matrix for ``kind`` in {"uses", "counters"}."""
+        if kind == "uses":
+            ability, mechanic = self.uses_ability, self.uses_mechanic
+        elif kind == "counters":
+            ability, mechanic = self.counters_ability, self.counters_mechanic
+        else:
+            raise ValueError(f"Unknown incidence kind: {kind}")
+        matrix = np.zeros((len(self.characters), len(self.mechanics)), dtype=np.int32)
+        np.add.at(matrix, (self.owner[ability], mechanic), 1)
+        return matrix
+
+
+def build_incidence(profiles: Iterable[CharacterProfile]) -> IncidenceMatrices:
+    characters: List[str] = []
+    abilities: List[str] = []
+    owner: List[int] = []
+    mechanic_index: dict[str, int] = {}
+    uses: List[tuple[int, int]] = []
+    counters: List[tuple[int, int]] = []
+
+    def _mechanic_id(name: str) -> int:
+        return mechanic_index.setdefault(name, len(mechanic_index))
+
+    for profile in profiles:
+        char_id = len(characters)
+        characters.append(profile.character.name)
+        for ability in profile.abilities:
+            ability_id = len(abilities)
+            abilities.append(ability.name)
+            owner.append(char_id)
+            # Neo4j MERGEs the mechanic relationships, so repeated names collapse.
+            for mech_name in dict.fromkeys(ability.mechanics.uses):
+                uses.append((ability_id, _mechanic_id(mech_name)))
+            for mech_name in dict.fromkeys(ability.mechanics.counters):
+                counters.append((ability_id, _mechanic_id(mech_name)))
+
+    def _columns(pairs: List[tuple[int, int]]) -> tuple[np.ndarray, np.ndarray]:
+        array = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        return array[:, 0].copy(), array[:, 1].copy()
+
+    uses_ability, uses_mechanic = _columns(uses)
+    counters_ability, counters_mechanic = _columns(counters)
+    return IncidenceMatrices(
+        characters=characters,
+        mechanics=list(mechanic_index),
+        abilities=abilities,
+        owner=np.asarray(owner, dtype=np.int64),
+        uses_ability=uses_ability,
+        uses_mechanic=uses_mechanic,
+        counters_ability=counters_ability,
+        counters_mechanic=counters_mechanic,
+        character_index={name: idx for idx, name in enumerate(characters)},
+    )
+
+
+def counter_paths(
+    incidence: IncidenceMatrices,
+    counter_mask: np.ndarray | None = None,
+    uses_mask: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Join counter links to use links on the shared mechanic.
+
+    This is the sparse product ``counters @ uses.T`` expanded to its individual terms:
+    every returned ``(counter_ability, used_ability, mechanic)`` triple is one
+    ``(c1)-[:HAS_ABILITY]->(ab1)-[:COUNTERS_MECHANIC]->(m)<-[:USES_MECHANIC]-(ab2)<-[:HAS_ABILITY]-(c2)``
+    path with ``c1 <> c2``. ``counter_mask``/``uses_mask`` restrict which links participate.
+    """
+    counters_ability = incidence.counters_ability
+    counters_mechanic = incidence.counters_mechanic
+    if counter_mask is not None:
+        counters_ability = counters_ability[counter_mask]
+        counters_mechanic = counters_mechanic[counter_mask]
+    uses_ability = incidence.uses_ability
+    uses_mechanic = incidence.uses_mechanic
+    if uses_mask is not None:
+        uses_ability = uses_ability[uses_mask]
+        uses_mechanic = uses_mechanic[uses_mask]
+
+    order = np.argsort(uses_mechanic, kind="stable")
+    sorted_mechanic = uses_mechanic[order]
+    start = np.searchsorted(sorted_mechanic, counters_mechanic, side="left")
+    stop = np.searchsorted(sorted_mechanic, counters_mechanic, side="right")
+    lengths = stop - start
+    total = int(lengths.sum())
+    left = np.repeat(np.arange(len(counters_ability)), lengths)
+    offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    right = order[np.repeat(start, lengths) + offsets]
+
+    ab1 = counters_ability[left]
+    ab2 = uses_ability[right]
+    mech = counters_mechanic[left]
+    keep = incidence.owner[ab1] != incidence.owner[ab2]
+    return ab1[keep], ab2[keep], mech[keep]
+
+
+def _name_ranks(names: Sequence[str]) -> np.ndarray:
+    """Position of each name in code-point order (equal names share a rank)."""
+    if not names:
+        return np.zeros(0, dtype=np.int64)
+    return np.unique(np.asarray(names), return_inverse=True)[1].reshape(-1)
+
+
+def _strong_weak(
+    incidence: IncidenceMatrices,
+    ab1: np.ndarray,
+    ab2: np.ndarray,
+    mech: np.ndarray,
+) -> List[Matchup]:
+    c1 = incidence.owner[ab1]
+    c2 = incidence.owner[ab2]
+    # Within a pair, evidence is ordered by (counter, countered, mechanic) name, as the
+    # Neo4j synthesis collects it, so both engines write identical rows.
+    ability_rank = _name_ranks(incidence.abilities)
+    mechanic_rank = _name_ranks(incidence.mechanics)
+    order = np.lexsort((mechanic_rank[mech], ability_rank[ab2], ability_rank[ab1], c2, c1))
+    c1, c2, ab1, ab2, mech = c1[order], c2[order], ab1[order], ab2[order], mech[order]
+
+    pair_keys = c1 * len(incidence.characters) + c2
+    _, starts, counts = np.unique(pair_keys, return_index=True, return_counts=True)
+
+    names = incidence.characters
+    abilities = incidence.abilities
+    mechanics = incidence.mechanics
+    matchups: List[Matchup] = []
+    for start, count in zip(starts.tolist(), counts.tolist()):
+        span = range(start, start + count)
+        source, target = names[c1[start]], names[c2[start]]
+        entries = tuple(
+            Evidence(abilities[ab1[i]], abilities[ab2[i]], mechanics[mech[i]]) for i in span
+        )
+        matchups.append(Matchup(source, "STRONG_AGAINST", target, count, entries))
+        matchups.append(Matchup(target, "WEAK_AGAINST", source, count, entries))
+    return matchups
+
+
+def _even(
+    characters: Sequence[str],
+    matchups: Iterable[Matchup],
+    anchors: Iterable[str] | None = None,
+) -> List[Matchup]:
+    """EVEN complement of ``matchups``; with ``anchors`` only pairs touching them."""
+    linked = {frozenset((m.source, m.target)) for m in matchups}
+    ordered = sorted(characters)
+    if anchors is None:
+        pairs = ((a, b) for i, a in enumerate(ordered) for b in ordered[i + 1 :])
+    else:
+        anchor_set = set(anchors)
+        pairs = (
+            (a, b) if a < b else (b, a)
+            for a in sorted(anchor_set)
+            for b in ordered
+            if a != b and not (b in anchor_set and b < a)
+        )
+    even: List[Matchup] = []
+    for a, b in pairs:
+        if frozenset((a, b)) in linked:
+            continue
+        even.append(Matchup(a, "EVEN_AGAINST", b, 0, note=EVEN_REASON))
+        even.append(Matchup(b, "EVEN_AGAINST", a, 0, note=EVEN_REASON))
+    return even
+
+
+class MatchupMatrix:
+    """
+    Character x character STRONG_AGAINST evidence counts.
+
+    ``strong[i, j]`` is how many ability counters ``characters[i]`` has against
+    ``characters[j]``; WEAK_AGAINST is the transpose and a pair with neither is EVEN, so
+    the matrix answers any "A vs B" query without stored EVEN rows.
+    """
+
+    def __init__(self, characters: Iterable[str]) -> None:
+        self.characters = sorted(set(characters))
+        self.index = {name: idx for idx, name in enumerate(self.characters)}
+        self.strong = np.zeros((len(self.characters), len(self.characters)), dtype=np.int32)
+
+    @classmethod
+    def from_matchups(cls, characters: Iterable[str], matchups: Iterable[Matchup]) -> "MatchupMatrix":
+        matrix = cls(characters)
+        for matchup in matchups:
+            matrix.add(matchup.source, matchup.relationship, matchup.target, matchup.evidence)
+        return matrix
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "MatchupMatrix":
+        matrix = cls(payload["characters"])
+        for row, column, count in payload["strong"]:
+            matrix.strong[row, column] = count
+        return matrix
+
+    def add(self, source: str, relationship: str, target: str, evidence: int = 1) -> None:
+        """Record one STRONG/WEAK row; EVEN rows and unknown characters are ignored."""
+        if relationship == "WEAK_AGAINST":
+            source, target = target, source
+        elif relationship != "STRONG_AGAINST":
+            return
+        row, column = self.index.get(source), self.index.get(target)
+        if row is None or column is None:
+            return
+        self.strong[row, column] = max(self.strong[row, column], evidence or 1)
+
+    def _indices(self, a: str, b: str) -> tuple[int, int]:
+        missing = [name for name in (a, b) if name not in self.index]
+        if missing:
+            raise ValueError(f"Unknown character(s): {', '.join(missing)}")
+        return self.index[a], self.index[b]
+
+    def relationships(self, a: str, b: str) -> dict[str, int]:
+        """Relationship types from ``a`` to ``b`` with their evidence counts (EVEN has 0)."""
+        i, j = self._indices(a, b)
+        result: dict[str, int] = {}
+        if self.strong[i, j]:
+            result["STRONG_AGAINST"] = int(self.strong[i, j])
+        if self.strong[j, i]:
+            result["WEAK_AGAINST"] = int(self.strong[j, i])
+        if not result and i != j:
+            result["EVEN_AGAINST"] = 0
+        return result
+
+    def even_pairs(self) -> int:
+        """Number of unordered pairs with no counters either way."""
+        linked = (self.strong > 0) | (self.strong.T > 0)
+        size = len(self.characters)
+        return int((size * (size - 1) - np.count_nonzero(linked)) // 2)
+
+    def as_dict(self) -> dict:
+        """``characters`` plus ``[row, column, count]`` triples for every non-zero STRONG cell."""
+        rows, columns = np.nonzero(self.strong)
+        return {
+            "characters": self.characters,
+            "strong": [
+                [int(row), int(column), int(self.strong[row, column])]
+                for row, column in zip(rows.tolist(), columns.tolist())
+            ],
+        }
+
+
+def matchup_between(matchups: Iterable[Matchup], a: str, b: str) -> List[Matchup]:
+    """Stored rows from ``a`` to ``b``, or the implied EVEN row when there are none."""
+    found = [m for m in matchups if m.source == a and m.target == b]
+    if not found and a != b:
+        found.append(Matchup(a, "EVEN_AGAINST", b, 0, note=EVEN_REASON))
+    return found
+
+
+def sort_matchups(matchups: Iterable[Matchup]) -> List[Matchup]:
+    """Order rows like ``scripts/export_matchups.py`` (source, relationship, target)."""
+    return sorted(matchups, key=lambda m: (m.source, m.relationship, m.target))
+
+
+@profiled()
+def synthesize(profiles: Iterable[CharacterProfile], *, implicit_even: bool = False) -> List[Matchup]:
+    """Compute STRONG_AGAINST/WEAK_AGAINST rows, plus EVEN_AGAINST unless ``implicit_even``."""
+    incidence = build_incidence(profiles)
+    strong_weak = _strong_weak(incidence, *counter_paths(incidence))
+    if implicit_even:
+        return sort_matchups(strong_weak)
+    return sort_matchups(strong_weak + _even(incidence.characters, strong_weak))
+
+
+@profiled()
+def synthesize_incremental(
+    profiles: Iterable[CharacterProfile],
+    existing: Iterable[Matchup],
+    changed: Iterable[str],
+    *,
+    implicit_even: bool = False,
+) -> List[Matchup]:
+    """
+    Recompute only the rows incident to ``changed`` and splice them into ``existing``.
+
+    Rows between two unchanged characters are kept as-is; rows referencing characters
+    that are no longer in the roster are dropped, as are EVEN rows with ``implicit_even``.
+    """
+    incidence = build_incidence(profiles)
+    roster = set(incidence.characters)
+    changed_set = set(changed)
+    kept = [
+        m
+        for m in existing
+        if m.source in roster
+        and m.target in roster
+        and m.source not in changed_set
+        and m.target not in changed_set
+        and not (implicit_even and m.relationship == "EVEN_AGAINST")
+    ]
+    changed_ids = np.fromiter(
+        (incidence.character_index[name] for name in changed_set if name in roster),
+        dtype=np.int64,
+    )
+    counter_owned = np.isin(incidence.owner[incidence.counters_ability], changed_ids)
+    uses_owned = np.isin(incidence.owner[incidence.uses_ability], changed_ids)
+    # Paths are counted once: changed counter side, or unchanged counter hitting a changed user.
+    outgoing = counter_paths(incidence, counter_mask=counter_owned)
+    incoming = counter_paths(incidence, counter_mask=~counter_owned, uses_mask=uses_owned)
+    ab1, ab2, mech = (np.concatenate(parts) for parts in zip(outgoing, incoming))
+    strong_weak = _strong_weak(incidence, ab1, ab2, mech)
+    if implicit_even:
+        return sort_matchups(kept + strong_weak)
+    anchors = changed_set & roster
+    return sort_matchups(kept + strong_weak + _even(incidence.characters, strong_weak, anchors))
+
+
+def character_digests(directory: Path) -> dict[str, str]:
+    """SHA-256 of every character YAML keyed by file stem."""
+    return {
+        path.stem: hashlib.sha256(path.read_bytes()).hexdigest()
+        for path in sorted(directory.glob("*.yaml"))
+    }
+
+
+def digest_manifest_path(directory: Path, engine: str, target: str) -> Path:
+    """
+    Digest manifest for one engine and destination (CSV path or Neo4j URI), so a run of one
+    never marks the other up to date.
+    """
+    key = hashlib.sha1(target.encode("utf-8")).hexdigest()[:12]
+    return directory / f"matchup_digests.{engine}.{key}.json"
+
+
+@profiled()
+def changed_characters(directory: Path, manifest_path: Path) -> set[str]:
+    """
+    Names of characters whose YAML differs from the digests recorded in ``manifest_path``.
+
+    New, edited, renamed and deleted files all count as changes. Without a manifest every
+    character is reported, which makes the caller fall back to a full rebuild.
+    """
+    previous: dict[str, dict[str, str]] = {}
+    if manifest_path.exists():
+        previous = json.loads(manifest_path.read_text(encoding="utf-8"))
+    changed: set[str] = set()
+    for stem, digest in character_digests(directory).items():
+        entry = previous.pop(stem, None)
+        if entry and entry.get("digest") == digest:
+            continue
+        changed.add(load_character_profile(directory / f"{stem}.yaml").character.name)
+        if entry:
+            changed.add(entry["name"])
+    changed.update(entry["name"] for entry in previous.values())
+    return changed
+
+
+def record_character_digests(directory: Path, manifest_path: Path) -> None:
+    manifest = {
+        stem: {
+            "name": load_character_profile(directory / f"{stem}.yaml").character.name,
+            "digest": digest,
+        }
+        for stem, digest in character_digests(directory).items()
+    }
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+
+
+@profiled()
+def write_matchups_csv(matchups: Iterable[Matchup], path: Path) -> int:
+    count = 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=MATCHUP_FIELDS, lineterminator="\n")
+        writer.writeheader()
+        for matchup in matchups:
+            writer.writerow(matchup.as_row())
+            count += 1
+    return count
+
+
+def iter_matchups_csv(path: Path) -> Iterator[Matchup]:
+    with path.open("r", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            entries = decode_evidence(row)
+            yield Matchup(
+                source=row["source"],
+                relationship=row["relationship"],
+                target=row["target"],
+                evidence=int(row.get("evidence") or 0),
+                entries=entries,
+                note="" if entries else row.get("reason") or "",
+            )
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Iterable, List, Optional, Sequence
+
+from .models import CharacterProfile
+from .profiling import profiled
+from .synthesis import EVEN_REASON, Evidence, Matchup
+
+
+ACTIONS = ("+uses", "-uses", "+counters", "-counters", "+ability", "-ability")
+# "Character:Ability +uses Mechanic", "Character:Ability -ability", ...
+EDIT_PATTERN = re.compile(
+    r"^\s*(?P<character>[^:]+?)\s*:\s*(?P<ability>.+?)\s+(?P<action>[+-](?:uses|counters|ability))"
+    r"(?:\s+(?P<mechanic>.+?))?\s*$"
+)
+
+MatchupKey = tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class Edit:
+    character: str
+    ability: str
+    action: str
+    mechanic: Optional[str] = None
+
+    def __str__(self) -> str:
+        text = f"{self.character}:{self.ability} {self.action}"
+        return f"{text} {self.mechanic}" if self.mechanic else text
+
+
+def parse_edit(text: str) -> Edit:
+    """Parse ``"Character:Ability +uses Mechanic"``-style edits (see ``ACTIONS``)."""
+    match = EDIT_PATTERN.match(text)
+    if not match:
+        raise ValueError(
+            f"Cannot parse edit {text!r}; expected 'Character:Ability ACTION [Mechanic]' "
+            f"with ACTION one of {', '.join(ACTIONS)}."
+        )
+    action, mechanic = match["action"], match["mechanic"]
+    if action.endswith("ability") and mechanic:
+        raise ValueError(f"{action} takes no mechanic: {text!r}")
+    if not action.endswith("ability") and not mechanic:
+        raise ValueError(f"{action} needs a mechanic: {text!r}")
+    return Edit(match["character"], match["ability"], action, mechanic)
+
+
+@dataclass(eq=False)
+class _Ability:
+    owner: str
+    name: str
+    uses: List[str] = field(default_factory=list)
+    counters: List[str] = field(default_factory=list)
+
+
+@dataclass
+class WhatIfResult:
+    added: List[Matchup] = field(default_factory=list)
+    removed: List[Matchup] = field(default_factory=list)
+    changed: List[tuple[Matchup, Matchup]] = field(default_factory=list)
+    characters: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def lines(self) -> List[str]:
+        """The delta in ``scripts/diff_matchups.py`` format, plus evidence changes on kept rows."""
+        out = [f"Added relationships: {len(self.added)}"]
+        out += [f" + {_describe(m)}" for m in self.added]
+        out.append(f"Removed relationships: {len(self.removed)}")
+        out += [f" - {_describe(m)}" for m in self.removed]
+        out.append(f"Changed relationships: {len(self.changed)}")
+        for old, new in self.changed:
+            out.append(
+                f" ~ {new.source} {new.relationship} {new.target} "
+                f"(evidence={old.evidence}->{new.evidence}) -> {new.reason}"
+            )
+        return out
+
+
+def _describe(matchup: Matchup) -> str:
+    return (
+        f"{matchup.source} {matchup.relationship} {matchup.target} "
+        f"(evidence={matchup.evidence}) -> {matchup.reason}"
+    )
+
+
+class WhatIf:
+    """
+    Mutable copy of the roster's ability mechanics with mechanic -> abilities inverted
+    indexes, so a character's matchup rows are rebuilt from the abilities sharing its
+    mechanics instead of re-synthesizing the whole roster.
+    """
+
+    def __init__(self, profiles: Iterable[CharacterProfile]) -> None:
+        self.characters: List[str] = []
+        self.abilities: dict[str, List[_Ability]] = {}
+        self.used_by: dict[str, List[_Ability]] = {}
+        self.countered_by: dict[str, List[_Ability]] = {}
+        for profile in profiles:
+            name = profile.character.name
+            self.characters.append(name)
+            self.abilities[name] = []
+            for ability in profile.abilities:
+                # Mirrors build_incidence: repeated mechanic names collapse.
+                entry = _Ability(
+                    name,
+                    ability.name,
+                    list(dict.fromkeys(ability.mechanics.uses)),
+                    list(dict.fromkeys(ability.mechanics.counters)),
+                )
+                self._link(entry)
+                self.abilities[name].append(entry)
+
+    def _link(self, ability: _Ability) -> None:
+        for mechanic in ability.uses:
+            self.used_by.setdefault(mechanic, []).append(ability)
+        for mechanic in ability.counters:
+            self.countered_by.setdefault(mechanic, []).append(ability)
+
+    def _unlink(self, ability: _Ability) -> None:
+        for mechanic in ability.uses:
+            self.used_by[mechanic].remove(ability)
+        for mechanic in ability.counters:
+            self.countered_by[mechanic].remove(ability)
+
+    def _find(self, character: str, ability: str) -> Optional[_Ability]:
+        return next((a for a in self.abilities[character] if a.name == ability), None)
+
+    def apply(self, edit: Edit) -> None:
+        """Apply one edit; raises ``ValueError`` for unknown targets and no-op edits."""
+        if edit.character not in self.abilities:
+            raise ValueError(f"Unknown character: {edit.character}")
+        ability = self._find(edit.character, edit.ability)
+        if edit.action == "+ability":
+            if ability is not None:
+                raise ValueError(f"{edit.character} already has {edit.ability}.")
+            self.abilities[edit.character].append(_Ability(edit.character, edit.ability))
+            return
+        if ability is None:
+            raise ValueError(f"{edit.character} has no ability named {edit.ability}.")
+        if edit.action == "-ability":
+            self._unlink(ability)
+            self.abilities[edit.character].remove(ability)
+            return
+        kind = edit.action[1:]
+        mechanics = getattr(ability, kind)
+        index = self.used_by if kind == "uses" else self.countered_by
+        if edit.action.startswith("+"):
+            if edit.mechanic in mechanics:
+                raise ValueError(f"{edit.ability} already {kind} {edit.mechanic}.")
+            mechanics.append(edit.mechanic)
+            index.setdefault(edit.mechanic, []).append(ability)
+        else:
+            if edit.mechanic not in mechanics:
+                raise ValueError(f"{edit.ability} does not list {edit.mechanic} under {kind}.")
+            mechanics.remove(edit.mechanic)
+            index[edit.mechanic].remove(ability)
+
+    def rows(self, character: str, *, implicit_even: bool = False) -> dict[MatchupKey, Matchup]:
+        """Every matchup row with ``character`` as source or target, as synthesize() emits them."""
+        paths: dict[tuple[str, str], list[tuple[_Ability, _Ability, str]]] = {}
+        for ability in self.abilities[character]:
+            for mechanic in ability.counters:
+                for other in self.used_by.get(mechanic, ()):
+                    if other.owner != character:
+                        paths.setdefault((character, other.owner), []).append((ability, other, mechanic))
+            for mechanic in ability.uses:
+                for other in self.countered_by.get(mechanic, ()):
+                    if other.owner != character:
+                        paths.setdefault((other.owner, character), []).append((other, ability, mechanic))
+
+        rows: dict[MatchupKey, Matchup] = {}
+        for (source, target), triples in paths.items():
+            # Same (counter, countered, mechanic) name order as both synthesis engines.
+            entries = tuple(
+                sorted(
+                    (Evidence(a.name, b.name, m) for a, b, m in triples),
+                    key=lambda e: (e.counter, e.countered, e.mechanic),
+                )
+            )
+            rows[(source, "STRONG_AGAINST", target)] = Matchup(
+                source, "STRONG_AGAINST", target, len(triples), entries
+            )
+            rows[(target, "WEAK_AGAINST", source)] = Matchup(
+                target, "WEAK_AGAINST", source, len(triples), entries
+            )
+        if not implicit_even:
+            for other in self.characters:
+                if other == character or (character, other) in paths or (other, character) in paths:
+                    continue
+                for source, target in ((character, other), (other, character)):
+                    rows[(source, "EVEN_AGAINST", target)] = Matchup(
+                        source, "EVEN_AGAINST", target, 0, note=EVEN_REASON
+                    )
+        return rows
+
+    def affected_rows(
+        self, characters: Sequence[str], *, implicit_even: bool = False
+    ) -> dict[MatchupKey, Matchup]:
+        rows: dict[MatchupKey, Matchup] = {}
+        for name in characters:
+            rows.update(self.rows(name, implicit_even=implicit_even))
+        return rows
+
+
+@profiled()
+def simulate(
+    profiles: Iterable[CharacterProfile],
+    edits: Sequence[Edit],
+    *,
+    implicit_even: bool = False,
+) -> WhatIfResult:
+    """
+    Matchup rows that ``edits`` would add, remove or change.
+
+    Only rows incident to an edited character can change, so those are rebuilt before and
+    after applying the edits (in order) and compared; the rest of the roster is untouched.
+    """
+    started = perf_counter()
+    state = WhatIf(profiles)
+    characters = sorted({edit.character for edit in edits} & set(state.abilities))
+    before = state.affected_rows(characters, implicit_even=implicit_even)
+    for edit in edits:
+        state.apply(edit)
+    after = state.affected_rows(characters, implicit_even=implicit_even)
+    result = WhatIfResult(characters=characters)
+    result.added = [after[key] for key in sorted(after.keys() - before.keys())]
+    result.removed = [before[key] for key in sorted(before.keys() - after.keys())]
+    result.changed = [
+        (before[key], after[key])
+        for key in sorted(before.keys() & after.keys())
+        if before[key] != after[key]
+    ]
+    result.seconds = perf_counter() - started
+    return result
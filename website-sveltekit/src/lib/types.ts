@@ -15,6 +15,13 @@ export interface GraphEdge {
   properties: Record<string, unknown>;
 }
 
+/** One ability-level counter behind a STRONG/WEAK edge (`properties.evidence`). */
+export interface MatchupEvidence {
+  counter: string;
+  countered: string;
+  mechanic: string;
+}
+
 export interface GraphMeta {
   generated_at: string;
   node_count: number;
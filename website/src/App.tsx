@@ -3,9 +3,11 @@ import type { ChangeEvent } from "react";
 import "./App.css";
 import { GraphView } from "./GraphView";
 import { useGraphStore, type MetricMode } from "./state/useGraphStore";
-import type { GraphEdge, GraphNode } from "./types";
+import type { GraphEdge, GraphNode, MatchupEvidence } from "./types";
 
 const RELATIONSHIP_OPTIONS = ["STRONG_AGAINST", "WEAK_AGAINST", "EVEN_AGAINST"] as const;
+// Exported EVEN edges leave this note implied (see schema/CHANGELOG.md).
+const EVEN_NOTE = "No direct ability or mechanic counters found.";
 
 const METRIC_OPTIONS: Array<{ value: MetricMode; label: string; description: string }> = [
   { value: "default", label: "Default", description: "Node colors reflect entity type; sizes use static layout values." },
@@ -277,6 +279,19 @@ function App() {
     if (typeof reason === "string" && reason.trim().length > 0) {
       return reason.trim();
     }
+    const evidence = selectedEdge.properties?.evidence;
+    if (Array.isArray(evidence) && evidence.length > 0) {
+      return (evidence as MatchupEvidence[])
+        .map((entry) => `${entry.counter} counters ${entry.countered} via ${entry.mechanic}.`)
+        .join(" ");
+    }
+    const reasons = selectedEdge.properties?.reasons;
+    if (Array.isArray(reasons) && reasons.length > 0) {
+      return reasons.join(" ").trim();
+    }
+    if (selectedEdge.type === "EVEN_AGAINST") {
+      return EVEN_NOTE;
+    }
     return null;
   }, [selectedEdge]);
 
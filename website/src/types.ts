@@ -15,6 +15,12 @@ export interface GraphEdge {
   properties: Record<string, unknown>;
 }
 
+export interface MatchupEvidence {
+  counter: string;
+  countered: string;
+  mechanic: string;
+}
+
 export interface GraphMeta {
   generated_at: string;
   node_count: number;
@@ -33,6 +39,35 @@ export interface GraphIndexes {
   even_against: Record<string, string[]>;
   mechanic_usage: Record<string, number>;
   mechanic_counter: Record<string, number>;
+  mechanic_used_by?: Record<string, string[]>;
+  mechanic_countered_by?: Record<string, string[]>;
+  mechanic_used_by_characters?: Record<string, string[]>;
+  mechanic_countered_by_characters?: Record<string, string[]>;
+  ability_owners?: Record<string, string[]>;
+  archetype_members?: Record<string, string[]>;
+  search?: SearchIndex;
+}
+
+export interface SearchIndex {
+  terms: [string, string][];
+  prefixes: Record<string, number[]>;
+  ngrams: Record<string, number[]>;
+}
+
+export interface GraphAnalytics {
+  characters: string[];
+  archetypes: string[];
+  strong_evidence: number[];
+  weak_evidence: number[];
+  net_score: number[];
+  counters: number[];
+  countered_by: number[];
+  pagerank: number[];
+  hub: number[];
+  authority: number[];
+  archetype_net: number[][];
+  archetype_mean: number[][];
+  rankings: Record<string, string[]>;
 }
 
 export interface GraphData {
@@ -40,4 +75,5 @@ export interface GraphData {
   nodes: GraphNode[];
   edges: GraphEdge[];
   indexes: GraphIndexes;
+  analytics?: GraphAnalytics;
 }